@@ -1,63 +1,334 @@
 import csv
 import json
-from typing import Iterable
+import os
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 from flask import current_app
+from sqlalchemy import delete, exists, false, insert, literal, select, update
 from extensions import db
-from models import College
+from models import College, CollegeCutoff, Exam, Notification, QuizResult, Scholarship, User, cutoff_rows
+from scholarship_index import eligible_users_query
+from quiz_data import analyze_quiz_results_batch
+from catalog_cache import bump_catalog_version
 
+DEFAULT_CHUNK_SIZE = 1000
 
-def import_colleges_from_csv(csv_path: str) -> int:
+
+def split_list(val: str) -> Iterable[str]:
+    return [v.strip() for v in (val or '').split('|') if v.strip()]
+
+
+def _parse_college_row(row: dict) -> Optional[dict]:
+    name = (row.get('name') or '').strip()
+    if not name:
+        return None
+
+    seats_raw = (row.get('seats') or '').strip().replace(',', '')
+    try:
+        seats = int(seats_raw) if seats_raw else None
+    except ValueError:
+        seats = None
+
+    return {
+        'name': name,
+        'state': (row.get('state') or '').strip(),
+        'city': (row.get('city') or '').strip(),
+        'type': (row.get('type') or '').strip(),
+        'courses': json.dumps(split_list(row.get('courses') or '')),
+        'fees_range': (row.get('fees_range') or '').strip(),
+        'facilities': json.dumps(split_list(row.get('facilities') or '')),
+        'cutoff_info': (row.get('cutoff_info') or '').strip(),
+        'seats': seats,
+        'scholarships': (row.get('scholarships') or '').strip(),
+        'website': (row.get('website') or '').strip(),
+    }
+
+
+def _checkpoint_path(csv_path: str) -> str:
+    return f"{csv_path}.checkpoint"
+
+
+def _file_signature(csv_path: str) -> dict:
+    stat = os.stat(csv_path)
+    return {'size': stat.st_size, 'mtime': int(stat.st_mtime)}
+
+
+def _read_checkpoint(csv_path: str) -> int:
+    """Rows already committed by a previous, interrupted run of the same file."""
+    try:
+        with open(_checkpoint_path(csv_path), encoding='utf-8') as f:
+            checkpoint = json.load(f)
+    except (OSError, ValueError):
+        return 0
+    if checkpoint.get('file') != _file_signature(csv_path):
+        # The CSV changed since the checkpoint was written; start over
+        return 0
+    return int(checkpoint.get('rows_done', 0))
+
+
+def _write_checkpoint(csv_path: str, rows_done: int, upserted: int) -> None:
+    with open(_checkpoint_path(csv_path), 'w', encoding='utf-8') as f:
+        json.dump({'file': _file_signature(csv_path), 'rows_done': rows_done, 'upserted': upserted}, f)
+
+
+def _flush_chunk(pending_inserts: Dict[Tuple[str, str, str], dict],
+                 pending_updates: Dict[int, dict],
+                 existing: Dict[Tuple[str, str, str], int]) -> None:
+    cutoffs = {}  # college id -> cutoff_info to parse into CollegeCutoff rows
+    if pending_inserts:
+        rows = list(pending_inserts.values())
+        result = db.session.execute(
+            insert(College).returning(College.id, sort_by_parameter_order=True),
+            rows
+        )
+        # Remember new ids so later chunks update instead of inserting twice
+        for (key, values), college_id in zip(pending_inserts.items(), result.scalars()):
+            existing[key] = college_id
+            cutoffs[college_id] = values['cutoff_info']
+
+    if pending_updates:
+        db.session.execute(update(College), list(pending_updates.values()))
+        updated_ids = [college_id for college_id, values in pending_updates.items() if 'cutoff_info' in values]
+        if updated_ids:
+            db.session.execute(delete(CollegeCutoff).where(CollegeCutoff.college_id.in_(updated_ids)))
+            for college_id in updated_ids:
+                cutoffs[college_id] = pending_updates[college_id]['cutoff_info']
+
+    # Bulk statements skip the ORM validator that keeps cutoffs in sync
+    cutoff_values = [dict(row, college_id=college_id)
+                     for college_id, info in cutoffs.items() for row in cutoff_rows(info)]
+    if cutoff_values:
+        db.session.execute(insert(CollegeCutoff), cutoff_values)
+
+    # Invalidate cached facets in every worker
+    bump_catalog_version('college')
+    db.session.commit()
+
+
+def import_colleges_from_csv(csv_path: str,
+                             chunk_size: int = DEFAULT_CHUNK_SIZE,
+                             resume: bool = False,
+                             progress: Optional[Callable[[int, int, float], None]] = None) -> int:
     """Import colleges from a CSV file into the database.
 
     Expected columns (case-insensitive):
     name, state, city, type, courses (| separated), fees_range, facilities (| separated), cutoff_info, seats, scholarships, website
 
+    Rows are streamed from the file and upserted by (name, state, city) with
+    bulk INSERT/UPDATE statements, committing every `chunk_size` rows. After
+    each commit a checkpoint file (<csv_path>.checkpoint) records progress;
+    with resume=True a rerun skips the rows that were already committed.
+    `progress(rows_read, rows_upserted, elapsed_seconds)` is called per chunk.
+
     Returns the number of upserted rows.
     """
+    chunk_size = max(1, chunk_size)
+    skip = _read_checkpoint(csv_path) if resume else 0
+
+    # Preload the upsert keys once instead of querying per row
+    existing = {
+        (name, state, city): college_id
+        for college_id, name, state, city in db.session.execute(
+            select(College.id, College.name, College.state, College.city)
+        )
+    }
+
+    started = time.monotonic()
+    rows_done = 0
     count = 0
+    pending_inserts: Dict[Tuple[str, str, str], dict] = {}
+    pending_updates: Dict[int, dict] = {}
+    pending_rows = 0
+
     with open(csv_path, newline='', encoding='utf-8') as f:
         reader = csv.DictReader(f)
         for row in reader:
-            name = (row.get('name') or '').strip()
-            if not name:
+            rows_done += 1
+            if rows_done <= skip:
                 continue
-            state = (row.get('state') or '').strip()
-            city = (row.get('city') or '').strip()
-            ctype = (row.get('type') or '').strip()
-            fees_range = (row.get('fees_range') or '').strip()
-            cutoff_info = (row.get('cutoff_info') or '').strip()
-            scholarships = (row.get('scholarships') or '').strip()
-            website = (row.get('website') or '').strip()
-
-            # Parse list-like fields
-            def split_list(val: str) -> Iterable[str]:
-                return [v.strip() for v in (val or '').split('|') if v.strip()]
-
-            courses = json.dumps(split_list(row.get('courses') or ''))
-            facilities = json.dumps(split_list(row.get('facilities') or ''))
-
-            seats_raw = (row.get('seats') or '').strip().replace(',', '')
-            try:
-                seats = int(seats_raw) if seats_raw else None
-            except ValueError:
-                seats = None
-
-            # Upsert by (name, state, city)
-            college = College.query.filter_by(name=name, state=state, city=city).first()
-            if not college:
-                college = College(name=name, state=state, city=city, type=ctype)
-                db.session.add(college)
-
-            college.type = ctype or college.type
-            college.courses = courses
-            college.fees_range = fees_range
-            college.facilities = facilities
-            college.cutoff_info = cutoff_info
-            college.seats = seats
-            college.scholarships = scholarships
-            college.website = website
-
-            count += 1
 
+            values = _parse_college_row(row)
+            if values is not None:
+                key = (values['name'], values['state'], values['city'])
+                college_id = existing.get(key)
+                if college_id is None:
+                    if key in pending_inserts and not values['type']:
+                        values['type'] = pending_inserts[key]['type']
+                    pending_inserts[key] = values
+                else:
+                    changes = {k: v for k, v in values.items() if k not in ('name', 'state', 'city')}
+                    if not changes['type']:
+                        # Keep the stored type when the CSV leaves it blank
+                        del changes['type']
+                    pending_updates.setdefault(college_id, {'id': college_id}).update(changes)
+                count += 1
+                pending_rows += 1
+
+            if pending_rows >= chunk_size:
+                _flush_chunk(pending_inserts, pending_updates, existing)
+                _write_checkpoint(csv_path, rows_done, count)
+                pending_inserts, pending_updates, pending_rows = {}, {}, 0
+                if progress:
+                    progress(rows_done, count, time.monotonic() - started)
+
+        if pending_rows:
+            _flush_chunk(pending_inserts, pending_updates, existing)
+            if progress:
+                progress(rows_done, count, time.monotonic() - started)
+
+    # Finished cleanly; a later run should start from the top
+    try:
+        os.remove(_checkpoint_path(csv_path))
+    except OSError:
+        pass
+
+    return count
+
+
+def _load_answers(raw: Optional[str]) -> dict:
+    try:
+        answers = json.loads(raw) if raw else {}
+    except ValueError:
+        return {}
+    return answers if isinstance(answers, dict) else {}
+
+
+def rescore_quiz_results(chunk_size: int = 5000,
+                         progress: Optional[Callable[[int, float], None]] = None) -> int:
+    """Recompute career_recommendations for every stored QuizResult.
+
+    Results are read in id order, scored a chunk at a time with the
+    vectorized quiz scorer and written back with one bulk UPDATE per chunk.
+    `progress(rows_rescored, elapsed_seconds)` is called after each chunk.
+
+    Returns the number of rescored results.
+    """
+    chunk_size = max(1, chunk_size)
+    started = time.monotonic()
+    last_id = 0
+    count = 0
+    while True:
+        rows = db.session.execute(
+            select(QuizResult.id, QuizResult.answers)
+            .where(QuizResult.id > last_id)
+            .order_by(QuizResult.id)
+            .limit(chunk_size)
+        ).all()
+        if not rows:
+            break
+
+        recommendations = analyze_quiz_results_batch([_load_answers(answers) for _, answers in rows])
+        db.session.execute(update(QuizResult), [
+            {'id': result_id, 'career_recommendations': json.dumps(recs)}
+            for (result_id, _), recs in zip(rows, recommendations)
+        ])
         db.session.commit()
+
+        last_id = rows[-1][0]
+        count += len(rows)
+        if progress:
+            progress(count, time.monotonic() - started)
     return count
+
+
+def _user_id_bounds(chunk_size: int) -> List[Tuple[Optional[str], Optional[str]]]:
+    """(after, upto) user id ranges of about chunk_size users each, walked once over the primary key."""
+    bounds = []
+    after = None
+    while True:
+        query = select(User.id).order_by(User.id).offset(chunk_size - 1).limit(1)
+        if after is not None:
+            query = query.where(User.id > after)
+        upto = db.session.execute(query).scalar()
+        bounds.append((after, upto))
+        if upto is None:
+            return bounds
+        after = upto
+
+
+def _exam_users_query(exam: Exam):
+    """SELECT of student user ids in a class level the exam is open to."""
+    return select(User.id).where(User.role == 'student', User.class_level.in_(exam.class_list))
+
+
+def _upcoming_deadlines(now: datetime, until: datetime):
+    """(notification_type, reference_id, deadline, title, message, eligible user SELECT) per deadline in the window."""
+    scholarships = Scholarship.query.filter(
+        Scholarship.is_active.is_(True),
+        Scholarship.application_deadline >= now,
+        Scholarship.application_deadline < until,
+    ).order_by(Scholarship.id).all()
+    for scholarship in scholarships:
+        yield ('scholarship', scholarship.id, scholarship.application_deadline,
+               f"Scholarship deadline: {scholarship.name}",
+               f"Applications for {scholarship.name} close on "
+               f"{scholarship.application_deadline.strftime('%d %b %Y')}.",
+               eligible_users_query(scholarship).order_by(None))
+
+    exams = Exam.query.filter(
+        Exam.is_active.is_(True),
+        Exam.registration_end >= now,
+        Exam.registration_end < until,
+    ).order_by(Exam.id).all()
+    for exam in exams:
+        yield ('exam', exam.id, exam.registration_end,
+               f"Exam registration closing: {exam.name}",
+               f"Registration for {exam.name} ends on {exam.registration_end.strftime('%d %b %Y')}.",
+               _exam_users_query(exam))
+
+
+def notify_upcoming_deadlines(days: int = 7,
+                              chunk_size: int = 5000,
+                              now: Optional[datetime] = None,
+                              progress: Optional[Callable[[str, int, float], None]] = None) -> int:
+    """Notify eligible students of scholarship and exam deadlines in the next `days` days.
+
+    Each deadline becomes one INSERT ... SELECT per range of `chunk_size`
+    user ids (committed separately), so no users are loaded into Python.
+    A user is skipped if they were already reminded of that deadline, which
+    makes reruns idempotent; the unique (user_id, notification_type,
+    reference_id, deadline) index backs the check. A deadline that moves or
+    reopens is reminded of again, and other notifications about the same
+    scholarship or exam (which carry no deadline) never count.
+    `progress(title, inserted, elapsed_seconds)` is called per deadline.
+
+    Returns the number of notifications created.
+    """
+    chunk_size = max(1, chunk_size)
+    now = now or datetime.utcnow()
+    until = now + timedelta(days=days)
+    started = time.monotonic()
+    bounds = _user_id_bounds(chunk_size)
+    total = 0
+
+    columns = ['user_id', 'title', 'message', 'notification_type', 'reference_id', 'deadline', 'is_read',
+               'created_at']
+    for notification_type, reference_id, deadline, title, message, users in _upcoming_deadlines(now, until):
+        already_notified = exists().where(
+            Notification.user_id == User.id,
+            Notification.notification_type == notification_type,
+            Notification.reference_id == reference_id,
+            Notification.deadline == deadline,
+        )
+        source = users.where(~already_notified).with_only_columns(
+            User.id, literal(title), literal(message), literal(notification_type),
+            literal(reference_id), literal(deadline, Notification.deadline.type), false(),
+            literal(now, Notification.created_at.type),
+        )
+
+        inserted = 0
+        for after, upto in bounds:
+            chunk = source
+            if after is not None:
+                chunk = chunk.where(User.id > after)
+            if upto is not None:
+                chunk = chunk.where(User.id <= upto)
+            result = db.session.execute(insert(Notification).from_select(columns, chunk))
+            db.session.commit()
+            inserted += result.rowcount
+
+        total += inserted
+        if progress:
+            progress(title, inserted, time.monotonic() - started)
+    return total
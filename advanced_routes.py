@@ -2,13 +2,25 @@ from flask import Blueprint, render_template, request, flash, redirect, url_for,
 from flask_login import login_required, current_user
 from extensions import db
 from models import (User, Scholarship, Exam, SavedScholarship, CareerSimulation, 
-                   Notification, MentorshipSession, College, Career)
+                   Notification, MentorshipSession, MentorshipMessage, Career,
+                   ScholarshipCategory, ScholarshipClass, ExamClass)
 import json
 from datetime import datetime, timedelta
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, or_, tuple_
+from scholarship_index import match_scholarships
+from college_catalog import college_to_dict, cutoff_exams, eligible_colleges
 
 advanced_bp = Blueprint('advanced', __name__, url_prefix='/advanced')
 
+def scholarship_listing(category=None, class_level=None):
+    """Active scholarships, optionally limited to one eligible category and class"""
+    query = Scholarship.query.filter_by(is_active=True)
+    if category:
+        query = query.join(ScholarshipCategory).filter(ScholarshipCategory.category == category)
+    if class_level:
+        query = query.join(ScholarshipClass).filter(ScholarshipClass.class_level == class_level)
+    return query
+
 @advanced_bp.route('/scholarships')
 def scholarships():
     # Get filter parameters
@@ -16,16 +28,7 @@ def scholarships():
     class_filter = request.args.get('class', '')
     amount_filter = request.args.get('amount', '')
     
-    # Build query
-    query = Scholarship.query.filter_by(is_active=True)
-    
-    if category_filter:
-        query = query.filter(Scholarship.category_eligible.contains(f'"{category_filter}"'))
-    
-    if class_filter:
-        query = query.filter(Scholarship.class_eligible.contains(f'"{class_filter}"'))
-    
-    scholarships = query.all()
+    scholarships = scholarship_listing(category_filter, class_filter).all()
     
     # Get unique categories and classes for filters
     all_categories = ['General', 'SC', 'ST', 'OBC']
@@ -44,35 +47,28 @@ def scholarship_matcher():
     user_category = current_user.category
     user_class = current_user.class_level
     
-    # Find matching scholarships
-    matching_scholarships = []
-    
-    scholarships = Scholarship.query.filter_by(is_active=True).all()
-    for scholarship in scholarships:
-        categories = json.loads(scholarship.category_eligible) if scholarship.category_eligible else []
-        classes = json.loads(scholarship.class_eligible) if scholarship.class_eligible else []
-        
-        if (user_category in categories or 'General' in categories) and user_class in classes:
-            matching_scholarships.append(scholarship)
+    # Find matching scholarships from the in-memory match index
+    matching_scholarships = match_scholarships(user_category, user_class)
     
     return render_template('advanced/scholarship_matcher.html', 
                          scholarships=matching_scholarships,
                          user=current_user)
 
+def exam_listing(class_level=None, exam_type=None):
+    """Active exams by date, optionally limited to one class and exam type"""
+    query = Exam.query.filter_by(is_active=True)
+    if class_level:
+        query = query.join(ExamClass).filter(ExamClass.class_level == class_level)
+    if exam_type:
+        query = query.filter(Exam.exam_type == exam_type)
+    return query.order_by(Exam.exam_date.asc())
+
 @advanced_bp.route('/exams')
 def exams():
     class_filter = request.args.get('class', '')
     exam_type_filter = request.args.get('type', '')
     
-    query = Exam.query.filter_by(is_active=True)
-    
-    if class_filter:
-        query = query.filter(Exam.eligibility_class.contains(f'"{class_filter}"'))
-    
-    if exam_type_filter:
-        query = query.filter_by(exam_type=exam_type_filter)
-    
-    exams = query.order_by(Exam.exam_date.asc()).all()
+    exams = exam_listing(class_filter, exam_type_filter).all()
     
     # Get upcoming exams (next 6 months)
     upcoming_date = datetime.now() + timedelta(days=180)
@@ -82,41 +78,50 @@ def exams():
                          exams=exams,
                          upcoming_exams=upcoming_exams)
 
+# Minimum 12th percentage by category; below it no college is suggested
+MIN_12TH_PERCENTAGE = {'General': 60, 'OBC': 55, 'SC': 50, 'ST': 45}
+
+def _chance(margin):
+    if margin is None:
+        return None
+    if margin < 0.1:
+        return 'Reach'
+    if margin < 0.3:
+        return 'Good chance'
+    return 'Safe'
+
 @advanced_bp.route('/college-eligibility-checker', methods=['GET', 'POST'])
 def college_eligibility_checker():
+    exam_options = cutoff_exams()
     if request.method == 'POST':
-        marks_10th = float(request.form.get('marks_10th', 0))
-        marks_12th = float(request.form.get('marks_12th', 0))
+        marks_12th = request.form.get('marks_12th', 0, type=float)
         category = request.form.get('category', 'General')
         stream = request.form.get('stream', '')
         state_preference = request.form.get('state_preference', '')
-        
-        # Simple eligibility logic (can be enhanced)
-        eligible_colleges = []
-        colleges = College.query.all()
-        
-        for college in colleges:
-            # Basic eligibility check
-            min_percentage = 60  # Base requirement
-            if category == 'SC':
-                min_percentage = 50
-            elif category == 'ST':
-                min_percentage = 45
-            elif category == 'OBC':
-                min_percentage = 55
-            
-            if marks_12th >= min_percentage:
-                if not stream or college.type.lower().find(stream.lower()) != -1:
-                    if not state_preference or college.state.lower() == state_preference.lower():
-                        eligible_colleges.append(college)
-        
+
+        # "<exam>|<metric>" from the exam select, plus the student's rank or score
+        exam, _, metric = request.form.get('exam', '').partition('|')
+        exam_value = request.form.get('exam_value', type=float)
+        if (exam, metric) not in exam_options:
+            exam = metric = None
+
+        eligible = []
+        if marks_12th >= MIN_12TH_PERCENTAGE.get(category, MIN_12TH_PERCENTAGE['General']):
+            # Filtering, cutoff comparison and ranking all happen in one query
+            eligible = eligible_colleges(category, exam=exam, metric=metric, value=exam_value,
+                                         state=state_preference, stream=stream)
+
+        colleges = [dict(college_to_dict(college), chance=_chance(margin)) for college, margin in eligible]
         return render_template('advanced/eligibility_results.html',
-                             colleges=eligible_colleges,
+                             colleges=colleges,
                              marks_12th=marks_12th,
                              category=category,
-                             stream=stream)
+                             stream=stream,
+                             exam=exam,
+                             metric=metric,
+                             exam_value=exam_value)
     
-    return render_template('advanced/college_eligibility_checker.html')
+    return render_template('advanced/college_eligibility_checker.html', exam_options=exam_options)
 
 @advanced_bp.route('/career-simulator', methods=['GET', 'POST'])
 @login_required
@@ -146,18 +151,32 @@ def career_simulator():
     
     return render_template('advanced/career_simulator.html')
 
+NOTIFICATION_PAGE_SIZE = 20
+
+def notification_page(user_id, position=None):
+    """A user's notifications newest first, one row past a page, older than position if given"""
+    query = Notification.query.filter_by(user_id=user_id)
+    if position:
+        query = query.filter(tuple_(Notification.created_at, Notification.id) < position)
+    return query.order_by(Notification.created_at.desc(), Notification.id.desc()) \
+        .limit(NOTIFICATION_PAGE_SIZE + 1)
+
 @advanced_bp.route('/notifications')
 @login_required
 def notifications():
-    notifications = Notification.query.filter_by(user_id=current_user.id).order_by(Notification.created_at.desc()).all()
-    
-    # Mark as read
+    # Mark everything read in one statement instead of loading and flagging each row
     if request.args.get('mark_read'):
-        for notification in notifications:
-            notification.is_read = True
+        Notification.query.filter_by(user_id=current_user.id, is_read=False) \
+            .update({'is_read': True}, synchronize_session=False)
         db.session.commit()
-    
-    return render_template('advanced/notifications.html', notifications=notifications)
+
+    # Newest first, one page at a time; `before` continues from the last row shown
+    position = _decode_row_cursor(request.args.get('before'))
+    rows = notification_page(current_user.id, position).all()
+
+    notifications = rows[:NOTIFICATION_PAGE_SIZE]
+    before = _encode_row_cursor(notifications[-1]) if len(rows) > NOTIFICATION_PAGE_SIZE else None
+    return render_template('advanced/notifications.html', notifications=notifications, before=before)
 
 @advanced_bp.route('/mentorship')
 @login_required
@@ -189,25 +208,63 @@ def ai_chat():
         session_obj = MentorshipSession(
             user_id=current_user.id,
             mentor_type='ai',
-            session_type='chat',
-            messages=json.dumps([])
+            session_type='chat'
         )
         db.session.add(session_obj)
     
-    # Update messages
-    messages = json.loads(session_obj.messages) if session_obj.messages else []
-    messages.append({
-        'user': message,
-        'ai': ai_response,
-        'timestamp': datetime.utcnow().isoformat()
-    })
-    session_obj.messages = json.dumps(messages)
+    # Append one row per turn instead of rewriting the whole conversation
+    db.session.add(MentorshipMessage(session=session_obj, user_message=message, ai_response=ai_response))
     session_obj.updated_at = datetime.utcnow()
     
     db.session.commit()
     
     return jsonify({'response': ai_response})
 
+HISTORY_PAGE_SIZE = 20
+
+def _encode_row_cursor(row):
+    """Keyset cursor for a row's (created_at, id) position"""
+    return f"{row.created_at.isoformat()}_{row.id}"
+
+def _decode_row_cursor(cursor):
+    try:
+        created_at, row_id = cursor.rsplit('_', 1)
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (AttributeError, ValueError):
+        return None
+
+def message_page(session_id, position=None, limit=HISTORY_PAGE_SIZE):
+    """A conversation's turns newest first, one row past a page, older than position if given"""
+    query = MentorshipMessage.query.filter_by(session_id=session_id)
+    if position:
+        query = query.filter(tuple_(MentorshipMessage.created_at, MentorshipMessage.id) < position)
+    return query.order_by(MentorshipMessage.created_at.desc(), MentorshipMessage.id.desc()).limit(limit + 1)
+
+@advanced_bp.route('/ai-chat/history')
+@login_required
+def ai_chat_history():
+    """Newest page of a mentorship conversation; `before` pages back through older turns"""
+    session_id = request.args.get('session_id', type=int)
+    sessions = MentorshipSession.query.filter_by(user_id=current_user.id)
+    if session_id is not None:
+        session_obj = sessions.filter_by(id=session_id).first_or_404()
+    else:
+        session_obj = sessions.filter_by(mentor_type='ai', status='active').first()
+        if not session_obj:
+            return jsonify({'session_id': None, 'messages': [], 'before': None})
+
+    limit = min(max(request.args.get('limit', HISTORY_PAGE_SIZE, type=int), 1), 100)
+    position = _decode_row_cursor(request.args.get('before'))
+    rows = message_page(session_obj.id, position, limit).all()
+
+    has_older = len(rows) > limit
+    rows = rows[:limit][::-1]  # oldest first for display
+    return jsonify({
+        'session_id': session_obj.id,
+        'messages': [row.to_dict() for row in rows],
+        'before': _encode_row_cursor(rows[0]) if has_older else None,
+    })
+
 def generate_career_simulation(stream, subjects, interests):
     """Generate career simulation based on user choices"""
     
@@ -1,77 +1,308 @@
 import os
 import logging
 from flask import Flask, render_template
+from flask.cli import ScriptInfo
 from werkzeug.middleware.proxy_fix import ProxyFix
 from flask_login import LoginManager
 from extensions import db
+from sqlalchemy import inspect
 from dotenv import load_dotenv
 from flask.cli import with_appcontext
 import click
 
-# Configure logging
-logging.basicConfig(level=logging.DEBUG)
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'migrations')
 
 # Load environment variables early
 load_dotenv()
 
-# Create the app
-app = Flask(__name__)
-app.secret_key = os.environ.get("SESSION_SECRET", "career-advisor-secret-key")
-app.wsgi_app = ProxyFix(app.wsgi_app, x_proto=1, x_host=1)
-
-# Configure the database
-app.config["SQLALCHEMY_DATABASE_URI"] = os.environ.get("DATABASE_URL", "sqlite:///career_advisor.db")
-app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
-    "pool_recycle": 300,
-    "pool_pre_ping": True,
-}
-
-# Initialize the app with the extension
-db.init_app(app)
+# Opt-in verbose logging (e.g. LOG_LEVEL=DEBUG); library defaults otherwise
+if os.environ.get("LOG_LEVEL"):
+    logging.basicConfig(level=os.environ["LOG_LEVEL"].upper())
 
 # Initialize Flask-Login
 login_manager = LoginManager()
-login_manager.init_app(app)
 login_manager.login_view = 'auth.login'
 login_manager.login_message = 'Please log in to access this page.'
 
-with app.app_context():
-    # Import models and routes only after db/app are ready
+
+# Setup user loader for Flask-Login: a cached identity snapshot, not a query per request
+@login_manager.user_loader
+def load_user(user_id):
+    from user_identity import load_identity
+    return load_identity(user_id)
+
+
+def create_app(config=None):
+    """Create the Flask app; `config` (a mapping) overrides the environment defaults.
+
+    Creating the app does not touch the database. Prepare it once with
+    `flask init-db` and `flask seed`, or set AUTO_BOOTSTRAP=1 to run both at
+    startup (handy for local development).
+    """
+    app = Flask(__name__)
+    app.secret_key = os.environ.get("SESSION_SECRET", "career-advisor-secret-key")
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_proto=1, x_host=1)
+
+    # Configure the database
+    app.config["SQLALCHEMY_DATABASE_URI"] = os.environ.get("DATABASE_URL", "sqlite:///career_advisor.db")
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
+        "pool_recycle": 300,
+        "pool_pre_ping": True,
+    }
+
+    # How often each worker re-checks catalog versions for cache invalidation (seconds)
+    app.config["CATALOG_VERSION_CHECK_INTERVAL"] = float(os.environ.get("CATALOG_VERSION_CHECK_INTERVAL", 5))
+
+    # Part of the rendered page cache key; set per deploy to drop cached pages
+    app.config["APP_VERSION"] = os.environ.get("APP_VERSION", "")
+
+    # Create tables and seed sample data when the app starts
+    app.config["AUTO_BOOTSTRAP"] = os.environ.get("AUTO_BOOTSTRAP", "").lower() in ("1", "true", "yes")
+
+    if config:
+        app.config.update(config)
+
+    # Initialize the app with the extensions
+    db.init_app(app)
+    login_manager.init_app(app)
+
+    # Import models and routes only when an app is built
     import models  # noqa: F401
-    
-    # Register routes
+    import user_identity  # noqa: F401  (registers identity cache invalidation)
     from routes import register_routes
     register_routes(app)
 
-    # Setup user loader for Flask-Login
-    @login_manager.user_loader
-    def load_user(user_id):
-        from models import User
-        return User.query.get(user_id)
+    # Fingerprinted static URLs and precompressed, immutable responses once `flask build-assets` has run
+    from static_assets import init_static_assets
+    init_static_assets(app)
+
+    register_commands(app)
+    register_error_handlers(app)
+
+    if app.config["AUTO_BOOTSTRAP"]:
+        with app.app_context():
+            init_db()
+            seed_db()
 
-    # Create all tables
+    return app
+
+
+def init_db():
+    """Create tables and indexes and run the idempotent data migrations"""
     db.create_all()
 
-    # Initialize sample data
+    # create_all() skips indexes declared later on tables that already exist
+    for table in db.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(db.engine, checkfirst=True)
+
+    # Full-text search index for the college finder
+    from search_index import ensure_search_index
+    ensure_search_index()
+
+    from models import backfill_cutoffs, backfill_eligibility, migrate_mentorship_messages
+
+    # Migrate JSON eligibility lists into the indexed lookup tables
+    backfill_eligibility()
+
+    # Parse free-text college cutoffs into CollegeCutoff rows
+    backfill_cutoffs()
+
+    # Migrate JSON mentorship conversations into per-turn rows
+    migrate_mentorship_messages()
+
+    # A database created here matches the latest migration; record that once so
+    # `flask db upgrade` has nothing to redo (migrated databases track it themselves)
+    if not inspect(db.engine).has_table('alembic_version'):
+        from flask import current_app
+        from flask_migrate import stamp
+        init_migrate(current_app)
+        stamp(directory=MIGRATIONS_DIR)
+
+
+def init_migrate(app):
+    """Attach Flask-Migrate on demand; Alembic is only imported by commands that need it"""
+    if 'migrate' not in app.extensions:
+        from flask_migrate import Migrate
+        Migrate(app, db, directory=MIGRATIONS_DIR, render_as_batch=True)
+
+
+def seed_db():
+    """Insert the sample scholarships, exams, colleges and careers into empty tables"""
     from models import initialize_data
     initialize_data()
 
-    # CLI: Import colleges from CSV
+
+# CLI: Prepare the database schema
+@click.command('init-db')
+@with_appcontext
+def init_db_command():
+    init_db()
+    click.echo("Database tables and indexes are ready")
+
+
+# CLI: Load sample data
+@click.command('seed')
+@with_appcontext
+def seed_command():
+    seed_db()
+    click.echo("Sample data loaded")
+
+
+# CLI: Import colleges from CSV
+@click.command('import-colleges')
+@click.argument('csv_path')
+@click.option('--chunk-size', default=1000, show_default=True, type=int,
+              help='Rows per bulk statement and commit.')
+@click.option('--resume', is_flag=True,
+              help='Skip rows committed by a previous interrupted run of the same file.')
+@with_appcontext
+def import_colleges_command(csv_path, chunk_size, resume):
     from admin_tools import import_colleges_from_csv
 
-    @click.command('import-colleges')
-    @click.argument('csv_path')
-    @with_appcontext
-    def import_colleges_command(csv_path):
-        try:
-            count = import_colleges_from_csv(csv_path)
-            click.echo(f"Imported/updated {count} colleges from {csv_path}")
-        except Exception as e:
-            click.echo(f"Failed to import: {e}")
+    def report(rows_read, rows_upserted, elapsed):
+        rate = rows_read / elapsed if elapsed > 0 else 0
+        click.echo(f"  {rows_read} rows read, {rows_upserted} upserted ({rate:,.0f} rows/s)")
+
+    try:
+        count = import_colleges_from_csv(csv_path, chunk_size=chunk_size, resume=resume, progress=report)
+        click.echo(f"Imported/updated {count} colleges from {csv_path}")
+    except Exception as e:
+        db.session.rollback()
+        click.echo(f"Failed to import: {e}")
+        click.echo("Committed chunks were kept; rerun with --resume to continue.")
+
+
+# CLI: Rescore stored quiz results after the weight table changes
+@click.command('rescore-quiz-results')
+@click.option('--chunk-size', default=5000, show_default=True, type=int,
+              help='Results scored and written per batch.')
+@with_appcontext
+def rescore_quiz_results_command(chunk_size):
+    from admin_tools import rescore_quiz_results
+
+    def report(rows, elapsed):
+        rate = rows / elapsed if elapsed > 0 else 0
+        click.echo(f"  {rows} results rescored ({rate:,.0f} rows/s)")
+
+    count = rescore_quiz_results(chunk_size=chunk_size, progress=report)
+    click.echo(f"Rescored {count} quiz results")
+
+
+# CLI: Notify students of upcoming scholarship and exam deadlines (run from cron/a scheduler)
+@click.command('notify-deadlines')
+@click.option('--days', default=7, show_default=True, type=int,
+              help='Notify about deadlines within this many days from now.')
+@click.option('--chunk-size', default=5000, show_default=True, type=int,
+              help='Users per INSERT ... SELECT and commit.')
+@with_appcontext
+def notify_deadlines_command(days, chunk_size):
+    from admin_tools import notify_upcoming_deadlines
+
+    def report(title, inserted, elapsed):
+        click.echo(f"  {inserted} notified: {title} ({elapsed:.2f}s)")
+
+    count = notify_upcoming_deadlines(days=days, chunk_size=chunk_size, progress=report)
+    click.echo(f"Created {count} deadline notifications")
+
+
+# CLI: Rebuild the college search index
+@click.command('rebuild-search-index')
+@with_appcontext
+def rebuild_search_index_command():
+    from search_index import rebuild_search_index
+    if rebuild_search_index():
+        click.echo("College search index rebuilt")
+    else:
+        click.echo("Full-text search is not available on this database; using LIKE matching")
+
 
+# CLI: EXPLAIN the hot queries and fail if any of them scans a whole table
+@click.command('check-indexes')
+@with_appcontext
+def check_indexes_command():
+    from query_plans import check_query_plans
+    failures = 0
+    for name, plan, problems in check_query_plans():
+        click.echo(f"{'FAIL' if problems else 'ok  '} {name}")
+        for line in plan:
+            click.echo(f"       {line}")
+        for problem in problems:
+            click.echo(f"       ! {problem}")
+        failures += bool(problems)
+    if failures:
+        raise click.ClickException(f"{failures} queries are not covered by an index")
+    click.echo("All hot queries use an index")
+
+
+# CLI: Fingerprint, minify and precompress static assets (run on deploy, then restart the app)
+@click.command('build-assets')
+@click.option('--no-minify', is_flag=True, help='Copy CSS and JS as they are.')
+@click.option('--clean', is_flag=True, help='Remove previous builds first (running workers may still reference them).')
+@with_appcontext
+def build_assets_command(no_minify, clean):
+    from flask import current_app
+    from static_assets import build_assets, missing_build_packages
+
+    def kb(size):
+        return f"{size / 1024:8.1f}K" if size is not None else '        -'
+
+    missing = missing_build_packages(minify=not no_minify)
+    for package, consequence in missing:
+        click.secho(f"WARNING: {package} is not installed: {consequence}", fg='yellow', bold=True, err=True)
+    if missing:
+        click.secho("Install them with `pip install -r requirements.txt` before building for production.",
+                    fg='yellow', err=True)
+
+    built = build_assets(current_app.static_folder, minify=not no_minify, clean=clean)
+    click.echo(f"{'asset':50} {'original':>9} {'built':>9} {'gzip':>9} {'brotli':>9}")
+    for asset in built:
+        click.echo(f"{asset.path:50} {kb(asset.size)} {kb(asset.built_size)} {kb(asset.gzip_size)} {kb(asset.brotli_size)}")
+    click.echo(f"Built {len(built)} assets into {os.path.join(current_app.static_folder, 'dist')}")
+
+
+# CLI: Alembic migrations (`flask db upgrade`, `flask db migrate`, ...); Flask-Migrate's
+# subcommands are only imported when this group is used
+class MigrateGroup(click.Group):
+    def _migrate_cli(self, ctx):
+        init_migrate(ctx.ensure_object(ScriptInfo).load_app())
+        from flask_migrate.cli import db as migrate_cli
+        return migrate_cli
+
+    def list_commands(self, ctx):
+        return self._migrate_cli(ctx).list_commands(ctx)
+
+    def get_command(self, ctx, name):
+        return self._migrate_cli(ctx).get_command(ctx, name)
+
+
+@click.group('db', cls=MigrateGroup)
+@click.option('-d', '--directory', default=None,
+              help='Migration script directory (default is "migrations")')
+@click.option('-x', '--x-arg', multiple=True,
+              help='Additional arguments consumed by custom env.py scripts')
+@with_appcontext
+def db_command(directory, x_arg):
+    """Perform database migrations."""
+    from flask import g
+    # Read by Migrate.get_config(), as in flask_migrate.cli.db
+    g.directory = directory
+    g.x_arg = x_arg
+
+
+def register_commands(app):
+    app.cli.add_command(init_db_command)
+    app.cli.add_command(seed_command)
     app.cli.add_command(import_colleges_command)
+    app.cli.add_command(rescore_quiz_results_command)
+    app.cli.add_command(notify_deadlines_command)
+    app.cli.add_command(rebuild_search_index_command)
+    app.cli.add_command(check_indexes_command)
+    app.cli.add_command(build_assets_command)
+    app.cli.add_command(db_command)
+
 
-    # Error handlers
+def register_error_handlers(app):
     @app.errorhandler(404)
     def not_found_error(error):
         return render_template('error.html', error_code=404), 404
@@ -85,5 +316,6 @@ with app.app_context():
     def forbidden_error(error):
         return render_template('error.html', error_code=403), 403
 
+
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=5000, debug=True)
+    create_app({"AUTO_BOOTSTRAP": True}).run(host='0.0.0.0', port=5000, debug=True)
@@ -0,0 +1,75 @@
+"""Micro-benchmark for chat intent classification.
+
+Compares the original per-function substring scans with the compiled
+single-pass classifier in chatbot.classify_message.
+
+    python benchmarks/chat_intent.py [--repeat N]
+"""
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from chatbot import (CAREER_KEYWORDS, DEFAULT_QUERY_TYPE, GREETING_PATTERNS,  # noqa: E402
+                     QUERY_TYPE_KEYWORDS, classify_message)
+
+MESSAGES = [
+    "hi",
+    "Which is the best engineering college in Srinagar for computer science?",
+    "What is the eligibility for NEET and how should I prepare for it?",
+    "Tell me about scholarships for SC students in class 12",
+    "Is this a good time to choose commerce after 10th?",
+    "What's the weather like in Gulmarg this weekend?",
+    "I want to become a doctor, which entrance exams should I take and what are the fees?",
+    "Can you suggest internships and placement options after a diploma in pharmacy?",
+]
+
+
+def substring_classify(message):
+    # The original request path: greeting check, career check (which scans the
+    # greetings again) and query type, each lowercasing and scanning substrings
+    lowered = message.lower().strip()
+    greeting = any(pattern in lowered for pattern in list(GREETING_PATTERNS))
+
+    lowered = message.lower().strip()
+    career = any(pattern in lowered for pattern in list(GREETING_PATTERNS)) \
+        or any(keyword in lowered for keyword in list(CAREER_KEYWORDS))
+
+    lowered = message.lower()
+    query_type = DEFAULT_QUERY_TYPE
+    for name, words in QUERY_TYPE_KEYWORDS:
+        if any(word in lowered for word in list(words)):
+            query_type = name
+            break
+    return greeting, career, query_type
+
+
+def compiled_classify(message):
+    # Bypass the lru_cache so every call really scans the message
+    return classify_message.__wrapped__(message)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=20000, help='passes over the sample messages')
+    args = parser.parse_args()
+
+    for name, func in (('substring scans', substring_classify),
+                       ('compiled table', compiled_classify),
+                       ('compiled, cached', classify_message)):
+        seconds = min(timeit.repeat(lambda: [func(m) for m in MESSAGES], number=args.repeat, repeat=3))
+        per_call = seconds / (args.repeat * len(MESSAGES)) * 1e6
+        print(f"{name:16} {per_call:7.2f} us/message")
+
+    print()
+    for message in MESSAGES:
+        old, new = substring_classify(message), compiled_classify(message)
+        marker = ' ' if old == tuple(new) else '*'
+        print(f"{marker} {new.query_type:22} greeting={new.greeting!s:5} career={new.career_related!s:5} {message}")
+    print("\n* classification differs from the substring scans (word boundaries)")
+
+
+if __name__ == '__main__':
+    main()
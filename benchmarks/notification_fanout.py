@@ -0,0 +1,74 @@
+"""Benchmark for the deadline notification fan-out.
+
+Fills a temporary SQLite database with N students and a few scholarships
+and exams whose deadlines fall inside the window, then times
+admin_tools.notify_upcoming_deadlines twice: the first run inserts the
+notifications, the rerun should insert none.
+
+    python benchmarks/notification_fanout.py [--users N] [--chunk-size N] [--database-url URL]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+CATEGORIES = ['General', 'SC', 'ST', 'OBC']
+CLASSES = ['10th', '12th', 'graduation']
+
+
+def seed(db, users):
+    from sqlalchemy import insert
+    from models import Exam, Scholarship, User
+
+    soon = datetime.utcnow() + timedelta(days=3)
+    for offset in range(0, users, 10000):
+        db.session.execute(insert(User), [
+            {'id': str(uuid.uuid4()), 'email': f'student{i}@example.com', 'password_hash': 'x',
+             'first_name': 'Student', 'last_name': str(i), 'role': 'student',
+             'category': CATEGORIES[i % len(CATEGORIES)], 'class_level': CLASSES[i % len(CLASSES)]}
+            for i in range(offset, min(users, offset + 10000))
+        ])
+    db.session.add_all([
+        Scholarship(name='Open merit scholarship', category_eligible=json.dumps(['General']),
+                    class_eligible=json.dumps(['12th', 'graduation']), application_deadline=soon, is_active=True),
+        Scholarship(name='SC/ST scholarship', category_eligible=json.dumps(['SC', 'ST']),
+                    class_eligible=json.dumps(['10th', '12th']), application_deadline=soon, is_active=True),
+        Exam(name='Entrance exam', eligibility_class=json.dumps(['12th']), registration_end=soon, is_active=True),
+    ])
+    db.session.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--users', type=int, default=100000, help='students to create')
+    parser.add_argument('--chunk-size', type=int, default=5000, help='users per INSERT ... SELECT')
+    parser.add_argument('--database-url', help='empty database to use (default: a temporary SQLite file)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database_url = args.database_url or f"sqlite:///{os.path.join(tmp, 'fanout.db')}"
+        from app import create_app, init_db
+        from extensions import db
+        from admin_tools import notify_upcoming_deadlines
+
+        app = create_app({'SQLALCHEMY_DATABASE_URI': database_url})
+        with app.app_context():
+            init_db()
+            started = time.perf_counter()
+            seed(db, args.users)
+            print(f"seeded {args.users} students in {time.perf_counter() - started:.2f}s")
+
+            for label in ('first run', 'rerun'):
+                started = time.perf_counter()
+                created = notify_upcoming_deadlines(days=7, chunk_size=args.chunk_size)
+                print(f"{label:10} {created:8} notifications in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""Cold-start benchmark for the Flask app factory.
+
+Starts a fresh interpreter per run (like a new gunicorn worker or a
+serverless cold start) and times `from app import create_app; create_app()`
+against a prepared SQLite database, with and without AUTO_BOOTSTRAP, next to
+`from app import app` from the baseline revision, whose import bootstrapped
+the database (create_all, index checks, seeding checks and data backfills).
+The baseline is exported from git into a temporary directory.
+
+    python benchmarks/startup.py [--runs N] [--database-url URL] [--baseline REV]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tarfile
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The last revision that bootstrapped the database when app.py was imported
+BASELINE_REVISION = 'a32afd8~1'
+
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+from app import create_app
+imported = time.perf_counter()
+create_app()
+finished = time.perf_counter()
+heavy = [name for name in ('numpy', 'requests', 'httpx', 'admin_tools', 'alembic') if name in sys.modules]
+print(json.dumps({'import': imported - started, 'create': finished - imported, 'heavy': heavy}))
+"""
+
+# The baseline built the app and bootstrapped the database at import time
+BASELINE_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+from app import app
+imported = time.perf_counter()
+heavy = [name for name in ('numpy', 'requests', 'httpx', 'admin_tools', 'alembic') if name in sys.modules]
+print(json.dumps({'import': imported - started, 'create': 0.0, 'heavy': heavy}))
+"""
+
+
+def run_once(database_url, bootstrap, probe=PROBE, cwd=ROOT):
+    env = dict(os.environ, DATABASE_URL=database_url, AUTO_BOOTSTRAP='1' if bootstrap else '0')
+    env.pop('LOG_LEVEL', None)
+    out = subprocess.run([sys.executable, '-c', probe], cwd=cwd, env=env,
+                         capture_output=True, text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def export_revision(revision, directory):
+    """Write the tree of a git revision into directory"""
+    archive = os.path.join(directory, 'baseline.tar')
+    subprocess.run(['git', 'archive', '--format=tar', '-o', archive, revision], cwd=ROOT, check=True)
+    with tarfile.open(archive) as tar:
+        tar.extractall(os.path.join(directory, 'baseline'))
+    return os.path.join(directory, 'baseline')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=7, help='fresh interpreters per mode')
+    parser.add_argument('--database-url', help='database to start against (default: a temporary SQLite file)')
+    parser.add_argument('--baseline', default=BASELINE_REVISION,
+                        help=f'revision with the import-time bootstrap (default: {BASELINE_REVISION})')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database_url = args.database_url or f"sqlite:///{os.path.join(tmp, 'startup.db')}"
+        # Prepare the schema and sample data once, as `flask init-db && flask seed` would
+        run_once(database_url, bootstrap=True)
+        baseline = export_revision(args.baseline, tmp)
+
+        modes = (
+            (f'import-time bootstrap ({args.baseline})', True, BASELINE_PROBE, baseline),
+            ('create_app()', False, PROBE, ROOT),
+            ('create_app() + bootstrap', True, PROBE, ROOT),
+        )
+        for label, bootstrap, probe, cwd in modes:
+            runs = [run_once(database_url, bootstrap, probe, cwd) for _ in range(args.runs)]
+            imports = statistics.median(r['import'] for r in runs) * 1000
+            creates = statistics.median(r['create'] for r in runs) * 1000
+            totals = statistics.median(r['import'] + r['create'] for r in runs) * 1000
+            print(f"{label:34} import {imports:7.1f} ms  create {creates:7.1f} ms  "
+                  f"total {totals:7.1f} ms  (median of {args.runs})")
+            print(f"{'':34} heavy modules loaded: {', '.join(runs[0]['heavy']) or 'none'}")
+
+if __name__ == '__main__':
+    main()
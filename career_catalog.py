@@ -0,0 +1,93 @@
+import hashlib
+import json
+from typing import NamedTuple
+from models import Career
+from catalog_cache import CatalogCache, track_catalog
+
+# In-process copy of the Career table with JSON fields already decoded,
+# rebuilt whenever the 'career' catalog version changes.
+
+JSON_FIELDS = ('job_roles', 'skills_required', 'path_after_10th', 'path_after_12th',
+               'government_exams', 'reservation_benefits')
+
+track_catalog(Career, 'career')
+
+
+class CareerCatalog(NamedTuple):
+    careers: tuple  # career dicts in id order
+    by_category: dict  # category -> first career dict in that category
+
+
+def _decode(value, default):
+    try:
+        return json.loads(value) if value else default
+    except ValueError:
+        return default
+
+
+def _career_to_dict(career):
+    data = {
+        'id': career.id,
+        'name': career.name,
+        'category': career.category,
+        'description': career.description,
+        'required_education': career.required_education,
+        'salary_range': career.salary_range,
+        'growth_opportunities': career.growth_opportunities,
+    }
+    for field in JSON_FIELDS:
+        data[field] = _decode(getattr(career, field), {} if field == 'reservation_benefits' else [])
+    return data
+
+
+def _build_catalog():
+    careers = tuple(_career_to_dict(career) for career in Career.query.order_by(Career.id).all())
+    by_category = {}
+    for career in careers:
+        by_category.setdefault(career['category'], career)
+    return CareerCatalog(careers=careers, by_category=by_category)
+
+
+_catalog = CatalogCache('career', _build_catalog)
+
+
+def career_catalog():
+    """The cached CareerCatalog for the current catalog version."""
+    return _catalog.get()
+
+
+def career_for_category(category):
+    """The representative career for a quiz category, or None."""
+    return career_catalog().by_category.get(category)
+
+
+# Fields shown by /career-explorer and returned by /api/careers
+EXPLORER_FIELDS = ('id', 'name', 'category', 'description', 'required_education', 'job_roles',
+                   'salary_range', 'growth_opportunities', 'skills_required')
+
+
+class ExplorerPayload(NamedTuple):
+    career_data: tuple  # dicts ready for the career_explorer template
+    json_body: bytes  # the same list, serialized once for API clients
+    etag: str
+
+
+def _build_explorer_payload():
+    career_data = tuple(
+        {field: career[field] for field in EXPLORER_FIELDS}
+        for career in career_catalog().careers
+    )
+    json_body = json.dumps({'careers': career_data}, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return ExplorerPayload(
+        career_data=career_data,
+        json_body=json_body,
+        etag=hashlib.sha1(json_body).hexdigest(),
+    )
+
+
+_explorer = CatalogCache('career', _build_explorer_payload)
+
+
+def explorer_payload():
+    """Fully built career explorer data and its pre-serialized JSON, cached per catalog version."""
+    return _explorer.get()
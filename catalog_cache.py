@@ -0,0 +1,134 @@
+import threading
+import time
+from datetime import datetime
+from flask import current_app
+from sqlalchemy import event, update, insert, select
+from sqlalchemy.orm import Session
+from extensions import db
+from models import CatalogVersion
+
+# Per-process caches for slowly changing catalogs (colleges, careers, ...).
+#
+# Each catalog has a version row in the catalog_version table. Any write to a
+# tracked model bumps that row in the same transaction, so every gunicorn
+# worker sees the change the next time it checks the version. Workers only
+# re-read the version every CATALOG_VERSION_CHECK_INTERVAL seconds, which
+# keeps a cache hit free of database round trips.
+
+DEFAULT_CHECK_INTERVAL = 5.0
+
+_lock = threading.Lock()
+_versions = {}  # catalog name -> (version, checked_at)
+_tracked_models = {}  # model class -> catalog name
+
+
+def _check_interval():
+    try:
+        return float(current_app.config.get('CATALOG_VERSION_CHECK_INTERVAL', DEFAULT_CHECK_INTERVAL))
+    except RuntimeError:
+        return DEFAULT_CHECK_INTERVAL
+
+
+def get_catalog_version(name):
+    """Return the shared version of a catalog, re-reading it at most once per check interval."""
+    now = time.monotonic()
+    cached = _versions.get(name)
+    if cached and now - cached[1] < _check_interval():
+        return cached[0]
+
+    version = db.session.execute(
+        select(CatalogVersion.version).where(CatalogVersion.name == name)
+    ).scalar()
+    version = version or 0
+    with _lock:
+        _versions[name] = (version, now)
+    return version
+
+
+def bump_catalog_version(name, session=None):
+    """Increment a catalog's version inside the current transaction.
+
+    Use this after bulk statements that bypass the ORM flush hooks.
+    """
+    session = session or db.session
+    _bump(session.connection(), name)
+    session.info.setdefault('bumped_catalogs', set()).add(name)
+
+
+def _bump(connection, name):
+    table = CatalogVersion.__table__
+    result = connection.execute(
+        update(table)
+        .where(table.c.name == name)
+        .values(version=table.c.version + 1, updated_at=datetime.utcnow())
+    )
+    if result.rowcount == 0:
+        connection.execute(insert(table).values(name=name, version=1, updated_at=datetime.utcnow()))
+
+
+def forget_catalog_version(name):
+    """Force the next get_catalog_version() call to hit the database."""
+    with _lock:
+        _versions.pop(name, None)
+
+
+def track_catalog(model, name):
+    """Bump catalog `name` whenever rows of `model` are inserted, updated or deleted via the ORM."""
+    _tracked_models[model] = name
+
+
+@event.listens_for(Session, 'after_flush')
+def _bump_tracked_catalogs(session, flush_context):
+    if not _tracked_models:
+        return
+    changed = set()
+    for obj in list(session.new) + list(session.deleted):
+        name = _tracked_models.get(type(obj))
+        if name:
+            changed.add(name)
+    for obj in session.dirty:
+        name = _tracked_models.get(type(obj))
+        if name and session.is_modified(obj, include_collections=False):
+            changed.add(name)
+
+    bumped = session.info.setdefault('bumped_catalogs', set())
+    for name in changed - bumped:
+        _bump(session.connection(), name)
+        bumped.add(name)
+
+
+@event.listens_for(Session, 'after_commit')
+def _expire_bumped_catalogs(session):
+    for name in session.info.pop('bumped_catalogs', ()):
+        forget_catalog_version(name)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_bumped_catalogs(session):
+    session.info.pop('bumped_catalogs', None)
+
+
+class CatalogCache:
+    """A value built from a catalog, rebuilt when the catalog version changes."""
+
+    def __init__(self, catalog, builder):
+        self.catalog = catalog
+        self.builder = builder
+        self._lock = threading.Lock()
+        self._version = None
+        self._value = None
+
+    def get(self):
+        version = get_catalog_version(self.catalog)
+        if self._version == version:
+            return self._value
+        with self._lock:
+            if self._version != version:
+                self._value = self.builder()
+                self._version = version
+        return self._value
+
+    def invalidate(self):
+        with self._lock:
+            self._version = None
+            self._value = None
@@ -0,0 +1,162 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+import httpx
+from fastapi import APIRouter, FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from chat_cache import cache_key, response_cache
+from chatbot import (SSE_HEADERS, UPSTREAM_TIMEOUT, build_upstream_request, determine_query_type,
+                     final_event, interpret_upstream_response, parse_stream_line, precheck_message,
+                     reply_to_response, sse_event)
+from llm_gateway import MAX_CONCURRENCY, admit_async, call_upstream_async, release_async
+
+# Native async /api/chat for the FastAPI gateway.
+#
+# Upstream Gemini calls share one pooled httpx.AsyncClient (keep-alive, HTTP
+# connection reuse) and go through llm_gateway, which coalesces identical
+# in-flight questions, caps outstanding calls and trips a circuit breaker
+# when Gemini keeps failing, so slow generations wait on the event loop
+# instead of holding a WSGI worker thread each.
+
+router = APIRouter()
+
+_client = None
+
+
+def get_client():
+    """The shared upstream client (created lazily outside the app lifespan, e.g. in scripts)."""
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            timeout=httpx.Timeout(UPSTREAM_TIMEOUT, connect=5.0),
+            limits=httpx.Limits(max_connections=MAX_CONCURRENCY,
+                                max_keepalive_connections=MAX_CONCURRENCY,
+                                keepalive_expiry=60.0),
+        )
+    return _client
+
+
+async def close_client():
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    get_client()
+    try:
+        yield
+    finally:
+        await close_client()
+
+
+async def _cache_call(func, *args):
+    # A shared (network) cache must not block the event loop
+    if response_cache.is_remote:
+        return await asyncio.to_thread(func, *args)
+    return func(*args)
+
+
+async def answer_chat_async(user_message):
+    """Async twin of chatbot.answer_chat with the same (body, status) contract."""
+    early = precheck_message(user_message)
+    if early is not None:
+        return early
+
+    query_type = determine_query_type(user_message)
+    cached = await _cache_call(response_cache.get, query_type, user_message)
+    if cached is not None:
+        return cached, 200
+
+    url, headers, payload = build_upstream_request(user_message)
+
+    async def fetch():
+        try:
+            r = await get_client().post(url, json=payload, headers=headers)
+            body, status = interpret_upstream_response(r.status_code, r.text, r.json, query_type)
+        except httpx.TimeoutException:
+            return {"error": "Upstream timeout"}, 504, False
+        except Exception as e:
+            return {"error": "Server error", "details": str(e)}, 500, False
+        if status == 200:
+            await _cache_call(response_cache.set, query_type, user_message, body)
+        return body, status, r.status_code < 500
+
+    # Identical questions asked at the same moment share one upstream call
+    return await call_upstream_async(cache_key(query_type, user_message), fetch)
+
+
+async def stream_chat_async(user_message):
+    """Async twin of chatbot.stream_chat: yields SSE strings."""
+    early = precheck_message(user_message)
+    if early is not None:
+        yield final_event(*early)
+        return
+
+    query_type = determine_query_type(user_message)
+    cached = await _cache_call(response_cache.get, query_type, user_message)
+    if cached is not None:
+        yield final_event(cached, 200)
+        return
+
+    ticket, rejection = await admit_async()
+    if rejection is not None:
+        yield final_event(*rejection)
+        return
+
+    # The slot is held until the upstream stream is finished
+    url, headers, payload = build_upstream_request(user_message, stream=True)
+    parts = []
+    healthy = None
+    try:
+        async with get_client().stream('POST', url, json=payload, headers=headers) as r:
+            healthy = r.status_code < 500
+            if r.status_code >= 400:
+                details = (await r.aread()).decode('utf-8', 'replace')
+                yield final_event({"error": f"Upstream {r.status_code}", "details": details[:500]}, 502)
+                return
+            async for line in r.aiter_lines():
+                text = parse_stream_line(line)
+                if text:
+                    parts.append(text)
+                    yield sse_event('token', {"text": text})
+    except httpx.TimeoutException:
+        healthy = False
+        yield final_event({"error": "Upstream timeout"}, 504)
+        return
+    except Exception as e:
+        healthy = False
+        yield final_event({"error": "Server error", "details": str(e)}, 500)
+        return
+    finally:
+        release_async(ticket, healthy)
+
+    body, status = reply_to_response("".join(parts), query_type)
+    if status == 200:
+        await _cache_call(response_cache.set, query_type, user_message, body)
+    yield final_event(body, status)
+
+
+async def _read_message(request):
+    try:
+        data = await request.json()
+    except ValueError:
+        data = None
+    if not isinstance(data, dict):
+        data = {}
+    return (data.get('message') or '').strip()
+
+
+@router.post("/api/chat")
+async def chat(request: Request):
+    body, status = await answer_chat_async(await _read_message(request))
+    return JSONResponse(body, status_code=status)
+
+
+@router.post("/api/chat/stream")
+async def chat_stream(request: Request):
+    return StreamingResponse(stream_chat_async(await _read_message(request)),
+                             media_type='text/event-stream', headers=SSE_HEADERS)
@@ -0,0 +1,146 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+
+# Cache of formatted /api/chat answers.
+#
+# Keys combine the query type with a normalized form of the message
+# (lowercased, stopwords dropped, tokens de-duplicated and sorted), so
+# "What is NEET eligibility?" and "neet eligibility" share one entry.
+# Entries expire after CHAT_CACHE_TTL seconds. The in-process backend evicts
+# least-recently-used entries beyond CHAT_CACHE_MAX_ENTRIES; setting
+# CHAT_CACHE_REDIS_URL shares the cache (and its counters) across workers,
+# with eviction left to the server's maxmemory-policy (e.g. allkeys-lru).
+
+DEFAULT_TTL = 6 * 60 * 60
+DEFAULT_MAX_ENTRIES = 1000
+KEY_PREFIX = 'edvise:chat:'
+
+logger = logging.getLogger(__name__)
+
+STOPWORDS = frozenset("""
+a about am an and any are as at be can could do does for from give how i if in
+is it me my of on or please should tell the there this to want what when where
+which who why will with would you your
+""".split())
+
+
+def normalize_message(message):
+    tokens = re.findall(r'\w+', (message or '').lower())
+    return ' '.join(sorted({token for token in tokens if token not in STOPWORDS}))
+
+
+def cache_key(query_type, message):
+    normalized = normalize_message(message)
+    digest = hashlib.sha1(f"{query_type}|{normalized}".encode('utf-8')).hexdigest()
+    return f"{KEY_PREFIX}{digest}"
+
+
+class MemoryBackend:
+    is_remote = False
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._entries[key]
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[1]
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self):
+        with self._lock:
+            return {'backend': 'memory', 'hits': self._hits, 'misses': self._misses,
+                    'entries': len(self._entries), 'max_entries': self.max_entries}
+
+
+class RedisBackend:
+    is_remote = True
+
+    def __init__(self, url):
+        import redis
+        self._redis = redis.Redis.from_url(url)
+
+    def get(self, key):
+        raw = self._redis.get(key)
+        self._redis.incr(f"{KEY_PREFIX}{'hits' if raw is not None else 'misses'}")
+        return json.loads(raw) if raw is not None else None
+
+    def set(self, key, value, ttl):
+        self._redis.set(key, json.dumps(value), ex=int(ttl))
+
+    def stats(self):
+        hits, misses = self._redis.mget(f"{KEY_PREFIX}hits", f"{KEY_PREFIX}misses")
+        return {'backend': 'redis', 'hits': int(hits or 0), 'misses': int(misses or 0)}
+
+
+class ChatResponseCache:
+    def __init__(self, backend, ttl):
+        self.backend = backend
+        self.ttl = ttl
+
+    @property
+    def is_remote(self):
+        return self.backend.is_remote
+
+    def get(self, query_type, message):
+        try:
+            return self.backend.get(cache_key(query_type, message))
+        except Exception:
+            # A cache outage must never break chat
+            return None
+
+    def set(self, query_type, message, response):
+        try:
+            self.backend.set(cache_key(query_type, message), response, self.ttl)
+        except Exception:
+            pass
+
+    def stats(self):
+        try:
+            stats = self.backend.stats()
+        except Exception as e:
+            return {'backend': 'unavailable', 'error': str(e)}
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = round(stats['hits'] / lookups, 3) if lookups else 0.0
+        stats['ttl'] = self.ttl
+        return stats
+
+
+def _create_cache():
+    ttl = float(os.environ.get('CHAT_CACHE_TTL', DEFAULT_TTL))
+    redis_url = os.environ.get('CHAT_CACHE_REDIS_URL')
+    if redis_url:
+        try:
+            return ChatResponseCache(RedisBackend(redis_url), ttl)
+        except ImportError:
+            logger.warning("CHAT_CACHE_REDIS_URL is set but the redis package is not installed "
+                           "(pip install redis); falling back to a per-process chat cache")
+    max_entries = int(os.environ.get('CHAT_CACHE_MAX_ENTRIES', DEFAULT_MAX_ENTRIES))
+    return ChatResponseCache(MemoryBackend(max_entries), ttl)
+
+
+response_cache = _create_cache()
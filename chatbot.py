@@ -0,0 +1,541 @@
+import json
+import os
+from functools import lru_cache
+from typing import NamedTuple
+
+from chat_cache import cache_key, response_cache
+from llm_gateway import admit, call_upstream, release
+
+# Career chatbot logic shared by the Flask /api/chat route and the native
+# async FastAPI route in chat_api.py: intent checks, prompt construction,
+# Gemini request/response handling and response formatting.
+
+GEMINI_BASE_URL = "https://generativelanguage.googleapis.com/v1beta/models"
+UPSTREAM_TIMEOUT = 25  # seconds
+
+UNSUPPORTED_RESPONSE = {
+    "status": "error",
+    "queryType": "unsupported",
+    "response": {
+        "message": "Sorry, I can only provide answers related to career guidance and education in Jammu & Kashmir. Feel free to ask about careers, exams, colleges, or scholarships!"
+    }
+}
+
+
+# Intent classification.
+#
+# Every keyword list is compiled once at import into one table of entries
+# (words, word stems and multi-word phrases) keyed by the first letters of
+# their first word, and a message is tokenized and scanned once for the
+# greeting, career and query-type flags together. Keywords of
+# STEM_MIN_LENGTH letters or more match the start of a word, as the old
+# substring scan did ("exam" in "examination", "education" in
+# "educational"). Greetings and short keywords (mostly exam acronyms) match
+# whole words with the KEYWORD_SUFFIXES endings, so "hi" no longer fires
+# inside "this" nor "cat" inside "category".
+
+GREETING_PATTERNS = (
+    'hello', 'hi', 'hey', 'good morning', 'good afternoon', 'good evening',
+    'greetings', 'what can you help', 'what can you do', 'how can you help',
+    'what is this', 'who are you', 'introduce yourself', 'tell me about yourself'
+)
+
+CAREER_KEYWORDS = (
+    # Education & Career
+    'career', 'job', 'profession', 'education', 'study', 'course', 'degree', 'diploma',
+    'college', 'university', 'school', 'admission', 'entrance', 'exam', 'test',
+    'scholarship', 'fee', 'eligibility', 'qualification', 'certificate',
+
+    # Specific Exams
+    'neet', 'jee', 'cuet', 'jkcet', 'upsc', 'ssc', 'gate', 'cat', 'mat', 'gmat',
+    'ielts', 'toefl', 'sat', 'gre', 'clat', 'nift', 'cmat', 'xat',
+
+    # Fields & Subjects
+    'engineering', 'medical', 'doctor', 'nurse', 'teacher', 'lawyer', 'management',
+    'business', 'commerce', 'science', 'arts', 'humanities', 'technology', 'computer',
+    'pharmacy', 'dentistry', 'veterinary', 'agriculture', 'architecture',
+
+    # J&K Specific
+    'jammu', 'kashmir', 'srinagar', 'jammu university', 'kashmir university',
+    'nit srinagar', 'iit jammu', 'pmsss', 'j&k', 'jk',
+
+    # Career Guidance
+    'guidance', 'advice', 'help', 'suggest', 'recommend', 'choose', 'select',
+    'future', 'opportunity', 'scope', 'salary', 'placement', 'internship'
+)
+
+# Checked in order; the first type with a matching keyword wins
+QUERY_TYPE_KEYWORDS = (
+    ('exam_guidance', ('neet', 'jee', 'cuet', 'jkcet', 'upsc')),
+    ('college_guidance', ('college', 'university', 'admission')),
+    ('scholarship_guidance', ('scholarship', 'fee', 'financial')),
+    ('career_guidance', ('career', 'job', 'profession')),
+)
+DEFAULT_QUERY_TYPE = 'general_education'
+
+
+class ChatIntent(NamedTuple):
+    greeting: bool
+    career_related: bool
+    query_type: str
+
+
+# Shorter keywords match whole words with these endings ("jobs", "fees")
+KEYWORD_SUFFIXES = ('', 's', 'es', 'ing', 'ed')
+STEM_MIN_LENGTH = 4
+
+GREETING_FLAG, CAREER_FLAG = 1, 2
+
+# Byte table turning ASCII punctuation into spaces, so splitting the
+# translated message yields words ("j&k" stays one token); much cheaper
+# than a regex tokenizer on short messages
+_WORD_BYTES = frozenset(b'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789&')
+_TOKEN_TABLE = bytes(b if b in _WORD_BYTES or b > 127 else 32 for b in range(256))
+
+
+def _tokenize(message):
+    return message.encode('utf-8').translate(_TOKEN_TABLE).decode('utf-8').lower().split()
+
+
+class IntentEntry(NamedTuple):
+    first: str  # first (or only) word of the keyword
+    first_is_stem: bool  # a single keyword that also matches longer words
+    rest: tuple  # remaining words of a phrase
+    last_is_stem: bool
+    flags: int
+    rank: int  # index into QUERY_TYPE_KEYWORDS, len() for none
+
+
+def _compile_intents():
+    """Keyword entries grouped by the first STEM_MIN_LENGTH letters of their first word."""
+    no_type = len(QUERY_TYPE_KEYWORDS)  # rank meaning "no query type"
+    merged = {}  # (first, first_is_stem, rest, last_is_stem) -> [flags, rank]
+
+    def add(first, first_is_stem, rest, last_is_stem, flags, rank):
+        entry = merged.setdefault((first, first_is_stem, rest, last_is_stem), [0, no_type])
+        entry[0] |= flags
+        entry[1] = min(entry[1], rank)
+
+    for phrase in GREETING_PATTERNS:
+        phrase_words = phrase.split()
+        add(phrase_words[0], False, tuple(phrase_words[1:]), False, GREETING_FLAG, no_type)
+
+    type_rank = {}
+    for rank, (_, keywords) in enumerate(QUERY_TYPE_KEYWORDS):
+        for word in keywords:
+            type_rank.setdefault(word, rank)
+
+    for phrase in set(CAREER_KEYWORDS) | set(type_rank):
+        flags = CAREER_FLAG if phrase in CAREER_KEYWORDS else 0
+        rank = type_rank.get(phrase, no_type)
+        phrase_words = phrase.split()
+        is_stem = len(phrase_words[-1]) >= STEM_MIN_LENGTH
+        if len(phrase_words) > 1:
+            add(phrase_words[0], False, tuple(phrase_words[1:]), is_stem, flags, rank)
+        elif is_stem:
+            add(phrase, True, (), False, flags, rank)
+        else:
+            for suffix in KEYWORD_SUFFIXES:
+                add(phrase + suffix, False, (), False, flags, rank)
+
+    heads = {}
+    for key, (flags, rank) in merged.items():
+        heads.setdefault(key[0][:STEM_MIN_LENGTH], []).append(IntentEntry(*key, flags, rank))
+    return {head: tuple(entries) for head, entries in heads.items()}
+
+
+_INTENT_HEADS = _compile_intents()
+_QUERY_TYPES = tuple(name for name, _ in QUERY_TYPE_KEYWORDS) + (DEFAULT_QUERY_TYPE,)
+
+
+def _phrase_follows(tokens, i, rest, last_is_stem):
+    """Whether the words after position i complete a phrase"""
+    following = tuple(tokens[i + 1:i + 1 + len(rest)])
+    if len(following) != len(rest) or following[:-1] != rest[:-1]:
+        return False
+    return following[-1] == rest[-1] or (last_is_stem and following[-1].startswith(rest[-1]))
+
+
+@lru_cache(maxsize=1024)
+def classify_message(message):
+    """Greeting, career-related and query-type flags for a message in one pass."""
+    tokens = _tokenize(message)
+    heads = _INTENT_HEADS
+    flags = 0
+    rank = len(QUERY_TYPE_KEYWORDS)
+    for i, token in enumerate(tokens):
+        # Only keywords sharing the word's first letters can match it
+        entries = heads.get(token[:STEM_MIN_LENGTH])
+        if entries is None:
+            continue
+        for first, first_is_stem, rest, last_is_stem, entry_flags, entry_rank in entries:
+            if token != first and not (first_is_stem and token.startswith(first)):
+                continue
+            if rest and not _phrase_follows(tokens, i, rest, last_is_stem):
+                continue
+            flags |= entry_flags
+            if entry_rank < rank:
+                rank = entry_rank
+
+    greeting = bool(flags & GREETING_FLAG)
+    return ChatIntent(
+        greeting=greeting,
+        # Greetings are handled as a special case of career queries
+        career_related=greeting or bool(flags & CAREER_FLAG),
+        query_type=_QUERY_TYPES[rank],
+    )
+
+
+def is_career_related_query(message):
+    """Check if the user query is related to career guidance or education"""
+    return classify_message(message).career_related
+
+def is_greeting_query(message):
+    """Check if the message is a greeting or general bot inquiry"""
+    return classify_message(message).greeting
+
+def generate_greeting_response():
+    """Generate a structured greeting response"""
+    import random
+
+    greetings = [
+        {
+            "summary": "Hello! 👋 I'm your EdVise Career Assistant, ready to guide your educational journey in J&K!",
+            "points": [
+                "Get personalized career guidance based on your interests and academic strengths.",
+                "Discover entrance exams like NEET, JEE, CUET, JKCET with preparation strategies.",
+                "Explore top government and private colleges in Jammu & Kashmir with admission details.",
+                "Learn about scholarships including PMSSS, state merit awards, and financial assistance.",
+                "Receive expert advice on admission timelines, eligibility criteria, and career pathways."
+            ]
+        },
+        {
+            "summary": "Welcome to EdVise! 🎓 Your trusted companion for education and career decisions in J&K.",
+            "points": [
+                "Ask me about any career field - from engineering to medicine, arts to commerce.",
+                "Get updated information on competitive exams, dates, syllabus, and cut-offs.",
+                "Find the perfect college match based on your preferences and qualifications.",
+                "Discover government schemes, scholarships, and funding opportunities for students.",
+                "Plan your academic journey with step-by-step guidance and expert recommendations."
+            ]
+        },
+        {
+            "summary": "Hi there! 🌟 I'm here to help you make informed decisions about your future in J&K.",
+            "points": [
+                "Share your interests and I'll suggest suitable career paths and opportunities.",
+                "Get comprehensive exam guidance including NEET, JEE, and state-level tests.",
+                "Explore colleges in Srinagar, Jammu, and across J&K with detailed information.",
+                "Learn about PMSSS and other scholarship programs available for J&K students.",
+                "Receive personalized advice on courses, admissions, and career planning."
+            ]
+        }
+    ]
+
+    selected_greeting = random.choice(greetings)
+
+    return {
+        "status": "success",
+        "queryType": "greeting",
+        "response": {
+            "summary": selected_greeting["summary"],
+            "points": selected_greeting["points"],
+            "wordCount": len(' '.join(selected_greeting["points"] + [selected_greeting["summary"]]).split())
+        }
+    }
+
+def determine_query_type(message):
+    """Determine the type of career query"""
+    return classify_message(message).query_type
+
+def format_career_response(ai_response, query_type, word_count):
+    """Format AI response into structured JSON format"""
+    # Split the response into points
+    lines = [line.strip() for line in ai_response.split('\n') if line.strip()]
+    points = []
+    summary = ""
+
+    # Extract summary (first non-empty line or paragraph)
+    if lines:
+        summary = lines[0]
+
+    # Extract points from the response
+    for line in lines[1:]:
+        if line and (line.startswith(('-', '•', '*')) or 'point' in line.lower() or len(line) > 20):
+            # Clean up the point text
+            point = line.lstrip('-•* ').strip()
+            if len(point) > 10:  # Only add substantial points
+                points.append(point)
+
+    # If no clear points found, create them from sentences
+    if len(points) < 3:
+        sentences = ai_response.replace('\n', ' ').split('. ')
+        points = [sent.strip() + '.' for sent in sentences if len(sent.strip()) > 20][:5]
+
+    # Ensure we have 3-5 points
+    if len(points) > 5:
+        points = points[:5]
+    elif len(points) < 3:
+        # Add generic helpful points if needed
+        points.extend([
+            "Consider consulting with career counselors for personalized guidance.",
+            "Research thoroughly about admission requirements and deadlines.",
+            "Explore government schemes and scholarships available in J&K."
+        ])
+        points = points[:5]
+
+    return {
+        "status": "success",
+        "queryType": query_type,
+        "response": {
+            "summary": summary or "Here is the career guidance you requested.",
+            "points": points,
+            "wordCount": word_count
+        }
+    }
+
+def count_words(text):
+    """Count words in text"""
+    return len(text.split())
+
+
+def precheck_message(user_message):
+    """Answer requests that never reach the model.
+
+    Returns a (body, status) tuple, or None when the message should be sent
+    upstream.
+    """
+    if not user_message:
+        return {"error": "message is required"}, 400
+
+    intent = classify_message(user_message)
+
+    # Check if it's a greeting first
+    if intent.greeting:
+        return generate_greeting_response(), 200
+
+    # Check if query is career-related
+    if not intent.career_related:
+        return UNSUPPORTED_RESPONSE, 200
+
+    if not os.environ.get('GEMINI_API_KEY'):
+        return {"error": "Server not configured: GEMINI_API_KEY missing"}, 500
+
+    return None
+
+
+def build_system_prompt(user_message):
+    """Enhanced prompt for structured career guidance"""
+    return f"""You are a career guidance counselor specializing in education and career opportunities in Jammu & Kashmir, India. 
+        
+        User Query: {user_message}
+        
+        Please provide a comprehensive response in exactly 150-250 words that includes:
+        
+        1. A brief summary sentence
+        2. 4-5 specific actionable points related to:
+           - Relevant exams (NEET, JKCET, CUET, JEE, etc.)
+           - Government and private colleges in J&K
+           - Available scholarships (PMSSS, state merit, etc.)
+           - Career pathways and opportunities
+           - Admission timelines and preparation tips
+        
+        Format your response as:
+        
+        [Summary sentence]
+        
+        • Point 1: [Specific guidance]
+        • Point 2: [Specific guidance]  
+        • Point 3: [Specific guidance]
+        • Point 4: [Specific guidance]
+        • Point 5: [Specific guidance]
+        
+        Focus specifically on J&K education system, local colleges, and opportunities available to students in the region.
+        Keep the response practical, actionable, and within 150-250 words."""
+
+
+def build_upstream_request(user_message, stream=False):
+    """Return (url, headers, payload) for a Gemini generateContent call.
+
+    With stream=True the URL targets streamGenerateContent, which sends
+    partial candidates as Server-Sent Events.
+    """
+    payload = {
+        "contents": [
+            {
+                "parts": [
+                    {"text": build_system_prompt(user_message)}
+                ]
+            }
+        ]
+    }
+    model = os.environ.get('GEMINI_MODEL', 'gemini-2.0-flash')
+    if stream:
+        url = f"{GEMINI_BASE_URL}/{model}:streamGenerateContent?alt=sse"
+    else:
+        url = f"{GEMINI_BASE_URL}/{model}:generateContent"
+    headers = {
+        'Content-Type': 'application/json',
+        'X-goog-api-key': os.environ.get('GEMINI_API_KEY', ''),
+    }
+    return url, headers, payload
+
+
+def extract_reply_text(resp):
+    """Concatenate the text parts of the first Gemini candidate."""
+    parts = (resp.get('candidates') or [{}])[0].get('content', {}).get('parts', [])
+    return "".join(p.get('text', '') for p in parts)
+
+
+def interpret_upstream_response(status_code, text, load_json, query_type):
+    """Turn an upstream HTTP result into the /api/chat (body, status) contract."""
+    if status_code >= 400:
+        return {"error": f"Upstream {status_code}", "details": text[:500]}, 502
+    resp = load_json()
+    return reply_to_response(extract_reply_text(resp), query_type, raw=resp)
+
+
+def reply_to_response(reply, query_type, raw=None):
+    """Format the model's full reply text as the /api/chat (body, status)."""
+    reply = reply.strip()
+    if not reply:
+        body = {"error": "Empty response from model"}
+        if raw is not None:
+            body["raw"] = raw
+        return body, 502
+
+    # Count words and format response
+    word_count = count_words(reply)
+    return format_career_response(reply, query_type, word_count), 200
+
+
+# Streaming (/api/chat/stream).
+#
+# The reply is forwarded to the browser as Server-Sent Events: a "token"
+# event per upstream chunk ({"text": ...}), then a single "done" event
+# carrying the same structured body /api/chat returns, or an "error" event
+# ({"error": ..., "status": ...}). Greetings, unsupported questions and
+# cache hits produce only the final event.
+
+SSE_HEADERS = {
+    'Cache-Control': 'no-cache',
+    'X-Accel-Buffering': 'no',  # stop nginx from buffering the stream
+}
+
+
+def sse_event(event, data):
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def final_event(body, status):
+    """The closing SSE event for a (body, status) result."""
+    if status == 200:
+        return sse_event('done', body)
+    return sse_event('error', dict(body, status=status))
+
+
+def parse_stream_line(line):
+    """Decode one upstream SSE line into the text it adds, or None."""
+    if not line or not line.startswith('data:'):
+        return None
+    try:
+        chunk = json.loads(line[5:])
+    except ValueError:
+        return None
+    return extract_reply_text(chunk) or None
+
+
+class HttpClient(NamedTuple):
+    session: object  # requests.Session
+    timeout_error: type  # requests.Timeout
+
+
+@lru_cache(maxsize=None)
+def _http_client():
+    """Process-wide requests session so sync callers reuse keep-alive connections.
+
+    requests is imported on the first upstream call rather than at startup.
+    """
+    import requests
+    return HttpClient(session=requests.Session(), timeout_error=requests.Timeout)
+
+
+def answer_chat(user_message):
+    """Synchronous /api/chat implementation used by the Flask route."""
+    early = precheck_message(user_message)
+    if early is not None:
+        return early
+
+    query_type = determine_query_type(user_message)
+    cached = response_cache.get(query_type, user_message)
+    if cached is not None:
+        return cached, 200
+
+    http = _http_client()
+    url, headers, payload = build_upstream_request(user_message)
+
+    def fetch():
+        try:
+            r = http.session.post(url, json=payload, headers=headers, timeout=UPSTREAM_TIMEOUT)
+            body, status = interpret_upstream_response(r.status_code, r.text, r.json, query_type)
+        except http.timeout_error:
+            return {"error": "Upstream timeout"}, 504, False
+        except Exception as e:
+            return {"error": "Server error", "details": str(e)}, 500, False
+        if status == 200:
+            response_cache.set(query_type, user_message, body)
+        return body, status, r.status_code < 500
+
+    # Identical questions asked at the same moment share one upstream call
+    return call_upstream(cache_key(query_type, user_message), fetch)
+
+
+def stream_chat(user_message):
+    """Synchronous /api/chat/stream implementation: yields SSE strings."""
+    early = precheck_message(user_message)
+    if early is not None:
+        yield final_event(*early)
+        return
+
+    query_type = determine_query_type(user_message)
+    cached = response_cache.get(query_type, user_message)
+    if cached is not None:
+        yield final_event(cached, 200)
+        return
+
+    http = _http_client()
+    ticket, rejection = admit()
+    if rejection is not None:
+        yield final_event(*rejection)
+        return
+
+    url, headers, payload = build_upstream_request(user_message, stream=True)
+    parts = []
+    healthy = None
+    try:
+        with http.session.post(url, json=payload, headers=headers,
+                               timeout=UPSTREAM_TIMEOUT, stream=True) as r:
+            healthy = r.status_code < 500
+            if r.status_code >= 400:
+                yield final_event({"error": f"Upstream {r.status_code}", "details": r.text[:500]}, 502)
+                return
+            r.encoding = 'utf-8'  # text/event-stream without a charset would default to latin-1
+            for line in r.iter_lines(decode_unicode=True):
+                text = parse_stream_line(line)
+                if text:
+                    parts.append(text)
+                    yield sse_event('token', {"text": text})
+    except http.timeout_error:
+        healthy = False
+        yield final_event({"error": "Upstream timeout"}, 504)
+        return
+    except Exception as e:
+        healthy = False
+        yield final_event({"error": "Server error", "details": str(e)}, 500)
+        return
+    finally:
+        release(ticket, healthy)
+
+    body, status = reply_to_response("".join(parts), query_type)
+    if status == 200:
+        response_cache.set(query_type, user_message, body)
+    yield final_event(body, status)
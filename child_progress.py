@@ -0,0 +1,132 @@
+import json
+from datetime import datetime
+from typing import NamedTuple, Optional
+from sqlalchemy import func, or_, select
+from extensions import db
+from models import (User, ParentChildRelation, QuizResult, SavedCollege, SavedScholarship, Scholarship,
+                    Exam, ExamClass)
+
+# Batched data for the parent dashboard.
+#
+# Every linked child's progress is loaded with a fixed number of queries
+# (children, latest quiz, saved counts, scholarship deadlines, exam
+# deadlines), however many children a parent has, and grouped in Python.
+
+DEADLINES_PER_CHILD = 3
+CLOSED_APPLICATION_STATUSES = ('applied', 'approved', 'rejected')
+
+
+class Deadline(NamedTuple):
+    kind: str  # scholarship, exam
+    name: str
+    due: datetime
+
+
+class ChildProgress(NamedTuple):
+    child: User
+    quizzes_taken: int
+    latest_quiz_at: Optional[datetime]
+    top_career: Optional[dict]  # {'category', 'match_percentage'} from the latest quiz
+    colleges_saved: int
+    scholarships_saved: int
+    deadlines: tuple  # next Deadline items, soonest first
+
+
+def _latest_quizzes(child_ids):
+    """child id -> (quizzes taken, latest QuizResult row) in one windowed query"""
+    ranked = select(
+        QuizResult.user_id,
+        QuizResult.created_at,
+        QuizResult.career_recommendations,
+        func.row_number().over(partition_by=QuizResult.user_id,
+                               order_by=(QuizResult.created_at.desc(), QuizResult.id.desc())).label('position'),
+        func.count().over(partition_by=QuizResult.user_id).label('taken'),
+    ).where(QuizResult.user_id.in_(child_ids)).subquery()
+    rows = db.session.execute(select(ranked).where(ranked.c.position == 1)).all()
+    return {row.user_id: row for row in rows}
+
+
+def _saved_counts(model, child_ids):
+    rows = db.session.execute(
+        select(model.user_id, func.count()).where(model.user_id.in_(child_ids)).group_by(model.user_id)
+    ).all()
+    return dict(rows)
+
+
+def _scholarship_deadlines(child_ids, now):
+    """child id -> upcoming deadlines of scholarships they saved but have not applied to"""
+    ranked = select(
+        SavedScholarship.user_id,
+        Scholarship.name,
+        Scholarship.application_deadline,
+        func.row_number().over(partition_by=SavedScholarship.user_id,
+                               order_by=Scholarship.application_deadline).label('position'),
+    ).join(Scholarship, Scholarship.id == SavedScholarship.scholarship_id).where(
+        SavedScholarship.user_id.in_(child_ids),
+        or_(SavedScholarship.application_status.is_(None),
+            SavedScholarship.application_status.notin_(CLOSED_APPLICATION_STATUSES)),
+        Scholarship.application_deadline >= now,
+    ).subquery()
+    deadlines = {}
+    for user_id, name, due, _ in db.session.execute(
+            select(ranked).where(ranked.c.position <= DEADLINES_PER_CHILD)):
+        deadlines.setdefault(user_id, []).append(Deadline('scholarship', name, due))
+    return deadlines
+
+
+def _exam_deadlines(class_levels, now):
+    """class level -> upcoming exam registration deadlines open to it"""
+    rows = db.session.execute(
+        select(ExamClass.class_level, Exam.name, Exam.registration_end)
+        .join(Exam, Exam.id == ExamClass.exam_id)
+        .where(ExamClass.class_level.in_(class_levels), Exam.is_active.is_(True), Exam.registration_end >= now)
+        .order_by(Exam.registration_end)
+    ).all()
+    deadlines = {}
+    for class_level, name, due in rows:
+        deadlines.setdefault(class_level, []).append(Deadline('exam', name, due))
+    return deadlines
+
+
+def _top_career(raw):
+    try:
+        recommendations = json.loads(raw) if raw else []
+    except ValueError:
+        return None
+    return recommendations[0] if isinstance(recommendations, list) and recommendations else None
+
+
+def children_progress(parent_id, now=None):
+    """ChildProgress for every child linked to a parent, in the order they were linked."""
+    now = now or datetime.utcnow()
+    children = db.session.execute(
+        select(User).join(ParentChildRelation, ParentChildRelation.child_id == User.id)
+        .where(ParentChildRelation.parent_id == parent_id)
+        .order_by(ParentChildRelation.id)
+    ).scalars().all()
+    if not children:
+        return []
+
+    child_ids = [child.id for child in children]
+    quizzes = _latest_quizzes(child_ids)
+    colleges = _saved_counts(SavedCollege, child_ids)
+    scholarships = _saved_counts(SavedScholarship, child_ids)
+    scholarship_deadlines = _scholarship_deadlines(child_ids, now)
+    class_levels = {child.class_level for child in children if child.class_level}
+    exam_deadlines = _exam_deadlines(class_levels, now) if class_levels else {}
+
+    progress = []
+    for child in children:
+        quiz = quizzes.get(child.id)
+        deadlines = scholarship_deadlines.get(child.id, []) + exam_deadlines.get(child.class_level, [])
+        deadlines.sort(key=lambda deadline: deadline.due)
+        progress.append(ChildProgress(
+            child=child,
+            quizzes_taken=quiz.taken if quiz else 0,
+            latest_quiz_at=quiz.created_at if quiz else None,
+            top_career=_top_career(quiz.career_recommendations) if quiz else None,
+            colleges_saved=colleges.get(child.id, 0),
+            scholarships_saved=scholarships.get(child.id, 0),
+            deadlines=tuple(deadlines[:DEADLINES_PER_CHILD]),
+        ))
+    return progress
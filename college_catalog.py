@@ -0,0 +1,214 @@
+import base64
+import json
+from sqlalchemy import func, tuple_
+from extensions import db
+from models import College, CollegeCutoff, OPEN_CUTOFF_CATEGORY
+from catalog_cache import CatalogCache, track_catalog
+from search_index import apply_search
+
+# Shared read paths for the college catalog (facets, listings)
+
+track_catalog(College, 'college')
+track_catalog(CollegeCutoff, 'college')
+
+
+def _build_facets():
+    rows = db.session.query(College.state, College.type, func.count(College.id)) \
+        .group_by(College.state, College.type).all()
+
+    cells = {}
+    states = {}
+    types = {}
+    for state, ctype, count in rows:
+        cells[(state, ctype)] = count
+        states[state] = states.get(state, 0) + count
+        types[ctype] = types.get(ctype, 0) + count
+
+    return {
+        'states': sorted(states.items()),
+        'types': sorted(types.items()),
+        'cells': cells,
+        'total': sum(cells.values()),
+    }
+
+
+_facets = CatalogCache('college', _build_facets)
+
+
+def college_facets():
+    """Distinct states and types with per-value counts, cached per catalog version.
+
+    Returns a dict with 'states' and 'types' as sorted (value, count) lists,
+    'cells' mapping (state, type) to a count, and the overall 'total'.
+    """
+    return _facets.get()
+
+
+def facet_total(state=None, ctype=None):
+    """Number of colleges matching exact state/type filters, answered from the facet cache."""
+    facets = college_facets()
+    if not state and not ctype:
+        return facets['total']
+    return sum(
+        count for (cell_state, cell_type), count in facets['cells'].items()
+        if (not state or cell_state == state) and (not ctype or cell_type == ctype)
+    )
+
+
+def encode_cursor(college):
+    """Opaque keyset cursor for a college's (name, id) position."""
+    raw = json.dumps([college.name, college.id], separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Return the (name, id) pair encoded in a cursor, or None if it is malformed."""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        name, college_id = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        return str(name), int(college_id)
+    except (ValueError, TypeError):
+        return None
+
+
+def college_to_dict(college):
+    return {
+        'id': college.id,
+        'name': college.name,
+        'state': college.state,
+        'city': college.city,
+        'type': college.type,
+        'courses': json.loads(college.courses) if college.courses else [],
+        'fees_range': college.fees_range,
+        'facilities': json.loads(college.facilities) if college.facilities else [],
+        'cutoff_info': college.cutoff_info,
+        'seats': college.seats,
+        'scholarships': college.scholarships,
+        'website': college.website
+    }
+
+
+def filtered_colleges(state=None, ctype=None, search=None):
+    """College query with the finder's exact-match and full-text filters applied (unordered)."""
+    query = College.query
+    if state:
+        query = query.filter(College.state == state)
+    if ctype:
+        query = query.filter(College.type == ctype)
+    if search:
+        query = apply_search(query, search, ranked=False)
+    return query
+
+
+def list_colleges(state=None, ctype=None, search=None, after=None, before=None, limit=20, with_total=False):
+    """One page of colleges in (name, id) order using keyset pagination.
+
+    `after` / `before` are cursors from a previous page. The cost of a page
+    does not depend on how deep it is. A total is only computed when
+    with_total is set (and is free from the facet cache unless searching).
+
+    Returns a dict with 'items' (College objects), 'next_cursor',
+    'prev_cursor' and 'total' (None unless requested).
+    """
+    query = filtered_colleges(state, ctype, search)
+    key = tuple_(College.name, College.id)
+
+    after_key = decode_cursor(after)
+    before_key = decode_cursor(before) if not after_key else None
+
+    if before_key:
+        rows = query.filter(key < before_key) \
+            .order_by(College.name.desc(), College.id.desc()) \
+            .limit(limit + 1).all()
+        has_more_before = len(rows) > limit
+        items = list(reversed(rows[:limit]))
+        has_more_after = True
+    else:
+        if after_key:
+            query = query.filter(key > after_key)
+        rows = query.order_by(College.name.asc(), College.id.asc()).limit(limit + 1).all()
+        has_more_after = len(rows) > limit
+        items = rows[:limit]
+        has_more_before = after_key is not None
+
+    total = None
+    if with_total:
+        if search:
+            total = filtered_colleges(state, ctype, search).order_by(None).count()
+        else:
+            total = facet_total(state, ctype)
+
+    return {
+        'items': items,
+        'next_cursor': encode_cursor(items[-1]) if items and has_more_after else None,
+        'prev_cursor': encode_cursor(items[0]) if items and has_more_before else None,
+        'total': total,
+    }
+
+
+def _build_cutoff_exams():
+    rows = db.session.query(CollegeCutoff.exam, CollegeCutoff.metric).distinct().all()
+    return sorted((exam, metric) for exam, metric in rows)
+
+
+_cutoff_exams = CatalogCache('college', _build_cutoff_exams)
+
+
+def cutoff_exams():
+    """Sorted (exam, metric) pairs that colleges publish cutoffs for, cached per catalog version."""
+    return _cutoff_exams.get()
+
+
+def match_facet(values, wanted, partial=False):
+    """Stored facet values matching user input case-insensitively (substring match if partial)."""
+    wanted = (wanted or '').strip().lower()
+    if partial:
+        return [value for value in values if wanted in (value or '').lower()]
+    return [value for value in values if (value or '').lower() == wanted]
+
+
+def eligible_colleges(category, exam=None, metric=None, value=None, state=None, stream=None, limit=100):
+    """Colleges a student can get into, ranked from the most to the least competitive.
+
+    With an exam result (exam, metric and the student's rank or score) only
+    colleges whose cutoff for that exam admits it are returned: the open
+    cutoff or the one for the student's category, whichever is easier. Each
+    item is (College, margin), where margin is how far inside the cutoff the
+    student is (0 = right at the cutoff, None without an exam result).
+
+    `state` must match exactly and `stream` is a substring of the college
+    type, both case-insensitive; they are resolved against the cached facet
+    values first so the query filters on indexed columns.
+    """
+    facets = college_facets()
+    query = db.session.query(College)
+    if state:
+        states = match_facet([value for value, _ in facets['states']], state)
+        query = query.filter(College.state.in_(states))
+    if stream:
+        types = match_facet([value for value, _ in facets['types']], stream, partial=True)
+        query = query.filter(College.type.in_(types))
+
+    if not exam or not metric or value is None:
+        return [(college, None) for college in query.order_by(College.name, College.id).limit(limit)]
+
+    if metric == 'rank':
+        admits = CollegeCutoff.max_value >= value
+        margin = (CollegeCutoff.max_value - value) / CollegeCutoff.max_value
+    else:
+        admits = CollegeCutoff.min_value <= value
+        margin = (value - CollegeCutoff.min_value) / func.nullif(CollegeCutoff.min_value, 0)
+    best = func.max(margin).label('margin')
+
+    rows = query.join(CollegeCutoff, CollegeCutoff.college_id == College.id) \
+        .add_columns(best) \
+        .filter(CollegeCutoff.exam == exam,
+                CollegeCutoff.metric == metric,
+                CollegeCutoff.category.in_([OPEN_CUTOFF_CATEGORY, category]),
+                admits) \
+        .group_by(College.id) \
+        .order_by(best.asc().nulls_last(), College.name) \
+        .limit(limit).all()
+    return [(college, margin) for college, margin in rows]
@@ -0,0 +1,293 @@
+import asyncio
+import os
+import threading
+import time
+from collections import deque
+
+# Guards every upstream Gemini call made by the chat endpoints.
+#
+# - Single flight: concurrent requests with the same key (the chat cache key,
+#   i.e. query type + normalized message) share one in-flight upstream call.
+# - Concurrency governor: at most CHAT_MAX_CONCURRENCY upstream requests are
+#   outstanding per process; callers wait up to CHAT_QUEUE_TIMEOUT seconds
+#   for a slot and then get a 503.
+# - Circuit breaker: after CHAT_BREAKER_THRESHOLD consecutive upstream
+#   failures (5xx or timeouts) calls fail fast for CHAT_BREAKER_COOLDOWN
+#   seconds, then a single trial call decides whether to close it again.
+#
+# Upstream fetch callables return (body, status, healthy), where healthy is
+# False for a 5xx / timeout / connection failure. admit() hands out a ticket
+# that release() gives back, so the breaker can tell its half-open trial call
+# from calls that started before it opened.
+
+MAX_CONCURRENCY = int(os.environ.get('CHAT_MAX_CONCURRENCY', 64))
+QUEUE_TIMEOUT = float(os.environ.get('CHAT_QUEUE_TIMEOUT', 10))  # seconds to wait for a free slot
+BREAKER_THRESHOLD = int(os.environ.get('CHAT_BREAKER_THRESHOLD', 5))
+BREAKER_COOLDOWN = float(os.environ.get('CHAT_BREAKER_COOLDOWN', 30))  # seconds
+
+BUSY_RESPONSE = ({"error": "Server busy, please retry"}, 503)
+UNAVAILABLE_RESPONSE = ({"error": "Upstream temporarily unavailable, please retry shortly"}, 503)
+FAILED_RESPONSE = ({"error": "Server error"}, 500)
+
+
+# Ticket for calls let through while the breaker is closed
+REGULAR_CALL = 'regular'
+
+
+class CircuitBreaker:
+    def __init__(self, threshold, cooldown):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = None
+        self._trial = None  # ticket of the half-open trial call in flight
+
+    def rejecting(self):
+        """True while open and cooling down (a cheap check before queueing)."""
+        with self._lock:
+            return self._opened_at is not None and \
+                (self._trial is not None or time.monotonic() - self._opened_at < self.cooldown)
+
+    def allow(self):
+        """A ticket if a call may go upstream now, else None.
+
+        After the cooldown only one trial call is let through; its ticket is
+        unique so only that call's record() ends the trial.
+        """
+        with self._lock:
+            if self._opened_at is None:
+                return REGULAR_CALL
+            if self._trial is not None or time.monotonic() - self._opened_at < self.cooldown:
+                return None
+            self._trial = object()
+            return self._trial
+
+    def record(self, ticket, healthy):
+        """Record the outcome of the call holding ticket; healthy=None means it never reached upstream."""
+        with self._lock:
+            if ticket is not None and ticket is self._trial:
+                self._trial = None
+            if healthy is None:
+                return
+            if healthy:
+                self._failures = 0
+                self._opened_at = None
+                self._trial = None
+            else:
+                self._failures += 1
+                if self._opened_at is not None or self._failures >= self.threshold:
+                    self._opened_at = time.monotonic()
+
+    def state(self):
+        with self._lock:
+            if self._opened_at is None:
+                return 'closed'
+            if self._trial is not None or time.monotonic() - self._opened_at >= self.cooldown:
+                return 'half-open'
+            return 'open'
+
+    def stats(self):
+        with self._lock:
+            failures = self._failures
+        return {'state': self.state(), 'consecutive_failures': failures,
+                'threshold': self.threshold, 'cooldown': self.cooldown}
+
+
+class GatewayMetrics:
+    def __init__(self, window=1000):
+        self._lock = threading.Lock()
+        self._waits = deque(maxlen=window)  # recent queue waits in seconds
+        self.upstream_calls = 0
+        self.coalesced = 0
+        self.rejected_busy = 0
+        self.rejected_open = 0
+        self.in_flight = 0
+        self.max_wait = 0.0
+
+    def incr(self, name, amount=1):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + amount)
+
+    def record_wait(self, seconds):
+        with self._lock:
+            self._waits.append(seconds)
+            self.max_wait = max(self.max_wait, seconds)
+
+    def stats(self):
+        with self._lock:
+            waits = sorted(self._waits)
+            stats = {
+                'upstream_calls': self.upstream_calls,
+                'coalesced': self.coalesced,
+                'rejected_busy': self.rejected_busy,
+                'rejected_open': self.rejected_open,
+                'in_flight': self.in_flight,
+                'max_concurrency': MAX_CONCURRENCY,
+                'queue_wait_max_ms': round(self.max_wait * 1000, 2),
+            }
+        if waits:
+            stats['queue_wait_p50_ms'] = round(waits[len(waits) // 2] * 1000, 2)
+            stats['queue_wait_p95_ms'] = round(waits[min(len(waits) - 1, int(len(waits) * 0.95))] * 1000, 2)
+        return stats
+
+
+breaker = CircuitBreaker(BREAKER_THRESHOLD, BREAKER_COOLDOWN)
+metrics = GatewayMetrics()
+
+
+def gateway_stats():
+    stats = metrics.stats()
+    stats['breaker'] = breaker.stats()
+    return stats
+
+
+def _admitted(started):
+    """Bookkeeping once a slot is held; returns (ticket, None), or (None, rejection) if the breaker is open."""
+    metrics.record_wait(time.monotonic() - started)
+    ticket = breaker.allow()
+    if ticket is None:
+        metrics.incr('rejected_open')
+        return None, UNAVAILABLE_RESPONSE
+    metrics.incr('upstream_calls')
+    metrics.incr('in_flight')
+    return ticket, None
+
+
+# Synchronous callers (Flask worker threads)
+
+_sync_slots = threading.BoundedSemaphore(MAX_CONCURRENCY)
+_sync_inflight = {}
+_sync_inflight_lock = threading.Lock()
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = FAILED_RESPONSE
+
+
+def admit():
+    """Take an upstream slot.
+
+    Returns (ticket, None) when admitted; pass the ticket to release().
+    Otherwise returns (None, (body, status) rejection).
+    """
+    if breaker.rejecting():
+        metrics.incr('rejected_open')
+        return None, UNAVAILABLE_RESPONSE
+    started = time.monotonic()
+    if not _sync_slots.acquire(timeout=QUEUE_TIMEOUT):
+        metrics.incr('rejected_busy')
+        return None, BUSY_RESPONSE
+    ticket, rejection = _admitted(started)
+    if rejection is not None:
+        _sync_slots.release()
+    return ticket, rejection
+
+
+def release(ticket, healthy):
+    """Give back a slot taken by admit() and record the upstream outcome."""
+    metrics.incr('in_flight', -1)
+    breaker.record(ticket, healthy)
+    _sync_slots.release()
+
+
+def _guarded(fetch):
+    ticket, rejection = admit()
+    if rejection is not None:
+        return rejection
+    healthy = None
+    try:
+        body, status, healthy = fetch()
+        return body, status
+    finally:
+        release(ticket, healthy)
+
+
+def call_upstream(key, fetch):
+    """Run fetch() once per key at a time; concurrent callers share its (body, status)."""
+    with _sync_inflight_lock:
+        flight = _sync_inflight.get(key)
+        leader = flight is None
+        if leader:
+            flight = _sync_inflight[key] = _Flight()
+    if not leader:
+        metrics.incr('coalesced')
+        flight.done.wait()
+        return flight.result
+
+    try:
+        flight.result = _guarded(fetch)
+    finally:
+        with _sync_inflight_lock:
+            del _sync_inflight[key]
+        flight.done.set()
+    return flight.result
+
+
+# Asynchronous callers (FastAPI gateway)
+
+_async_slots = None
+_async_inflight = {}
+
+
+def _get_async_slots():
+    global _async_slots
+    if _async_slots is None:
+        _async_slots = asyncio.Semaphore(MAX_CONCURRENCY)
+    return _async_slots
+
+
+async def admit_async():
+    """Async twin of admit()."""
+    if breaker.rejecting():
+        metrics.incr('rejected_open')
+        return None, UNAVAILABLE_RESPONSE
+    slots = _get_async_slots()
+    started = time.monotonic()
+    try:
+        await asyncio.wait_for(slots.acquire(), timeout=QUEUE_TIMEOUT)
+    except asyncio.TimeoutError:
+        metrics.incr('rejected_busy')
+        return None, BUSY_RESPONSE
+    ticket, rejection = _admitted(started)
+    if rejection is not None:
+        slots.release()
+    return ticket, rejection
+
+
+def release_async(ticket, healthy):
+    """Async twin of release()."""
+    metrics.incr('in_flight', -1)
+    breaker.record(ticket, healthy)
+    _get_async_slots().release()
+
+
+async def _guarded_async(fetch):
+    ticket, rejection = await admit_async()
+    if rejection is not None:
+        return rejection
+    healthy = None
+    try:
+        body, status, healthy = await fetch()
+        return body, status
+    finally:
+        release_async(ticket, healthy)
+
+
+async def call_upstream_async(key, fetch):
+    """Async twin of call_upstream(); fetch is a coroutine function."""
+    task = _async_inflight.get(key)
+    if task is not None:
+        metrics.incr('coalesced')
+    else:
+        task = asyncio.ensure_future(_guarded_async(fetch))
+        _async_inflight[key] = task
+
+        def forget(done_task):
+            if _async_inflight.get(key) is done_task:
+                del _async_inflight[key]
+        task.add_done_callback(forget)
+    # Shielded so one client disconnecting does not cancel the shared call
+    return await asyncio.shield(task)
@@ -2,10 +2,13 @@ from fastapi import FastAPI
 from fastapi.responses import JSONResponse
 from starlette.middleware.wsgi import WSGIMiddleware
 
-# Import the existing Flask app
-from app import app as flask_app
+# Build the existing Flask app
+from app import create_app
+from chat_api import router as chat_router, lifespan
 
-app = FastAPI(title="EdVise (FastAPI gateway)")
+flask_app = create_app()
+
+app = FastAPI(title="EdVise (FastAPI gateway)", lifespan=lifespan)
 
 
 @app.get("/api/health")
@@ -13,6 +16,10 @@ def health():
     return JSONResponse({"status": "ok"})
 
 
+# Native async routes (registered before the mount so they take precedence)
+app.include_router(chat_router)
+
+
 # Mount the Flask app at root so all existing routes and templates continue working
 app.mount("/", WSGIMiddleware(flask_app))
 
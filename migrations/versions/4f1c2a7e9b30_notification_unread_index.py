@@ -0,0 +1,33 @@
+"""Partial index over unread notifications
+
+Revision ID: 4f1c2a7e9b30
+Revises: da4b09b17c74
+Create Date: 2026-10-17 11:30:00.000000
+
+Backs /api/notifications/unread-count, which the navbar badge polls. Only
+unread rows are indexed, so the count stays small and cheap however long a
+user's notification history grows.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4f1c2a7e9b30'
+down_revision = 'da4b09b17c74'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        op.create_index('ix_notification_user_unread', 'notification', ['user_id'], unique=False,
+                        if_not_exists=True, postgresql_concurrently=True,
+                        sqlite_where=sa.text('is_read = 0'), postgresql_where=sa.text('is_read = false'))
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_notification_user_unread', table_name='notification', if_exists=True,
+                      postgresql_concurrently=True)
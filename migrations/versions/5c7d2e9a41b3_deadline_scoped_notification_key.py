@@ -0,0 +1,62 @@
+"""Scope the notification fan-out key to the deadline
+
+Revision ID: 5c7d2e9a41b3
+Revises: e27a9c4d5f18
+Create Date: 2026-10-17 22:10:00.000000
+
+Deadline reminders record the deadline they are about, and the unique
+index that keeps `flask notify-deadlines` idempotent now covers only them:
+(user_id, notification_type, reference_id, deadline) where deadline is set.
+The old (user_id, notification_type, reference_id) index blocked every
+later notification about the same scholarship or exam, including reminders
+for a moved or reopened deadline.
+
+Reminders already sent are recognised by the titles notify-deadlines gives
+them and take the current deadline of their scholarship or exam, so a rerun
+does not repeat them.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5c7d2e9a41b3'
+down_revision = 'e27a9c4d5f18'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('notification', sa.Column('deadline', sa.DateTime(), nullable=True))
+    op.execute("""
+        UPDATE notification SET deadline = (
+            SELECT application_deadline FROM scholarship WHERE scholarship.id = notification.reference_id)
+        WHERE notification_type = 'scholarship' AND title LIKE 'Scholarship deadline: %'
+    """)
+    op.execute("""
+        UPDATE notification SET deadline = (
+            SELECT registration_end FROM exam WHERE exam.id = notification.reference_id)
+        WHERE notification_type = 'exam' AND title LIKE 'Exam registration closing: %'
+    """)
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        op.create_index('ix_notification_user_deadline', 'notification',
+                        ['user_id', 'notification_type', 'reference_id', 'deadline'], unique=True,
+                        if_not_exists=True, postgresql_concurrently=True,
+                        sqlite_where=sa.text('deadline IS NOT NULL'),
+                        postgresql_where=sa.text('deadline IS NOT NULL'))
+        op.drop_index('ix_notification_user_reference', table_name='notification', if_exists=True,
+                      postgresql_concurrently=True)
+
+
+def downgrade():
+    # Restoring the wider unique index fails if a user was reminded of a moved deadline
+    with op.get_context().autocommit_block():
+        op.create_index('ix_notification_user_reference', 'notification',
+                        ['user_id', 'notification_type', 'reference_id'], unique=True,
+                        if_not_exists=True, postgresql_concurrently=True)
+        op.drop_index('ix_notification_user_deadline', table_name='notification', if_exists=True,
+                      postgresql_concurrently=True)
+    with op.batch_alter_table('notification') as batch_op:
+        batch_op.drop_column('deadline')
@@ -0,0 +1,45 @@
+"""Indexes for the deadline notification fan-out
+
+Revision ID: 8d3e5b1f0c62
+Revises: 4f1c2a7e9b30
+Create Date: 2026-10-17 12:15:00.000000
+
+A unique (user_id, notification_type, reference_id) index guards
+`flask notify-deadlines`: a rerun inserts nothing for users who were
+already notified about a deadline. Notifications without a reference_id
+are unaffected (NULLs never conflict).
+
+The eligible-student index gains a trailing id column so each fan-out
+chunk (an id range) is an index range scan; it replaces
+ix_user_role_class_category.
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '8d3e5b1f0c62'
+down_revision = '4f1c2a7e9b30'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        op.create_index('ix_notification_user_reference', 'notification',
+                        ['user_id', 'notification_type', 'reference_id'], unique=True,
+                        if_not_exists=True, postgresql_concurrently=True)
+        op.create_index('ix_user_role_class_category_id', 'user', ['role', 'class_level', 'category', 'id'],
+                        unique=False, if_not_exists=True, postgresql_concurrently=True)
+        op.drop_index('ix_user_role_class_category', table_name='user', if_exists=True,
+                      postgresql_concurrently=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.create_index('ix_user_role_class_category', 'user', ['role', 'class_level', 'category'],
+                        unique=False, if_not_exists=True, postgresql_concurrently=True)
+        op.drop_index('ix_user_role_class_category_id', table_name='user', if_exists=True,
+                      postgresql_concurrently=True)
+        op.drop_index('ix_notification_user_reference', table_name='notification', if_exists=True,
+                      postgresql_concurrently=True)
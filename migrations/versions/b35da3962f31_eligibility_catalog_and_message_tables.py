@@ -0,0 +1,77 @@
+"""Eligibility lookup, catalog version and mentorship message tables
+
+Revision ID: b35da3962f31
+Revises: cb98606d74de
+Create Date: 2026-10-17 09:05:00.000000
+
+The eligibility lookup tables are filled from the existing JSON columns
+(models.backfill_eligibility), and the JSON conversation blobs in
+mentorship_session.messages are copied into mentorship_message rows
+(models.migrate_mentorship_messages).
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b35da3962f31'
+down_revision = 'cb98606d74de'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('catalog_version',
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('name')
+    )
+    op.create_table('exam_class',
+    sa.Column('exam_id', sa.Integer(), nullable=False),
+    sa.Column('class_level', sa.String(length=20), nullable=False),
+    sa.ForeignKeyConstraint(['exam_id'], ['exam.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('exam_id', 'class_level')
+    )
+    op.create_index('ix_exam_class_lookup', 'exam_class', ['class_level', 'exam_id'], unique=False)
+    op.create_table('scholarship_category',
+    sa.Column('scholarship_id', sa.Integer(), nullable=False),
+    sa.Column('category', sa.String(length=20), nullable=False),
+    sa.ForeignKeyConstraint(['scholarship_id'], ['scholarship.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('scholarship_id', 'category')
+    )
+    op.create_index('ix_scholarship_category_lookup', 'scholarship_category', ['category', 'scholarship_id'], unique=False)
+    op.create_table('scholarship_class',
+    sa.Column('scholarship_id', sa.Integer(), nullable=False),
+    sa.Column('class_level', sa.String(length=20), nullable=False),
+    sa.ForeignKeyConstraint(['scholarship_id'], ['scholarship.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('scholarship_id', 'class_level')
+    )
+    op.create_index('ix_scholarship_class_lookup', 'scholarship_class', ['class_level', 'scholarship_id'], unique=False)
+    op.create_table('mentorship_message',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('session_id', sa.Integer(), nullable=False),
+    sa.Column('user_message', sa.Text(), nullable=True),
+    sa.Column('ai_response', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['session_id'], ['mentorship_session.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_mentorship_message_session_created', 'mentorship_message', ['session_id', 'created_at'], unique=False)
+    # ### end Alembic commands ###
+
+    from models import backfill_eligibility, migrate_mentorship_messages
+    backfill_eligibility(op.get_bind())
+    migrate_mentorship_messages(op.get_bind())
+
+
+def downgrade():
+    op.drop_index('ix_mentorship_message_session_created', table_name='mentorship_message')
+    op.drop_table('mentorship_message')
+    op.drop_index('ix_scholarship_class_lookup', table_name='scholarship_class')
+    op.drop_table('scholarship_class')
+    op.drop_index('ix_scholarship_category_lookup', table_name='scholarship_category')
+    op.drop_table('scholarship_category')
+    op.drop_index('ix_exam_class_lookup', table_name='exam_class')
+    op.drop_table('exam_class')
+    op.drop_table('catalog_version')
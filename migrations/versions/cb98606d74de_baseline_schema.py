@@ -0,0 +1,204 @@
+"""Baseline schema
+
+Revision ID: cb98606d74de
+Revises: 
+Create Date: 2026-10-17 09:00:00.000000
+
+The tables as created by db.create_all() before migrations were added.
+Databases created that way can be stamped at this revision and upgraded.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'cb98606d74de'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('career',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('category', sa.String(length=50), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('required_education', sa.Text(), nullable=True),
+    sa.Column('job_roles', sa.Text(), nullable=True),
+    sa.Column('salary_range', sa.String(length=50), nullable=True),
+    sa.Column('growth_opportunities', sa.Text(), nullable=True),
+    sa.Column('skills_required', sa.Text(), nullable=True),
+    sa.Column('path_after_10th', sa.Text(), nullable=True),
+    sa.Column('path_after_12th', sa.Text(), nullable=True),
+    sa.Column('government_exams', sa.Text(), nullable=True),
+    sa.Column('reservation_benefits', sa.Text(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('college',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=200), nullable=False),
+    sa.Column('state', sa.String(length=100), nullable=False),
+    sa.Column('city', sa.String(length=100), nullable=False),
+    sa.Column('type', sa.String(length=50), nullable=False),
+    sa.Column('courses', sa.Text(), nullable=True),
+    sa.Column('fees_range', sa.String(length=50), nullable=True),
+    sa.Column('facilities', sa.Text(), nullable=True),
+    sa.Column('cutoff_info', sa.Text(), nullable=True),
+    sa.Column('seats', sa.Integer(), nullable=True),
+    sa.Column('scholarships', sa.Text(), nullable=True),
+    sa.Column('website', sa.String(length=200), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('exam',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=200), nullable=False),
+    sa.Column('exam_type', sa.String(length=50), nullable=True),
+    sa.Column('conducting_body', sa.String(length=200), nullable=True),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('eligibility_class', sa.Text(), nullable=True),
+    sa.Column('subjects_covered', sa.Text(), nullable=True),
+    sa.Column('exam_pattern', sa.Text(), nullable=True),
+    sa.Column('syllabus_link', sa.String(length=500), nullable=True),
+    sa.Column('registration_start', sa.DateTime(), nullable=True),
+    sa.Column('registration_end', sa.DateTime(), nullable=True),
+    sa.Column('exam_date', sa.DateTime(), nullable=True),
+    sa.Column('result_date', sa.DateTime(), nullable=True),
+    sa.Column('application_fee', sa.String(length=100), nullable=True),
+    sa.Column('official_website', sa.String(length=500), nullable=True),
+    sa.Column('category_benefits', sa.Text(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('scholarship',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=200), nullable=False),
+    sa.Column('provider', sa.String(length=200), nullable=True),
+    sa.Column('category_eligible', sa.Text(), nullable=True),
+    sa.Column('class_eligible', sa.Text(), nullable=True),
+    sa.Column('min_marks', sa.Float(), nullable=True),
+    sa.Column('max_family_income', sa.Integer(), nullable=True),
+    sa.Column('amount', sa.String(length=100), nullable=True),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('eligibility_criteria', sa.Text(), nullable=True),
+    sa.Column('application_deadline', sa.DateTime(), nullable=True),
+    sa.Column('application_link', sa.String(length=500), nullable=True),
+    sa.Column('documents_required', sa.Text(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('user',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('email', sa.String(length=120), nullable=False),
+    sa.Column('password_hash', sa.String(length=256), nullable=False),
+    sa.Column('first_name', sa.String(length=100), nullable=False),
+    sa.Column('last_name', sa.String(length=100), nullable=False),
+    sa.Column('role', sa.String(length=20), nullable=False),
+    sa.Column('phone', sa.String(length=15), nullable=True),
+    sa.Column('category', sa.String(length=10), nullable=True),
+    sa.Column('class_level', sa.String(length=10), nullable=True),
+    sa.Column('state', sa.String(length=100), nullable=True),
+    sa.Column('is_verified', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('last_login', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('email')
+    )
+    op.create_table('career_simulation',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.String(length=36), nullable=False),
+    sa.Column('scenario_name', sa.String(length=200), nullable=True),
+    sa.Column('chosen_stream', sa.String(length=50), nullable=True),
+    sa.Column('chosen_subjects', sa.Text(), nullable=True),
+    sa.Column('expected_careers', sa.Text(), nullable=True),
+    sa.Column('salary_projections', sa.Text(), nullable=True),
+    sa.Column('simulation_results', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('mentorship_session',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.String(length=36), nullable=False),
+    sa.Column('mentor_type', sa.String(length=20), nullable=True),
+    sa.Column('mentor_id', sa.String(length=36), nullable=True),
+    sa.Column('session_type', sa.String(length=50), nullable=True),
+    sa.Column('messages', sa.Text(), nullable=True),
+    sa.Column('status', sa.String(length=20), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['mentor_id'], ['user.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('notification',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.String(length=36), nullable=False),
+    sa.Column('title', sa.String(length=200), nullable=False),
+    sa.Column('message', sa.Text(), nullable=False),
+    sa.Column('notification_type', sa.String(length=50), nullable=True),
+    sa.Column('reference_id', sa.Integer(), nullable=True),
+    sa.Column('is_read', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('parent_child_relation',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('parent_id', sa.String(length=36), nullable=False),
+    sa.Column('child_id', sa.String(length=36), nullable=False),
+    sa.Column('relationship_type', sa.String(length=20), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['child_id'], ['user.id'], ),
+    sa.ForeignKeyConstraint(['parent_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('quiz_result',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.String(length=36), nullable=True),
+    sa.Column('session_id', sa.String(length=100), nullable=False),
+    sa.Column('answers', sa.Text(), nullable=False),
+    sa.Column('career_recommendations', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('saved_college',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.String(length=36), nullable=False),
+    sa.Column('college_id', sa.Integer(), nullable=False),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['college_id'], ['college.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('saved_scholarship',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.String(length=36), nullable=False),
+    sa.Column('scholarship_id', sa.Integer(), nullable=False),
+    sa.Column('application_status', sa.String(length=50), nullable=True),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['scholarship_id'], ['scholarship.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    # ### end Alembic commands ###
+
+
+def downgrade():
+    op.drop_table('saved_scholarship')
+    op.drop_table('saved_college')
+    op.drop_table('quiz_result')
+    op.drop_table('parent_child_relation')
+    op.drop_table('notification')
+    op.drop_table('mentorship_session')
+    op.drop_table('career_simulation')
+    op.drop_table('user')
+    op.drop_table('scholarship')
+    op.drop_table('exam')
+    op.drop_table('college')
+    op.drop_table('career')
@@ -0,0 +1,62 @@
+"""Indexes for the hot read paths
+
+Revision ID: da4b09b17c74
+Revises: b35da3962f31
+Create Date: 2026-10-17 09:10:00.000000
+
+Covers the per-user history lists, the parent dashboard joins, the college
+browse keyset (with and without state/type filters), the active scholarship
+and exam listings, and the deadline fan-out user filter. `flask check-indexes`
+runs EXPLAIN over those queries against a migrated database.
+
+On PostgreSQL the indexes are built CONCURRENTLY so a live table is not
+locked for writes; IF NOT EXISTS keeps the step safe on databases where
+`flask init-db` already created some of them.
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'da4b09b17c74'
+down_revision = 'b35da3962f31'
+branch_labels = None
+depends_on = None
+
+# (name, table, columns)
+INDEXES = [
+    ('ix_career_category', 'career', ['category', 'id']),
+    ('ix_career_simulation_user_created', 'career_simulation', ['user_id', 'created_at']),
+    ('ix_college_name_id', 'college', ['name', 'id']),
+    ('ix_college_state_type_name', 'college', ['state', 'type', 'name', 'id']),
+    ('ix_college_type_name', 'college', ['type', 'name', 'id']),
+    ('ix_exam_active_date', 'exam', ['is_active', 'exam_date']),
+    ('ix_exam_active_type_date', 'exam', ['is_active', 'exam_type', 'exam_date']),
+    ('ix_mentorship_session_active', 'mentorship_session', ['user_id', 'mentor_type', 'status']),
+    ('ix_mentorship_session_mentor', 'mentorship_session', ['mentor_id']),
+    ('ix_mentorship_session_user_created', 'mentorship_session', ['user_id', 'created_at']),
+    ('ix_notification_user_created', 'notification', ['user_id', 'created_at']),
+    ('ix_parent_child_relation_child', 'parent_child_relation', ['child_id']),
+    ('ix_parent_child_relation_parent', 'parent_child_relation', ['parent_id', 'child_id']),
+    ('ix_quiz_result_session', 'quiz_result', ['session_id']),
+    ('ix_quiz_result_user_created', 'quiz_result', ['user_id', 'created_at']),
+    ('ix_saved_college_college', 'saved_college', ['college_id']),
+    ('ix_saved_college_user', 'saved_college', ['user_id', 'college_id']),
+    ('ix_saved_scholarship_scholarship', 'saved_scholarship', ['scholarship_id']),
+    ('ix_saved_scholarship_user', 'saved_scholarship', ['user_id', 'scholarship_id']),
+    ('ix_scholarship_active', 'scholarship', ['is_active', 'id']),
+    ('ix_user_role_class_category', 'user', ['role', 'class_level', 'category']),
+]
+
+
+def upgrade():
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, unique=False, if_not_exists=True,
+                            postgresql_concurrently=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, table, columns in reversed(INDEXES):
+            op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=True)
@@ -0,0 +1,44 @@
+"""Structured college cutoffs
+
+Revision ID: e27a9c4d5f18
+Revises: 8d3e5b1f0c62
+Create Date: 2026-10-17 13:40:00.000000
+
+Existing cutoff_info text is parsed into the new table
+(models.backfill_cutoffs); `flask init-db` runs the same backfill and is
+safe to rerun.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e27a9c4d5f18'
+down_revision = '8d3e5b1f0c62'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('college_cutoff',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('college_id', sa.Integer(), nullable=False),
+    sa.Column('exam', sa.String(length=50), nullable=False),
+    sa.Column('metric', sa.String(length=20), nullable=False),
+    sa.Column('min_value', sa.Float(), nullable=True),
+    sa.Column('max_value', sa.Float(), nullable=True),
+    sa.Column('category', sa.String(length=20), nullable=False),
+    sa.ForeignKeyConstraint(['college_id'], ['college.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_college_cutoff_lookup', 'college_cutoff', ['exam', 'metric', 'category', 'college_id'], unique=False)
+    op.create_index('ix_college_cutoff_college', 'college_cutoff', ['college_id'], unique=False)
+
+    from models import backfill_cutoffs
+    backfill_cutoffs(op.get_bind())
+
+
+def downgrade():
+    op.drop_index('ix_college_cutoff_college', table_name='college_cutoff')
+    op.drop_index('ix_college_cutoff_lookup', table_name='college_cutoff')
+    op.drop_table('college_cutoff')
@@ -1,10 +1,14 @@
 from extensions import db
 from datetime import datetime
 from flask_login import UserMixin
+from sqlalchemy.orm import validates
 from werkzeug.security import generate_password_hash, check_password_hash
 import json
+import re
 import uuid
 
+OPEN_CUTOFF_CATEGORY = 'General'  # cutoff rows that do not name a category
+
 # User Management Models
 class User(UserMixin, db.Model):
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
@@ -25,6 +29,12 @@ class User(UserMixin, db.Model):
     quiz_results = db.relationship('QuizResult', backref='user', lazy=True)
     saved_colleges = db.relationship('SavedCollege', backref='user', lazy=True)
     mentorship_sessions = db.relationship('MentorshipSession', foreign_keys='MentorshipSession.user_id', backref='user', lazy=True)
+
+    __table_args__ = (
+        # Students eligible for a scholarship (scholarship_index.eligible_users_query), mentor lists;
+        # the trailing id lets the deadline fan-out walk eligible users in id ranges
+        db.Index('ix_user_role_class_category_id', 'role', 'class_level', 'category', 'id'),
+    )
     
     def set_password(self, password):
         self.password_hash = generate_password_hash(password)
@@ -45,6 +55,11 @@ class ParentChildRelation(db.Model):
     parent = db.relationship('User', foreign_keys=[parent_id], backref='children')
     child = db.relationship('User', foreign_keys=[child_id], backref='parents')
 
+    __table_args__ = (
+        db.Index('ix_parent_child_relation_parent', 'parent_id', 'child_id'),
+        db.Index('ix_parent_child_relation_child', 'child_id'),
+    )
+
 class QuizResult(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.String(36), db.ForeignKey('user.id'), nullable=True)
@@ -53,6 +68,11 @@ class QuizResult(db.Model):
     career_recommendations = db.Column(db.Text)  # JSON string of recommendations
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+    __table_args__ = (
+        db.Index('ix_quiz_result_user_created', 'user_id', 'created_at'),
+        db.Index('ix_quiz_result_session', 'session_id'),
+    )
+
 class College(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(200), nullable=False)
@@ -67,6 +87,24 @@ class College(db.Model):
     scholarships = db.Column(db.Text)
     website = db.Column(db.String(200))
 
+    __table_args__ = (
+        db.Index('ix_college_name_id', 'name', 'id'),  # keyset pagination
+        # Filtered keyset pages and the (state, type) facet counts
+        db.Index('ix_college_state_type_name', 'state', 'type', 'name', 'id'),
+        db.Index('ix_college_type_name', 'type', 'name', 'id'),
+    )
+
+    cutoffs = db.relationship('CollegeCutoff', cascade='all, delete-orphan', passive_deletes=True, lazy=True)
+
+    # Keep the structured cutoff rows in step with the free-text column
+    @validates('cutoff_info')
+    def _sync_cutoffs(self, key, value):
+        wanted = cutoff_rows(value)
+        present = [row.as_key() for row in self.cutoffs]
+        if present != [tuple(row.values()) for row in wanted]:
+            self.cutoffs[:] = [CollegeCutoff(**row) for row in wanted]
+        return value
+
 class Career(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
@@ -82,6 +120,10 @@ class Career(db.Model):
     government_exams = db.Column(db.Text)  # JSON string
     reservation_benefits = db.Column(db.Text)  # JSON string
 
+    __table_args__ = (
+        db.Index('ix_career_category', 'category', 'id'),
+    )
+
 # Scholarship and Exam Models
 class Scholarship(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -100,6 +142,32 @@ class Scholarship(db.Model):
     is_active = db.Column(db.Boolean, default=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+    eligible_categories = db.relationship('ScholarshipCategory', cascade='all, delete-orphan', lazy=True)
+    eligible_classes = db.relationship('ScholarshipClass', cascade='all, delete-orphan', lazy=True)
+
+    __table_args__ = (
+        db.Index('ix_scholarship_active', 'is_active', 'id'),
+    )
+
+    @property
+    def category_list(self):
+        return json.loads(self.category_eligible) if self.category_eligible else []
+
+    @property
+    def class_list(self):
+        return json.loads(self.class_eligible) if self.class_eligible else []
+
+    # Keep the indexed eligibility rows in step with the JSON columns
+    @validates('category_eligible')
+    def _sync_categories(self, key, value):
+        _sync_eligibility(self.eligible_categories, ScholarshipCategory, 'category', value)
+        return value
+
+    @validates('class_eligible')
+    def _sync_classes(self, key, value):
+        _sync_eligibility(self.eligible_classes, ScholarshipClass, 'class_level', value)
+        return value
+
 class Exam(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(200), nullable=False)
@@ -120,6 +188,253 @@ class Exam(db.Model):
     is_active = db.Column(db.Boolean, default=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+    eligible_classes = db.relationship('ExamClass', cascade='all, delete-orphan', lazy=True)
+
+    __table_args__ = (
+        # Exam listing: active exams by date, optionally of one type
+        db.Index('ix_exam_active_date', 'is_active', 'exam_date'),
+        db.Index('ix_exam_active_type_date', 'is_active', 'exam_type', 'exam_date'),
+    )
+
+    @property
+    def class_list(self):
+        return json.loads(self.eligibility_class) if self.eligibility_class else []
+
+    @validates('eligibility_class')
+    def _sync_classes(self, key, value):
+        _sync_eligibility(self.eligible_classes, ExamClass, 'class_level', value)
+        return value
+
+# Eligibility lookup tables (normalized from the JSON list columns above)
+class ScholarshipCategory(db.Model):
+    scholarship_id = db.Column(db.Integer, db.ForeignKey('scholarship.id', ondelete='CASCADE'), primary_key=True)
+    category = db.Column(db.String(20), primary_key=True)
+
+    __table_args__ = (
+        db.Index('ix_scholarship_category_lookup', 'category', 'scholarship_id'),
+    )
+
+class ScholarshipClass(db.Model):
+    scholarship_id = db.Column(db.Integer, db.ForeignKey('scholarship.id', ondelete='CASCADE'), primary_key=True)
+    class_level = db.Column(db.String(20), primary_key=True)
+
+    __table_args__ = (
+        db.Index('ix_scholarship_class_lookup', 'class_level', 'scholarship_id'),
+    )
+
+class ExamClass(db.Model):
+    exam_id = db.Column(db.Integer, db.ForeignKey('exam.id', ondelete='CASCADE'), primary_key=True)
+    class_level = db.Column(db.String(20), primary_key=True)
+
+    __table_args__ = (
+        db.Index('ix_exam_class_lookup', 'class_level', 'exam_id'),
+    )
+
+# Structured college cutoffs, parsed from College.cutoff_info
+class CollegeCutoff(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    college_id = db.Column(db.Integer, db.ForeignKey('college.id', ondelete='CASCADE'), nullable=False)
+    exam = db.Column(db.String(50), nullable=False)  # JEE Main, NEET, CUET, ...
+    metric = db.Column(db.String(20), nullable=False)  # rank, score, percentile, percentage
+    min_value = db.Column(db.Float)
+    max_value = db.Column(db.Float)  # closing rank for rank cutoffs
+    category = db.Column(db.String(20), nullable=False, default=OPEN_CUTOFF_CATEGORY)
+
+    __table_args__ = (
+        # Eligibility checker: cutoffs for one exam/metric and the student's categories
+        db.Index('ix_college_cutoff_lookup', 'exam', 'metric', 'category', 'college_id'),
+        db.Index('ix_college_cutoff_college', 'college_id'),
+    )
+
+    def as_key(self):
+        return (self.exam, self.metric, self.min_value, self.max_value, self.category)
+
+CUTOFF_METRICS = {'rank': 'rank', 'score': 'score', 'percentile': 'percentile',
+                  'marks': 'percentage', 'percentage': 'percentage'}
+CUTOFF_CATEGORIES = {'general': 'General', 'sc': 'SC', 'st': 'ST', 'obc': 'OBC', 'ews': 'EWS'}
+
+_NUMBER = r'(\d[\d,]*(?:\.\d+)?)'
+_CUTOFF_SEGMENT = re.compile(
+    r'^(?P<exam>.*?)\s*(?:\((?P<category>[a-z]+)\)\s*)?\b(?P<metric>rank|score|percentile|marks|percentage)\b'
+    r'\s*(?:\((?P<category_after>[a-z]+)\)\s*)?[:=\-]?\s*(?P<body>.*)$', re.I)
+_CUTOFF_RANGE = re.compile(
+    r'^' + _NUMBER + r'\s*%?\s*(?:(?P<plus>\+|and above|or above)|(?:-|–|to)\s*' + _NUMBER + r'\s*%?)?', re.I)
+_CUTOFF_UPTO = re.compile(r'^(?:up ?to|under|below|<=?|≤)\s*' + _NUMBER, re.I)
+
+def _cutoff_number(text):
+    return float(text.replace(',', ''))
+
+def parse_cutoff_info(text):
+    """Parse free-text cutoffs like "JEE Main Rank: 1000-10000" or "CUET Score: 600+".
+
+    Segments may be separated by ';', '|' or newlines, and may name a
+    category, e.g. "NEET (SC) Score: 550+". Returns a list of dicts with
+    exam, metric, min_value, max_value and category; unparseable segments
+    are skipped. A single rank is a closing rank (max_value); a single score
+    is a minimum.
+    """
+    cutoffs = []
+    for segment in re.split(r'[;|\n]', text or ''):
+        match = _CUTOFF_SEGMENT.match(segment.strip())
+        if not match or not match.group('exam').strip(' :-,'):
+            continue
+        metric = CUTOFF_METRICS[match.group('metric').lower()]
+        body = match.group('body').strip()
+
+        low = high = None
+        upto = _CUTOFF_UPTO.match(body)
+        span = _CUTOFF_RANGE.match(body)
+        if upto:
+            high = _cutoff_number(upto.group(1))
+        elif span:
+            low = _cutoff_number(span.group(1))
+            if span.group(3):
+                high = _cutoff_number(span.group(3))
+            elif not span.group('plus') and metric == 'rank':
+                low, high = None, low
+        else:
+            continue
+        if low is not None and high is not None and low > high:
+            low, high = high, low
+        if metric == 'rank' and high is None:
+            continue  # a rank cutoff needs a closing rank
+        if metric != 'rank' and low is None:
+            low = 0.0
+
+        category = (match.group('category') or match.group('category_after') or '').lower()
+        cutoffs.append({
+            'exam': ' '.join(match.group('exam').strip(' :-,').split()),
+            'metric': metric,
+            'min_value': low,
+            'max_value': high,
+            'category': CUTOFF_CATEGORIES.get(category, OPEN_CUTOFF_CATEGORY),
+        })
+    return cutoffs
+
+def cutoff_rows(cutoff_info):
+    """parse_cutoff_info() with duplicates dropped, in a stable order"""
+    unique = {tuple(row.values()): row for row in parse_cutoff_info(cutoff_info)}
+    return list(unique.values())
+
+def backfill_cutoffs(connection=None):
+    """Parse cutoff_info into CollegeCutoff rows for colleges imported before the table existed.
+
+    Runs on `connection` (a migration passes op.get_bind()) or else on the
+    session, which it commits.
+    """
+    execute = (connection or db.session).execute
+    colleges = execute(
+        db.select(College.id, College.cutoff_info)
+        .where(College.cutoff_info.isnot(None), College.cutoff_info != '', ~College.cutoffs.any())
+    ).all()
+    rows = [dict(row, college_id=college_id) for college_id, info in colleges for row in cutoff_rows(info)]
+    if rows:
+        execute(db.insert(CollegeCutoff), rows)
+    if connection is None:
+        db.session.commit()
+    return len(rows)
+
+def _json_list(value):
+    try:
+        items = json.loads(value) if value else []
+    except (TypeError, ValueError):
+        return []
+    return [str(item) for item in items] if isinstance(items, list) else []
+
+def _sync_eligibility(collection, model, attr, value):
+    """Make a relationship collection match the values in a JSON list, keeping unchanged rows"""
+    wanted = list(dict.fromkeys(_json_list(value)))
+    for row in list(collection):
+        if getattr(row, attr) not in wanted:
+            collection.remove(row)
+    present = {getattr(row, attr) for row in collection}
+    for item in wanted:
+        if item not in present:
+            collection.append(model(**{attr: item}))
+
+def backfill_eligibility(connection=None):
+    """Populate the eligibility tables for rows created before they existed.
+
+    Runs on `connection` (a migration passes op.get_bind()) or else on the
+    session, which it commits. Only the id and JSON columns are read, so it
+    works at any schema revision that has the lookup tables.
+    """
+    execute = (connection or db.session).execute
+    has_categories = db.exists().where(ScholarshipCategory.scholarship_id == Scholarship.id)
+    has_classes = db.exists().where(ScholarshipClass.scholarship_id == Scholarship.id)
+    scholarships = execute(
+        db.select(Scholarship.id, Scholarship.category_eligible, Scholarship.class_eligible)
+        .where(~has_categories, ~has_classes)
+    ).all()
+    exams = execute(
+        db.select(Exam.id, Exam.eligibility_class).where(~db.exists().where(ExamClass.exam_id == Exam.id))
+    ).all()
+
+    rows = {ScholarshipCategory: [], ScholarshipClass: [], ExamClass: []}
+    for scholarship_id, categories, classes in scholarships:
+        rows[ScholarshipCategory] += [{'scholarship_id': scholarship_id, 'category': category}
+                                      for category in dict.fromkeys(_json_list(categories))]
+        rows[ScholarshipClass] += [{'scholarship_id': scholarship_id, 'class_level': class_level}
+                                   for class_level in dict.fromkeys(_json_list(classes))]
+    for exam_id, classes in exams:
+        rows[ExamClass] += [{'exam_id': exam_id, 'class_level': class_level}
+                            for class_level in dict.fromkeys(_json_list(classes))]
+    for model, values in rows.items():
+        if values:
+            execute(db.insert(model), values)
+    if connection is None:
+        db.session.commit()
+    return len(scholarships) + len(exams)
+
+def migrate_mentorship_messages(connection=None):
+    """Move legacy JSON conversations into MentorshipMessage rows.
+
+    Runs on `connection` (a migration passes op.get_bind()) or else on the
+    session, which it commits.
+    """
+    execute = (connection or db.session).execute
+    sessions = execute(
+        db.select(MentorshipSession.id, MentorshipSession.messages,
+                  MentorshipSession.created_at, MentorshipSession.updated_at)
+        .where(MentorshipSession.messages.isnot(None))
+    ).all()
+    migrated_ids = []
+    for session_id, messages, created_at, updated_at in sessions:
+        try:
+            turns = json.loads(messages or '[]')
+        except ValueError:
+            turns = []
+        rows = []
+        for turn in turns if isinstance(turns, list) else []:
+            if not isinstance(turn, dict):
+                continue
+            try:
+                turn_at = datetime.fromisoformat(turn['timestamp'])
+            except (KeyError, TypeError, ValueError):
+                turn_at = updated_at or created_at or datetime.utcnow()
+            rows.append({
+                'session_id': session_id,
+                'user_message': turn.get('user'),
+                'ai_response': turn.get('ai'),
+                'created_at': turn_at,
+            })
+        if rows:
+            execute(db.insert(MentorshipMessage), rows)
+        migrated_ids.append(session_id)
+    if migrated_ids:
+        # Clearing the blob marks the sessions as migrated. A Core UPDATE that
+        # sets updated_at to itself keeps its onupdate from stamping every
+        # session with the migration time (the session list sorts by it)
+        execute(
+            db.update(MentorshipSession)
+            .where(MentorshipSession.id.in_(migrated_ids))
+            .values(messages=None, updated_at=MentorshipSession.updated_at)
+            .execution_options(synchronize_session=False)
+        )
+    if connection is None:
+        db.session.commit()
+    return len(migrated_ids)
+
 # User Interaction Models
 class SavedCollege(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -130,6 +445,11 @@ class SavedCollege(db.Model):
     
     college = db.relationship('College', backref='saved_by_users')
 
+    __table_args__ = (
+        db.Index('ix_saved_college_user', 'user_id', 'college_id'),
+        db.Index('ix_saved_college_college', 'college_id'),
+    )
+
 class SavedScholarship(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.String(36), db.ForeignKey('user.id'), nullable=False)
@@ -141,18 +461,52 @@ class SavedScholarship(db.Model):
     user = db.relationship('User', backref='saved_scholarships')
     scholarship = db.relationship('Scholarship', backref='saved_by_users')
 
+    __table_args__ = (
+        db.Index('ix_saved_scholarship_user', 'user_id', 'scholarship_id'),
+        db.Index('ix_saved_scholarship_scholarship', 'scholarship_id'),
+    )
+
 class MentorshipSession(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.String(36), db.ForeignKey('user.id'), nullable=False)
     mentor_type = db.Column(db.String(20), default='ai')  # ai, human
     mentor_id = db.Column(db.String(36), db.ForeignKey('user.id'), nullable=True)  # for human mentors
     session_type = db.Column(db.String(50))  # chat, career_guidance, exam_prep
-    messages = db.Column(db.Text)  # JSON string of conversation
+    messages = db.Column(db.Text)  # legacy JSON conversation; moved to MentorshipMessage rows
     status = db.Column(db.String(20), default='active')  # active, completed, cancelled
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     mentor = db.relationship('User', foreign_keys=[mentor_id], backref='mentoring_sessions_as_mentor')
+    message_rows = db.relationship('MentorshipMessage', backref='session', lazy='dynamic',
+                                   cascade='all, delete-orphan', passive_deletes=True)
+
+    __table_args__ = (
+        # Active-session lookup in the AI chat
+        db.Index('ix_mentorship_session_active', 'user_id', 'mentor_type', 'status'),
+        db.Index('ix_mentorship_session_user_created', 'user_id', 'created_at'),
+        db.Index('ix_mentorship_session_mentor', 'mentor_id'),
+    )
+
+class MentorshipMessage(db.Model):
+    """One conversation turn: the user's message and the mentor's reply"""
+    id = db.Column(db.Integer, primary_key=True)
+    session_id = db.Column(db.Integer, db.ForeignKey('mentorship_session.id', ondelete='CASCADE'), nullable=False)
+    user_message = db.Column(db.Text)
+    ai_response = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        db.Index('ix_mentorship_message_session_created', 'session_id', 'created_at'),
+    )
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'user': self.user_message,
+            'ai': self.ai_response,
+            'timestamp': self.created_at.isoformat(),
+        }
 
 class CareerSimulation(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -165,6 +519,10 @@ class CareerSimulation(db.Model):
     simulation_results = db.Column(db.Text)  # JSON string
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+    __table_args__ = (
+        db.Index('ix_career_simulation_user_created', 'user_id', 'created_at'),
+    )
+
 class Notification(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.String(36), db.ForeignKey('user.id'), nullable=False)
@@ -172,11 +530,30 @@ class Notification(db.Model):
     message = db.Column(db.Text, nullable=False)
     notification_type = db.Column(db.String(50))  # scholarship, exam, career, system
     reference_id = db.Column(db.Integer)  # ID of related scholarship/exam
+    deadline = db.Column(db.DateTime)  # set on deadline reminders: the date they remind about
     is_read = db.Column(db.Boolean, default=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     user = db.relationship('User', backref='notifications')
 
+    __table_args__ = (
+        db.Index('ix_notification_user_created', 'user_id', 'created_at'),
+        # One reminder per user per scholarship/exam deadline: reruns skip users already told, a moved
+        # or reopened deadline is a new reminder, and other notifications (no deadline) are unaffected
+        db.Index('ix_notification_user_deadline', 'user_id', 'notification_type', 'reference_id', 'deadline',
+                 unique=True, sqlite_where=db.text('deadline IS NOT NULL'),
+                 postgresql_where=db.text('deadline IS NOT NULL')),
+        # Partial index over unread rows only: the navbar's unread count stays an index-only lookup
+        db.Index('ix_notification_user_unread', 'user_id',
+                 sqlite_where=db.text('is_read = 0'), postgresql_where=db.text('is_read = false')),
+    )
+
+# Cache Coordination
+class CatalogVersion(db.Model):
+    name = db.Column(db.String(50), primary_key=True)  # college, career, scholarship
+    version = db.Column(db.Integer, nullable=False, default=1)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
 def initialize_data():
     """Initialize the database with sample data if empty"""
     # Initialize scholarships
@@ -0,0 +1,87 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import NamedTuple
+from flask import current_app, render_template, request, session
+from flask_login import current_user
+
+# Per-process render cache for mostly static pages (home, about, sitemap, ...).
+#
+# Their HTML depends only on the template and on who is viewing it: base.html
+# switches the navbar on the login state and shows the logged-in user's name.
+# Rendered pages are therefore keyed by template, URL, app version and the
+# viewer (None when anonymous, else the cached user Identity, so a rename
+# naturally misses). Every response carries a strong ETag of the body, and
+# If-None-Match requests get a 304 without rendering anything.
+
+PAGE_CACHE_SIZE = int(os.environ.get('PAGE_CACHE_SIZE', 2000))
+PUBLIC_MAX_AGE = 300  # seconds shared caches may serve an anonymous page
+
+
+class RenderedPage(NamedTuple):
+    body: bytes
+    etag: str
+
+
+class PageCache:
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> RenderedPage
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            page = self._entries.get(key)
+            if page is not None:
+                self._entries.move_to_end(key)
+            return page
+
+    def set(self, key, page):
+        with self._lock:
+            self._entries[key] = page
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+page_cache = PageCache(PAGE_CACHE_SIZE)
+
+
+def _render(template, context):
+    body = render_template(template, **context).encode('utf-8')
+    return RenderedPage(body=body, etag=hashlib.sha1(body).hexdigest())
+
+
+def render_cached(template, mimetype='text/html', **context):
+    """Render a template that only varies by viewer, from the cache when possible.
+
+    `context` must be the same on every call for a template; anything that
+    varies per request belongs in an uncached route.
+    """
+    viewer = current_user.identity if current_user.is_authenticated else None
+    if current_app.jinja_env.auto_reload or '_flashes' in session:
+        # Templates may change under us in debug mode, and pending flash
+        # messages are rendered (and consumed) by this request only
+        page = _render(template, context)
+    else:
+        key = (current_app.config['APP_VERSION'], template, request.base_url, viewer)
+        page = page_cache.get(key)
+        if page is None:
+            page = _render(template, context)
+            page_cache.set(key, page)
+
+    response = current_app.response_class(page.body, mimetype=mimetype)
+    response.set_etag(page.etag)
+    if viewer is None:
+        response.cache_control.public = True
+        response.cache_control.max_age = PUBLIC_MAX_AGE
+    else:
+        response.cache_control.private = True
+        response.cache_control.no_cache = True
+    response.vary.add('Cookie')
+    return response.make_conditional(request)
@@ -0,0 +1,175 @@
+import json
+from collections import namedtuple
+from contextlib import contextmanager
+from datetime import datetime
+from sqlalchemy import event, func
+from extensions import db
+from models import (User, QuizResult, College, Scholarship, SavedCollege, SavedScholarship,
+                    MentorshipSession, CareerSimulation, Notification)
+
+# EXPLAIN checks for the hot read paths, used by `flask check-indexes`.
+#
+# Each hot query runs the function its route calls (the college catalog, the
+# parent dashboard batches, the listing builders in advanced_routes) and the
+# SELECTs it sends to the database are explained. Single-column lookups that
+# routes and relationships run inline are written out the same way here.
+#
+# A plan fails when it reads a whole table instead of an index, or (for
+# `ordered` queries) when it sorts rows the index should already return in
+# order. SQLite and PostgreSQL are supported.
+
+HotQuery = namedtuple('HotQuery', 'name run ordered')
+
+SAMPLE_USER = '00000000-0000-0000-0000-000000000000'
+SAMPLE_POSITION = (datetime(2026, 1, 1), 0)  # a (created_at, id) keyset cursor
+
+
+def hot_queries():
+    from advanced_routes import exam_listing, message_page, notification_page, scholarship_listing
+    from child_progress import (_exam_deadlines, _latest_quizzes, _saved_counts, _scholarship_deadlines,
+                                children_progress)
+    from college_catalog import _build_facets, eligible_colleges, encode_cursor, list_colleges
+    from scholarship_index import eligible_users_query
+
+    cursor = encode_cursor(College(name='M', id=0))
+    scholarship = Scholarship(category_eligible='["SC", "ST"]', class_eligible='["10th", "12th"]')
+    return [
+        HotQuery('login by email', lambda: User.query.filter_by(email='student@example.com').first(), False),
+        HotQuery('parent dashboard children', lambda: children_progress(SAMPLE_USER), False),
+        HotQuery('parent dashboard latest quizzes', lambda: _latest_quizzes([SAMPLE_USER]), False),
+        HotQuery('parent dashboard saved colleges', lambda: _saved_counts(SavedCollege, [SAMPLE_USER]), False),
+        HotQuery('parent dashboard saved scholarships',
+                 lambda: _saved_counts(SavedScholarship, [SAMPLE_USER]), False),
+        HotQuery('parent dashboard scholarship deadlines',
+                 lambda: _scholarship_deadlines([SAMPLE_USER], datetime(2026, 1, 1)), False),
+        HotQuery('parent dashboard exam deadlines',
+                 lambda: _exam_deadlines({'12th'}, datetime(2026, 1, 1)), False),
+        HotQuery('quiz results by user',
+                 lambda: QuizResult.query.filter_by(user_id=SAMPLE_USER)
+                 .order_by(QuizResult.created_at.desc()).all(), True),
+        HotQuery('quiz results by session', lambda: QuizResult.query.filter_by(session_id='sample').all(), False),
+        HotQuery('notifications page', lambda: notification_page(SAMPLE_USER).all(), True),
+        HotQuery('older notifications page', lambda: notification_page(SAMPLE_USER, SAMPLE_POSITION).all(), True),
+        HotQuery('unread notification count',
+                 lambda: db.session.query(func.count(Notification.id))
+                 .filter_by(user_id=SAMPLE_USER, is_read=False).scalar(), False),
+        HotQuery('mentorship sessions by user',
+                 lambda: MentorshipSession.query.filter_by(user_id=SAMPLE_USER)
+                 .order_by(MentorshipSession.created_at.desc()).all(), True),
+        HotQuery('active AI mentorship session',
+                 lambda: MentorshipSession.query.filter_by(user_id=SAMPLE_USER, mentor_type='ai',
+                                                           status='active').first(), False),
+        HotQuery('mentorship message history', lambda: message_page(1, SAMPLE_POSITION).all(), True),
+        HotQuery('career simulations by user',
+                 lambda: CareerSimulation.query.filter_by(user_id=SAMPLE_USER)
+                 .order_by(CareerSimulation.created_at.desc()).all(), True),
+        HotQuery('college browse page', lambda: list_colleges(after=cursor), True),
+        HotQuery('college browse by type', lambda: list_colleges(ctype='Government', after=cursor), True),
+        HotQuery('college browse by state and type',
+                 lambda: list_colleges(state='Jammu and Kashmir', ctype='Government', after=cursor), True),
+        HotQuery('college facets', _build_facets, False),
+        HotQuery('eligibility checker cutoffs',
+                 lambda: eligible_colleges('SC', exam='JEE Main', metric='rank', value=8000), False),
+        HotQuery('active scholarships', lambda: scholarship_listing().all(), False),
+        HotQuery('active scholarships by category', lambda: scholarship_listing('SC').all(), False),
+        HotQuery('active scholarships by category and class', lambda: scholarship_listing('SC', '12th').all(), False),
+        HotQuery('upcoming exams', lambda: exam_listing().all(), True),
+        HotQuery('upcoming exams by type', lambda: exam_listing(exam_type='Engineering').all(), True),
+        HotQuery('students eligible for a scholarship',
+                 lambda: db.session.execute(eligible_users_query(scholarship)).all(), False),
+    ]
+
+
+@contextmanager
+def _captured_selects():
+    """Collect (sql, parameters) for every SELECT sent to the database inside the block"""
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(('SELECT', 'WITH')):
+            statements.append((statement, parameters))
+
+    event.listen(db.engine, 'before_cursor_execute', capture)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', capture)
+
+
+def _sqlite_plan(sql, parameters):
+    rows = db.session.connection().exec_driver_sql('EXPLAIN QUERY PLAN ' + sql, parameters).all()
+    return [row[-1] for row in rows]
+
+
+def _sqlite_problems(plan, ordered):
+    # Subqueries (window functions, IN lists) are read as co-routines, not tables
+    subqueries = {line.split(' ', 1)[1] for line in plan if line.startswith(('CO-ROUTINE ', 'MATERIALIZE '))}
+    problems = []
+    for line in plan:
+        source = line[len('SCAN '):] if line.startswith('SCAN ') else None
+        if source and 'USING' not in line and 'CONSTANT ROW' not in line \
+                and source not in subqueries and not source.startswith('(subquery-'):
+            problems.append(f'full table scan: {line}')
+        if ordered and line.startswith('USE TEMP B-TREE FOR ORDER BY'):
+            problems.append('sorts rows instead of reading them in index order')
+    return problems
+
+
+def _postgres_plan(sql, parameters, ordered):
+    connection = db.session.connection()
+    # Disabling sequential scans (and sorts, when the order should come from an
+    # index) makes the planner show whether a suitable index exists at all,
+    # independent of how small the tables are right now
+    connection.exec_driver_sql('SET LOCAL enable_seqscan = off')
+    connection.exec_driver_sql(f"SET LOCAL enable_sort = {'off' if ordered else 'on'}")
+    raw = connection.exec_driver_sql('EXPLAIN (FORMAT JSON) ' + sql, parameters).scalar()
+    plan = raw if isinstance(raw, list) else json.loads(raw)
+    nodes = []
+
+    def walk(node, depth):
+        label = node['Node Type']
+        if node.get('Index Name'):
+            label += f" using {node['Index Name']}"
+        if node.get('Relation Name'):
+            label += f" on {node['Relation Name']}"
+        nodes.append(('  ' * depth + label, node))
+        for child in node.get('Plans', []):
+            walk(child, depth + 1)
+
+    walk(plan[0]['Plan'], 0)
+    return nodes
+
+
+def _postgres_problems(nodes, ordered):
+    problems = []
+    for label, node in nodes:
+        if node['Node Type'] == 'Seq Scan':
+            problems.append(f"full table scan: {label.strip()}")
+        if ordered and node['Node Type'] == 'Sort':
+            problems.append('sorts rows instead of reading them in index order')
+    return problems
+
+
+def check_query_plans():
+    """EXPLAIN every hot query; returns a list of (name, plan lines, problems)."""
+    dialect = db.engine.dialect.name
+    if dialect not in ('sqlite', 'postgresql'):
+        raise RuntimeError(f'Query plan checks are not implemented for {dialect}')
+
+    results = []
+    for query in hot_queries():
+        with _captured_selects() as statements:
+            query.run()
+        plan, problems = [], []
+        for sql, parameters in statements:
+            if dialect == 'sqlite':
+                lines = _sqlite_plan(sql, parameters)
+                problems.extend(_sqlite_problems(lines, query.ordered))
+            else:
+                nodes = _postgres_plan(sql, parameters, query.ordered)
+                lines = [label for label, _ in nodes]
+                problems.extend(_postgres_problems(nodes, query.ordered))
+            plan.extend(lines)
+        results.append((query.name, plan, problems))
+    db.session.rollback()
+    return results
@@ -1,5 +1,13 @@
 # Quiz questions data and analysis logic
 
+import hashlib
+import json
+from functools import lru_cache
+from typing import TYPE_CHECKING, NamedTuple
+
+if TYPE_CHECKING:
+    import numpy as np
+
 QUIZ_QUESTIONS = [
     {
         'id': 1,
@@ -183,154 +191,217 @@ QUIZ_QUESTIONS = [
     }
 ]
 
+# Career categories scored by the quiz (column order of the weight matrix)
+CATEGORIES = ['Technology', 'Healthcare', 'Government', 'Education', 'Business']
+
+# Points each answer adds per category: question id -> answer value -> {category: weight}.
+# Answers that are not listed score nothing.
+ANSWER_WEIGHTS = {
+    1: {  # Activity preferences
+        'problem_solving': {'Technology': 3, 'Business': 1},
+        'helping_others': {'Healthcare': 3, 'Education': 2},
+        'creative_work': {'Education': 2, 'Business': 1},
+        'leadership': {'Government': 3, 'Business': 3},
+    },
+    2: {  # Subject preferences
+        'stem': {'Technology': 4},
+        'bio_medical': {'Healthcare': 4},
+        'humanities': {'Education': 3, 'Government': 2},
+        'commerce': {'Business': 4},
+    },
+    3: {  # Work preferences
+        'individual': {'Technology': 2},
+        'team': {'Business': 2, 'Technology': 1},
+        'public': {'Government': 3, 'Healthcare': 2},
+        'research': {'Technology': 2, 'Healthcare': 1},
+    },
+    4: {  # Motivation
+        'innovation': {'Technology': 3},
+        'service': {'Healthcare': 3, 'Government': 3, 'Education': 3},
+        'financial': {'Business': 3, 'Technology': 2},
+        'recognition': {'Government': 2, 'Business': 2},
+    },
+    5: {  # Work environment
+        'tech_office': {'Technology': 4},
+        'hospital': {'Healthcare': 4},
+        'government': {'Government': 4},
+        'school': {'Education': 4},
+    },
+    6: {  # Technology comfort (likert 1-5)
+        str(level): {'Technology': level, 'Business': max(0, level - 2)} for level in range(1, 6)
+    },
+    7: {  # Learning new things
+        'yes': {'Technology': 2, 'Education': 2, 'Healthcare': 1},
+    },
+    8: {  # Entrepreneurship
+        'yes': {'Business': 3, 'Technology': 1},
+    },
+    10: {  # Type of challenges
+        'technical': {'Technology': 3},
+        'human': {'Healthcare': 3, 'Education': 2},
+        'creative': {'Education': 2, 'Business': 1},
+        'strategic': {'Business': 3, 'Government': 2},
+    },
+    11: {  # Organization size
+        'startup': {'Technology': 2, 'Business': 2},
+        'government': {'Government': 3},
+        'large': {'Business': 2},
+    },
+    14: {  # Type of impact
+        'technological': {'Technology': 3},
+        'health': {'Healthcare': 4},
+        'social': {'Government': 3, 'Education': 3},
+        'economic': {'Business': 3},
+    },
+    18: {  # Research interest
+        'yes': {'Technology': 2, 'Healthcare': 2, 'Education': 1},
+    },
+}
+
+# Answer used when a question's submitted value is not in the table
+DEFAULT_ANSWERS = {
+    6: '3',
+}
+
+MIN_MATCH_PERCENTAGE = 20
+MAX_RECOMMENDATIONS = 5
+
+
+class ScoringTables(NamedTuple):
+    weight_matrix: "np.ndarray"  # (question x option) x category weights
+    answer_columns: dict  # (question_id, value) -> row of weight_matrix
+    max_category_scores: "np.ndarray"  # best achievable score per category
+    total_possible: float  # one denominator for every category keeps the ranking identical to the raw scores
+
+
+@lru_cache(maxsize=None)
+def scoring_tables():
+    """Flatten ANSWER_WEIGHTS into a (question x option) x category matrix.
+
+    Built on first use so importing this module (and starting the app)
+    does not pay for importing NumPy.
+    """
+    import numpy as np
+
+    columns = {}
+    rows = []
+    for question_id, options in ANSWER_WEIGHTS.items():
+        for value, weights in options.items():
+            columns[(question_id, value)] = len(rows)
+            rows.append([weights.get(category, 0) for category in CATEGORIES])
+    matrix = np.array(rows, dtype=np.float64).reshape(len(rows), len(CATEGORIES))
+
+    # Best achievable score per category: the highest-weighted option of every question
+    best = np.zeros(len(CATEGORIES))
+    for question_id, options in ANSWER_WEIGHTS.items():
+        best += np.max([[weights.get(category, 0) for category in CATEGORIES] for weights in options.values()], axis=0)
+    return ScoringTables(weight_matrix=matrix, answer_columns=columns,
+                         max_category_scores=best, total_possible=float(best.max()))
+
+
+def encode_answers(answer_sets):
+    """One-hot encode answer dicts ({question_id: value}) into a (n, options) matrix."""
+    import numpy as np
+
+    answer_columns = scoring_tables().answer_columns
+    rows, cols = [], []
+    for row, answers in enumerate(answer_sets):
+        for question_id, answer in answers.items():
+            try:
+                qid = int(question_id)
+            except (TypeError, ValueError):
+                continue
+            col = answer_columns.get((qid, str(answer)))
+            if col is None and qid in DEFAULT_ANSWERS:
+                col = answer_columns[(qid, DEFAULT_ANSWERS[qid])]
+            if col is not None:
+                rows.append(row)
+                cols.append(col)
+
+    encoded = np.zeros((len(answer_sets), len(answer_columns)), dtype=np.float64)
+    encoded[rows, cols] = 1.0
+    return encoded
+
+
+def score_answers(answer_sets):
+    """Raw category scores for a batch of answer dicts, shape (n, len(CATEGORIES))."""
+    return encode_answers(answer_sets) @ scoring_tables().weight_matrix
+
+
+def _recommendations(percentages):
+    # The cutoff applies to the unrounded percentage; only the reported value is rounded
+    recommendations = [
+        {'category': category, 'match_percentage': round(float(percentage))}
+        for category, percentage in zip(CATEGORIES, percentages)
+        if percentage > MIN_MATCH_PERCENTAGE  # Only include categories with significant match
+    ]
+    # Sort by match percentage (stable, so ties keep category order)
+    recommendations.sort(key=lambda x: x['match_percentage'], reverse=True)
+    return recommendations[:MAX_RECOMMENDATIONS]
+
+
+def analyze_quiz_results_batch(answer_sets):
+    """
+    Score many quiz submissions at once and return a list of recommendation lists
+    """
+    answer_sets = list(answer_sets)
+    if not answer_sets:
+        return []
+    import numpy as np
+
+    percentages = np.minimum(100.0, score_answers(answer_sets) / scoring_tables().total_possible * 100)
+    return [_recommendations(row) for row in percentages]
+
+
 def analyze_quiz_results(answers):
     """
     Analyze quiz answers and return career recommendations
     """
-    # Initialize scoring for different career categories
-    scores = {
-        'Technology': 0,
-        'Healthcare': 0,
-        'Government': 0,
-        'Education': 0,
-        'Business': 0
-    }
-    
-    # Analyze each answer and add scores
-    for question_id, answer in answers.items():
-        qid = int(question_id)
-        
-        if qid == 1:  # Activity preferences
-            if answer == 'problem_solving':
-                scores['Technology'] += 3
-                scores['Business'] += 1
-            elif answer == 'helping_others':
-                scores['Healthcare'] += 3
-                scores['Education'] += 2
-            elif answer == 'creative_work':
-                scores['Education'] += 2
-                scores['Business'] += 1
-            elif answer == 'leadership':
-                scores['Government'] += 3
-                scores['Business'] += 3
-        
-        elif qid == 2:  # Subject preferences
-            if answer == 'stem':
-                scores['Technology'] += 4
-            elif answer == 'bio_medical':
-                scores['Healthcare'] += 4
-            elif answer == 'humanities':
-                scores['Education'] += 3
-                scores['Government'] += 2
-            elif answer == 'commerce':
-                scores['Business'] += 4
-        
-        elif qid == 3:  # Work preferences
-            if answer == 'individual':
-                scores['Technology'] += 2
-            elif answer == 'team':
-                scores['Business'] += 2
-                scores['Technology'] += 1
-            elif answer == 'public':
-                scores['Government'] += 3
-                scores['Healthcare'] += 2
-            elif answer == 'research':
-                scores['Technology'] += 2
-                scores['Healthcare'] += 1
-        
-        elif qid == 4:  # Motivation
-            if answer == 'innovation':
-                scores['Technology'] += 3
-            elif answer == 'service':
-                scores['Healthcare'] += 3
-                scores['Government'] += 3
-                scores['Education'] += 3
-            elif answer == 'financial':
-                scores['Business'] += 3
-                scores['Technology'] += 2
-            elif answer == 'recognition':
-                scores['Government'] += 2
-                scores['Business'] += 2
-        
-        elif qid == 5:  # Work environment
-            if answer == 'tech_office':
-                scores['Technology'] += 4
-            elif answer == 'hospital':
-                scores['Healthcare'] += 4
-            elif answer == 'government':
-                scores['Government'] += 4
-            elif answer == 'school':
-                scores['Education'] += 4
-        
-        elif qid == 6:  # Technology comfort
-            tech_score = int(answer) if answer.isdigit() else 3
-            scores['Technology'] += tech_score
-            scores['Business'] += max(0, tech_score - 2)
-        
-        elif qid == 7:  # Learning new things
-            if answer == 'yes':
-                scores['Technology'] += 2
-                scores['Education'] += 2
-                scores['Healthcare'] += 1
-        
-        elif qid == 8:  # Entrepreneurship
-            if answer == 'yes':
-                scores['Business'] += 3
-                scores['Technology'] += 1
-        
-        elif qid == 10:  # Type of challenges
-            if answer == 'technical':
-                scores['Technology'] += 3
-            elif answer == 'human':
-                scores['Healthcare'] += 3
-                scores['Education'] += 2
-            elif answer == 'creative':
-                scores['Education'] += 2
-                scores['Business'] += 1
-            elif answer == 'strategic':
-                scores['Business'] += 3
-                scores['Government'] += 2
-        
-        elif qid == 11:  # Organization size
-            if answer == 'startup':
-                scores['Technology'] += 2
-                scores['Business'] += 2
-            elif answer == 'government':
-                scores['Government'] += 3
-            elif answer == 'large':
-                scores['Business'] += 2
-        
-        elif qid == 14:  # Type of impact
-            if answer == 'technological':
-                scores['Technology'] += 3
-            elif answer == 'health':
-                scores['Healthcare'] += 4
-            elif answer == 'social':
-                scores['Government'] += 3
-                scores['Education'] += 3
-            elif answer == 'economic':
-                scores['Business'] += 3
-        
-        elif qid == 18:  # Research interest
-            if answer == 'yes':
-                scores['Technology'] += 2
-                scores['Healthcare'] += 2
-                scores['Education'] += 1
-    
-    # Calculate percentages and sort
-    total_possible = 50  # Rough estimate of maximum possible score
-    recommendations = []
-    
-    for category, score in scores.items():
-        percentage = min(100, (score / total_possible) * 100)
-        if percentage > 20:  # Only include categories with significant match
-            recommendations.append({
-                'category': category,
-                'match_percentage': round(percentage)
-            })
-    
-    # Sort by match percentage
-    recommendations.sort(key=lambda x: x['match_percentage'], reverse=True)
-    
-    # Return top 5 recommendations
-    return recommendations[:5]
+    return analyze_quiz_results_batch([answers])[0]
+
+
+# Client-side quiz: the question set served once as JSON, and validation of the answers posted back
+
+class QuestionsPayload(NamedTuple):
+    json_body: bytes
+    etag: str
+
+
+@lru_cache(maxsize=None)
+def questions_payload():
+    """QUIZ_QUESTIONS serialized once for /api/quiz/questions."""
+    json_body = json.dumps({'questions': QUIZ_QUESTIONS}, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return QuestionsPayload(json_body=json_body, etag=hashlib.sha1(json_body).hexdigest())
+
+
+def _allowed_values(question):
+    if question['type'] == 'mcq':
+        return {option['value'] for option in question['options']}
+    if question['type'] == 'likert':
+        return {str(level) for level in range(1, question['scale'] + 1)}
+    return {'yes', 'no'}
+
+
+@lru_cache(maxsize=None)
+def allowed_answers():
+    """question id (as a string, like the session keys) -> accepted answer values"""
+    return {str(question['id']): frozenset(_allowed_values(question)) for question in QUIZ_QUESTIONS}
+
+
+def clean_answers(answers):
+    """
+    Validate a posted {question_id: value} dict; returns it with string keys and values
+    or raises ValueError naming the first bad entry
+    """
+    if not isinstance(answers, dict) or not answers:
+        raise ValueError('answers must be a non-empty object of question id -> answer')
+    allowed = allowed_answers()
+    cleaned = {}
+    for question_id, value in answers.items():
+        question_id, value = str(question_id), str(value)
+        if question_id not in allowed:
+            raise ValueError(f'unknown question id {question_id}')
+        if value not in allowed[question_id]:
+            raise ValueError(f'invalid answer for question {question_id}')
+        cleaned[question_id] = value
+    return cleaned
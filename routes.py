@@ -1,12 +1,66 @@
-from flask import render_template, request, session, redirect, url_for, jsonify, current_app
+from flask import render_template, request, session, redirect, url_for, jsonify, current_app, Response
 from flask_login import login_required, current_user
 from extensions import db
-from models import QuizResult, College, Career, User, ParentChildRelation
-from quiz_data import QUIZ_QUESTIONS, analyze_quiz_results
+from models import QuizResult, College, Notification
+from quiz_data import QUIZ_QUESTIONS, analyze_quiz_results, clean_answers, questions_payload
+from search_index import apply_search
+from chatbot import SSE_HEADERS, answer_chat, stream_chat
+from chat_cache import response_cache
+from llm_gateway import gateway_stats
+from career_catalog import career_for_category, explorer_payload
+from college_catalog import college_facets, filtered_colleges, list_colleges, college_to_dict
+from child_progress import children_progress
+from page_cache import render_cached
 import json
 import uuid
-import os
 from dotenv import load_dotenv
+from functools import wraps
+
+# Roles allowed to read operational endpoints (cache and upstream stats)
+STAFF_ROLES = ('admin', 'teacher')
+
+
+def staff_required(view):
+    """login_required plus a 403 JSON error for roles outside STAFF_ROLES."""
+    @wraps(view)
+    @login_required
+    def wrapper(*args, **kwargs):
+        if current_user.role not in STAFF_ROLES:
+            return jsonify({'error': 'Forbidden'}), 403
+        return view(*args, **kwargs)
+    return wrapper
+
+
+def _save_quiz_result(answers):
+    """Score a completed quiz, store the QuizResult and return its recommendations."""
+    recommendations = analyze_quiz_results(answers)
+    quiz_result = QuizResult(
+        user_id=current_user.id if current_user.is_authenticated else None,
+        session_id=session.get('quiz_session_id'),
+        answers=json.dumps(answers),
+        career_recommendations=json.dumps(recommendations)
+    )
+    db.session.add(quiz_result)
+    db.session.commit()
+    return recommendations
+
+
+def _career_details(recommendations):
+    """Recommendations joined with career information from the in-process catalog."""
+    career_details = []
+    for rec in recommendations:
+        career = career_for_category(rec['category'])
+        if career:
+            career_details.append({
+                'name': career['name'],
+                'category': career['category'],
+                'description': career['description'],
+                'job_roles': career['job_roles'],
+                'salary_range': career['salary_range'],
+                'match_percentage': rec['match_percentage']
+            })
+    return career_details
+
 
 def register_routes(app):
     # Import blueprints
@@ -19,7 +73,7 @@ def register_routes(app):
 
     @app.route('/')
     def index():
-        return render_template('index.html')
+        return render_cached('index.html')
 
     @app.route('/dashboard')
     @login_required
@@ -37,9 +91,8 @@ def register_routes(app):
         if current_user.role != 'parent':
             return redirect(url_for('dashboard'))
         
-        # Get linked children
-        children_relations = ParentChildRelation.query.filter_by(parent_id=current_user.id).all()
-        children = [relation.child for relation in children_relations]
+        # Linked children with their quiz, saved-item and deadline summaries (fixed number of queries)
+        children = children_progress(current_user.id)
         
         return render_template('dashboard/parent_dashboard.html', user=current_user, children=children)
 
@@ -95,58 +148,50 @@ def register_routes(app):
         if 'quiz_answers' not in session or not session['quiz_answers']:
             return redirect(url_for('quiz'))
         
-        # Analyze quiz results
-        recommendations = analyze_quiz_results(session['quiz_answers'])
-        
-        # Save results to database
-        quiz_result = QuizResult(
-            user_id=current_user.id if current_user.is_authenticated else None,
-            session_id=session.get('quiz_session_id'),
-            answers=json.dumps(session['quiz_answers']),
-            career_recommendations=json.dumps(recommendations)
-        )
-        db.session.add(quiz_result)
-        db.session.commit()
-        
-        # Get detailed career information
-        career_details = []
-        for rec in recommendations:
-            career = Career.query.filter_by(category=rec['category']).first()
-            if career:
-                career_info = {
-                    'name': career.name,
-                    'category': career.category,
-                    'description': career.description,
-                    'job_roles': json.loads(career.job_roles) if career.job_roles else [],
-                    'salary_range': career.salary_range,
-                    'match_percentage': rec['match_percentage']
-                }
-                career_details.append(career_info)
-        
+        recommendations = _save_quiz_result(session['quiz_answers'])
+        career_details = _career_details(recommendations)
+
         return render_template('results.html', 
                              recommendations=career_details,
                              quiz_session_id=session.get('quiz_session_id'))
 
+    @app.route('/api/quiz/questions')
+    def quiz_questions_api():
+        # The whole question set in one cacheable response for the client-side quiz
+        payload = questions_payload()
+        response = current_app.response_class(payload.json_body, mimetype='application/json')
+        response.set_etag(payload.etag)
+        response.cache_control.public = True
+        response.cache_control.max_age = 3600
+        return response.make_conditional(request)
+
+    @app.route('/api/quiz/score', methods=['POST'])
+    def quiz_score_api():
+        # Every answer of a client-side quiz in one request
+        data = request.get_json(silent=True) or {}
+        try:
+            answers = clean_answers(data.get('answers'))
+        except ValueError as exc:
+            return jsonify({'error': str(exc)}), 400
+        if 'quiz_session_id' not in session:
+            session['quiz_session_id'] = str(uuid.uuid4())
+        recommendations = _save_quiz_result(answers)
+        return jsonify({'recommendations': _career_details(recommendations),
+                        'answered': len(answers),
+                        'total_questions': len(QUIZ_QUESTIONS)})
+
     @app.route('/career-explorer')
     def career_explorer():
-        careers = Career.query.all()
-        career_data = []
-        
-        for career in careers:
-            career_info = {
-                'id': career.id,
-                'name': career.name,
-                'category': career.category,
-                'description': career.description,
-                'required_education': career.required_education,
-                'job_roles': json.loads(career.job_roles) if career.job_roles else [],
-                'salary_range': career.salary_range,
-                'growth_opportunities': career.growth_opportunities,
-                'skills_required': json.loads(career.skills_required) if career.skills_required else []
-            }
-            career_data.append(career_info)
-        
-        return render_template('career_explorer.html', careers=career_data)
+        return render_template('career_explorer.html', careers=explorer_payload().career_data)
+
+    @app.route('/api/careers')
+    def careers_api():
+        payload = explorer_payload()
+        response = current_app.response_class(payload.json_body, mimetype='application/json')
+        response.set_etag(payload.etag)
+        response.cache_control.public = True
+        response.cache_control.max_age = 300
+        return response.make_conditional(request)
 
     @app.route('/college-finder')
     def college_finder():
@@ -155,367 +200,141 @@ def register_routes(app):
         type_filter = request.args.get('type', '')
         search_query = request.args.get('search', '')
         page = request.args.get('page', 1, type=int)
-        per_page = min(request.args.get('per_page', 20, type=int), 50)
-        
-        # Build query
-        query = College.query
-        
-        if state_filter:
-            query = query.filter(College.state.ilike(f'%{state_filter}%'))
-        
-        if type_filter:
-            query = query.filter(College.type.ilike(f'%{type_filter}%'))
-        
+        per_page = max(1, min(request.args.get('per_page', 20, type=int), 50))
+        after = request.args.get('after', '')
+        before = request.args.get('before', '')
+        filter_args = dict(per_page=per_page, state=state_filter, type=type_filter, search=search_query)
+
+        # Facet lists and counts come from the per-version cache, so an
+        # unfiltered or dropdown-filtered page needs no COUNT query
+        facets = college_facets()
+        states = [state for state, _ in facets['states']]
+        types = [type_ for type_, _ in facets['types']]
+        state_counts = dict(facets['states'])
+        type_counts = dict(facets['types'])
+
+        prev_url = next_url = None
         if search_query:
-            query = query.filter(College.name.ilike(f'%{search_query}%'))
-        
-        # Order by name for consistent pagination
-        query = query.order_by(College.name.asc())
-
-        # Paginate results (compatible with Flask-SQLAlchemy 3)
-        try:
-            pagination = db.paginate(query, page=page, per_page=per_page, error_out=False)
+            # Relevance-ranked search results keep numbered pages
+            query = filtered_colleges(state_filter, type_filter)
+            query = apply_search(query.order_by(College.name.asc()), search_query)
+            pagination = query.paginate(page=page, per_page=per_page, error_out=False)
             colleges_page = pagination.items
             total = pagination.total
             pages = pagination.pages
-            has_next = pagination.has_next
-            has_prev = pagination.has_prev
-            next_num = pagination.next_num
-            prev_num = pagination.prev_num
-        except Exception:
-            # Fallback manual pagination for environments without db.paginate
-            total = query.count()
-            pages = (total + per_page - 1) // per_page
-            offset = (page - 1) * per_page
-            colleges_page = query.limit(per_page).offset(offset).all()
-            has_prev = page > 1
-            has_next = page < pages
-            next_num = page + 1 if has_next else None
-            prev_num = page - 1 if has_prev else None
-        
-        # Get unique states and types for filters
-        all_states = db.session.query(College.state).distinct().all()
-        all_types = db.session.query(College.type).distinct().all()
-        
-        states = [state[0] for state in all_states]
-        types = [type_[0] for type_ in all_types]
+            if pagination.has_prev:
+                prev_url = url_for('college_finder', page=pagination.prev_num, **filter_args)
+            if pagination.has_next:
+                next_url = url_for('college_finder', page=pagination.next_num, **filter_args)
+            page_label = f"Page {page} of {pages}"
+        else:
+            # Browsing uses keyset pagination on (name, id), same as /api/colleges
+            listing = list_colleges(state_filter, type_filter, after=after, before=before,
+                                    limit=per_page, with_total=True)
+            colleges_page = listing['items']
+            total = listing['total']
+            if listing['prev_cursor']:
+                prev_url = url_for('college_finder', before=listing['prev_cursor'], **filter_args)
+            if listing['next_cursor']:
+                next_url = url_for('college_finder', after=listing['next_cursor'], **filter_args)
+            page_label = f"{len(colleges_page)} of {total}"
         
         # Format college data
-        college_data = []
-        for college in colleges_page:
-            college_info = {
-                'id': college.id,
-                'name': college.name,
-                'state': college.state,
-                'city': college.city,
-                'type': college.type,
-                'courses': json.loads(college.courses) if college.courses else [],
-                'fees_range': college.fees_range,
-                'facilities': json.loads(college.facilities) if college.facilities else [],
-                'cutoff_info': college.cutoff_info,
-                'seats': college.seats,
-                'scholarships': college.scholarships,
-                'website': college.website
-            }
-            college_data.append(college_info)
+        college_data = [college_to_dict(college) for college in colleges_page]
         
         return render_template('college_finder.html', 
                              colleges=college_data,
                              states=states,
                              types=types,
+                             state_counts=state_counts,
+                             type_counts=type_counts,
                              current_state=state_filter,
                              current_type=type_filter,
                              current_search=search_query,
-                             page=page,
                              per_page=per_page,
                              total=total,
-                             pages=pages,
-                             has_next=has_next,
-                             has_prev=has_prev,
-                             next_num=next_num,
-                             prev_num=prev_num)
+                             prev_url=prev_url,
+                             next_url=next_url,
+                             page_label=page_label)
+
+    @app.route('/api/colleges')
+    def colleges_api():
+        """JSON college listing with keyset pagination.
+
+        Query params: state, type, search, after / before (cursors), limit,
+        include_total=1 to also return the number of matching colleges.
+        """
+        limit = max(1, min(request.args.get('limit', 20, type=int), 50))
+        listing = list_colleges(
+            state=request.args.get('state', ''),
+            ctype=request.args.get('type', ''),
+            search=request.args.get('search', ''),
+            after=request.args.get('after', ''),
+            before=request.args.get('before', ''),
+            limit=limit,
+            with_total=request.args.get('include_total', '') in ('1', 'true', 'yes')
+        )
+
+        payload = {
+            'colleges': [college_to_dict(college) for college in listing['items']],
+            'next_cursor': listing['next_cursor'],
+            'prev_cursor': listing['prev_cursor'],
+        }
+        if listing['total'] is not None:
+            payload['total'] = listing['total']
+        return jsonify(payload)
 
     @app.route('/about')
     def about():
-        return render_template('about.html')
+        return render_cached('about.html')
 
     @app.route('/contact')
     def contact():
-        return render_template('contact.html')
+        return render_cached('contact.html')
 
     @app.route('/newsletter')
     def newsletter():
-        return render_template('newsletter.html')
+        return render_cached('newsletter.html')
 
     @app.route('/sitemap.xml')
     def sitemap():
         from datetime import datetime
-        return render_template('sitemap.xml', moment=lambda: datetime.utcnow()), 200, {'Content-Type': 'application/xml'}
+        # Rendered once per worker, so lastmod is the date this worker first served it
+        return render_cached('sitemap.xml', mimetype='application/xml', lastmod=datetime.utcnow().strftime('%Y-%m-%d'))
 
     @app.route('/robots.txt')
     def robots():
         return app.send_static_file('robots.txt')
 
-    # Helper functions for chatbot
-    def is_career_related_query(message):
-        """Check if the user query is related to career guidance or education"""
-        # Handle greetings and general queries
-        greeting_patterns = [
-            'hello', 'hi', 'hey', 'good morning', 'good afternoon', 'good evening',
-            'greetings', 'what can you help', 'what can you do', 'how can you help',
-            'what is this', 'who are you', 'introduce yourself'
-        ]
-        
-        message_lower = message.lower().strip()
-        
-        # Check if it's a greeting or general query about the bot
-        if any(pattern in message_lower for pattern in greeting_patterns):
-            return True  # We'll handle greetings as a special case
-        
-        career_keywords = [
-            # Education & Career
-            'career', 'job', 'profession', 'education', 'study', 'course', 'degree', 'diploma',
-            'college', 'university', 'school', 'admission', 'entrance', 'exam', 'test',
-            'scholarship', 'fee', 'eligibility', 'qualification', 'certificate',
-            
-            # Specific Exams
-            'neet', 'jee', 'cuet', 'jkcet', 'upsc', 'ssc', 'gate', 'cat', 'mat', 'gmat',
-            'ielts', 'toefl', 'sat', 'gre', 'clat', 'nift', 'cmat', 'xat',
-            
-            # Fields & Subjects
-            'engineering', 'medical', 'doctor', 'nurse', 'teacher', 'lawyer', 'management',
-            'business', 'commerce', 'science', 'arts', 'humanities', 'technology', 'computer',
-            'pharmacy', 'dentistry', 'veterinary', 'agriculture', 'architecture',
-            
-            # J&K Specific
-            'jammu', 'kashmir', 'srinagar', 'jammu university', 'kashmir university',
-            'nit srinagar', 'iit jammu', 'pmsss', 'j&k', 'jk',
-            
-            # Career Guidance
-            'guidance', 'advice', 'help', 'suggest', 'recommend', 'choose', 'select',
-            'future', 'opportunity', 'scope', 'salary', 'placement', 'internship'
-        ]
-        
-        return any(keyword in message_lower for keyword in career_keywords)
-
-    def is_greeting_query(message):
-        """Check if the message is a greeting or general bot inquiry"""
-        greeting_patterns = [
-            'hello', 'hi', 'hey', 'good morning', 'good afternoon', 'good evening',
-            'greetings', 'what can you help', 'what can you do', 'how can you help',
-            'what is this', 'who are you', 'introduce yourself', 'tell me about yourself'
-        ]
-        
-        message_lower = message.lower().strip()
-        return any(pattern in message_lower for pattern in greeting_patterns)
-
-    def generate_greeting_response():
-        """Generate a structured greeting response"""
-        import random
-        
-        greetings = [
-            {
-                "summary": "Hello! 👋 I'm your EdVise Career Assistant, ready to guide your educational journey in J&K!",
-                "points": [
-                    "Get personalized career guidance based on your interests and academic strengths.",
-                    "Discover entrance exams like NEET, JEE, CUET, JKCET with preparation strategies.",
-                    "Explore top government and private colleges in Jammu & Kashmir with admission details.",
-                    "Learn about scholarships including PMSSS, state merit awards, and financial assistance.",
-                    "Receive expert advice on admission timelines, eligibility criteria, and career pathways."
-                ]
-            },
-            {
-                "summary": "Welcome to EdVise! 🎓 Your trusted companion for education and career decisions in J&K.",
-                "points": [
-                    "Ask me about any career field - from engineering to medicine, arts to commerce.",
-                    "Get updated information on competitive exams, dates, syllabus, and cut-offs.",
-                    "Find the perfect college match based on your preferences and qualifications.",
-                    "Discover government schemes, scholarships, and funding opportunities for students.",
-                    "Plan your academic journey with step-by-step guidance and expert recommendations."
-                ]
-            },
-            {
-                "summary": "Hi there! 🌟 I'm here to help you make informed decisions about your future in J&K.",
-                "points": [
-                    "Share your interests and I'll suggest suitable career paths and opportunities.",
-                    "Get comprehensive exam guidance including NEET, JEE, and state-level tests.",
-                    "Explore colleges in Srinagar, Jammu, and across J&K with detailed information.",
-                    "Learn about PMSSS and other scholarship programs available for J&K students.",
-                    "Receive personalized advice on courses, admissions, and career planning."
-                ]
-            }
-        ]
-        
-        selected_greeting = random.choice(greetings)
-        
-        return {
-            "status": "success",
-            "queryType": "greeting",
-            "response": {
-                "summary": selected_greeting["summary"],
-                "points": selected_greeting["points"],
-                "wordCount": len(' '.join(selected_greeting["points"] + [selected_greeting["summary"]]).split())
-            }
-        }
-
-    def determine_query_type(message):
-        """Determine the type of career query"""
-        message_lower = message.lower()
-        
-        if any(exam in message_lower for exam in ['neet', 'jee', 'cuet', 'jkcet', 'upsc']):
-            return 'exam_guidance'
-        elif any(word in message_lower for word in ['college', 'university', 'admission']):
-            return 'college_guidance'
-        elif any(word in message_lower for word in ['scholarship', 'fee', 'financial']):
-            return 'scholarship_guidance'
-        elif any(word in message_lower for word in ['career', 'job', 'profession']):
-            return 'career_guidance'
-        else:
-            return 'general_education'
-
-    def format_career_response(ai_response, query_type, word_count):
-        """Format AI response into structured JSON format"""
-        # Split the response into points
-        lines = [line.strip() for line in ai_response.split('\n') if line.strip()]
-        points = []
-        summary = ""
-        
-        # Extract summary (first non-empty line or paragraph)
-        if lines:
-            summary = lines[0]
-            
-        # Extract points from the response
-        for line in lines[1:]:
-            if line and (line.startswith(('-', '•', '*')) or 'point' in line.lower() or len(line) > 20):
-                # Clean up the point text
-                point = line.lstrip('-•* ').strip()
-                if len(point) > 10:  # Only add substantial points
-                    points.append(point)
-        
-        # If no clear points found, create them from sentences
-        if len(points) < 3:
-            sentences = ai_response.replace('\n', ' ').split('. ')
-            points = [sent.strip() + '.' for sent in sentences if len(sent.strip()) > 20][:5]
-        
-        # Ensure we have 3-5 points
-        if len(points) > 5:
-            points = points[:5]
-        elif len(points) < 3:
-            # Add generic helpful points if needed
-            points.extend([
-                "Consider consulting with career counselors for personalized guidance.",
-                "Research thoroughly about admission requirements and deadlines.",
-                "Explore government schemes and scholarships available in J&K."
-            ])
-            points = points[:5]
-        
-        return {
-            "status": "success",
-            "queryType": query_type,
-            "response": {
-                "summary": summary or "Here is the career guidance you requested.",
-                "points": points,
-                "wordCount": word_count
-            }
-        }
-
-    def count_words(text):
-        """Count words in text"""
-        return len(text.split())
+    @app.route('/api/notifications/unread-count')
+    @login_required
+    def notifications_unread_count():
+        # Polled by the navbar badge; answered from the partial unread index
+        count = db.session.query(db.func.count(Notification.id)) \
+            .filter_by(user_id=current_user.id, is_read=False).scalar()
+        response = jsonify({'unread': count})
+        response.headers['Cache-Control'] = 'private, no-cache'
+        return response
 
     @app.route('/api/chat', methods=['POST'])
     def chat_api():
         data = request.get_json(silent=True) or {}
         user_message = (data.get('message') or '').strip()
-        if not user_message:
-            return jsonify({"error": "message is required"}), 400
-        
-        # Check if it's a greeting first
-        if is_greeting_query(user_message):
-            return jsonify(generate_greeting_response())
-        
-        # Check if query is career-related
-        if not is_career_related_query(user_message):
-            return jsonify({
-                "status": "error",
-                "queryType": "unsupported",
-                "response": {
-                    "message": "Sorry, I can only provide answers related to career guidance and education in Jammu & Kashmir. Feel free to ask about careers, exams, colleges, or scholarships!"
-                }
-            })
-        
-        api_key = os.environ.get('GEMINI_API_KEY')
-        if not api_key:
-            return jsonify({"error": "Server not configured: GEMINI_API_KEY missing"}), 500
-
-        # Determine query type
-        query_type = determine_query_type(user_message)
-        
-        # Enhanced prompt for structured career guidance
-        system_prompt = f"""You are a career guidance counselor specializing in education and career opportunities in Jammu & Kashmir, India. 
-        
-        User Query: {user_message}
-        
-        Please provide a comprehensive response in exactly 150-250 words that includes:
-        
-        1. A brief summary sentence
-        2. 4-5 specific actionable points related to:
-           - Relevant exams (NEET, JKCET, CUET, JEE, etc.)
-           - Government and private colleges in J&K
-           - Available scholarships (PMSSS, state merit, etc.)
-           - Career pathways and opportunities
-           - Admission timelines and preparation tips
-        
-        Format your response as:
-        
-        [Summary sentence]
-        
-        • Point 1: [Specific guidance]
-        • Point 2: [Specific guidance]  
-        • Point 3: [Specific guidance]
-        • Point 4: [Specific guidance]
-        • Point 5: [Specific guidance]
-        
-        Focus specifically on J&K education system, local colleges, and opportunities available to students in the region.
-        Keep the response practical, actionable, and within 150-250 words."""
-
-        payload = {
-            "contents": [
-                {
-                    "parts": [
-                        {"text": system_prompt}
-                    ]
-                }
-            ]
-        }
-
-        import requests
-        model = os.environ.get('GEMINI_MODEL', 'gemini-2.0-flash')
-        url = f"https://generativelanguage.googleapis.com/v1beta/models/{model}:generateContent"
-        try:
-            headers = {
-                'Content-Type': 'application/json',
-                'X-goog-api-key': api_key,
-            }
-            r = requests.post(url, json=payload, headers=headers, timeout=25)
-            if r.status_code >= 400:
-                return jsonify({"error": f"Upstream {r.status_code}", "details": r.text[:500]}), 502
-            resp = r.json()
-            parts = (resp.get('candidates') or [{}])[0].get('content', {}).get('parts', [])
-            reply = "".join(p.get('text', '') for p in parts).strip()
-            if not reply:
-                return jsonify({"error": "Empty response from model", "raw": resp}), 502
-            
-            # Count words and format response
-            word_count = count_words(reply)
-            formatted_response = format_career_response(reply, query_type, word_count)
-            
-            return jsonify(formatted_response)
-            
-        except requests.Timeout:
-            return jsonify({"error": "Upstream timeout"}), 504
-        except Exception as e:
-            return jsonify({"error": "Server error", "details": str(e)}), 500
+        body, status = answer_chat(user_message)
+        return jsonify(body), status
 
+    @app.route('/api/chat/stream', methods=['POST'])
+    def chat_stream_api():
+        data = request.get_json(silent=True) or {}
+        user_message = (data.get('message') or '').strip()
+        return Response(stream_chat(user_message), mimetype='text/event-stream', headers=SSE_HEADERS)
 
+    @app.route('/api/chat/cache-stats')
+    @staff_required
+    def chat_cache_stats():
+        return jsonify(response_cache.stats())
 
+    @app.route('/api/chat/upstream-stats')
+    @staff_required
+    def chat_upstream_stats():
+        return jsonify(gateway_stats())
@@ -6,7 +6,7 @@ Simple startup script for the Flask application
 
 import os
 import sys
-from app import app
+from app import create_app
 
 if __name__ == '__main__':
     # Set environment variables if not already set
@@ -16,6 +16,11 @@ if __name__ == '__main__':
     if not os.environ.get('DATABASE_URL'):
         os.environ['DATABASE_URL'] = 'sqlite:///career_advisor.db'
     
+    # Create tables and sample data on first run
+    os.environ.setdefault('AUTO_BOOTSTRAP', '1')
+    
+    app = create_app()
+    
     print("🚀 Starting EdVice - Career & Education Advisor")
     print("📍 Server will be available at: http://localhost:5000")
     print("🛑 Press Ctrl+C to stop the server")
@@ -0,0 +1,146 @@
+from typing import NamedTuple, Optional
+from datetime import datetime
+from sqlalchemy import select
+from extensions import db
+from models import Scholarship, ScholarshipCategory, ScholarshipClass, User
+from catalog_cache import CatalogCache, track_catalog
+
+# In-memory scholarship matching.
+#
+# Active scholarships are grouped once per catalog version into lists keyed
+# by (category, class_level), so matching a user is a dict lookup plus the
+# optional marks / income checks instead of loading and decoding every row.
+
+OPEN_CATEGORY = 'General'  # scholarships open to General accept every category
+
+track_catalog(Scholarship, 'scholarship')
+track_catalog(ScholarshipCategory, 'scholarship')
+track_catalog(ScholarshipClass, 'scholarship')
+
+
+class ScholarshipSummary(NamedTuple):
+    id: int
+    name: str
+    provider: Optional[str]
+    amount: Optional[str]
+    min_marks: Optional[float]
+    max_family_income: Optional[int]
+    application_deadline: Optional[datetime]
+
+
+class MatchIndex(NamedTuple):
+    by_key: dict  # (category, class_level) -> tuple of ScholarshipSummary
+    open_by_class: dict  # class_level -> scholarships open to every category
+
+
+def _build_index():
+    scholarships = Scholarship.query.filter_by(is_active=True).order_by(Scholarship.id).all()
+
+    categories = set()
+    entries = []
+    for scholarship in scholarships:
+        summary = ScholarshipSummary(
+            id=scholarship.id,
+            name=scholarship.name,
+            provider=scholarship.provider,
+            amount=scholarship.amount,
+            min_marks=scholarship.min_marks,
+            max_family_income=scholarship.max_family_income,
+            application_deadline=scholarship.application_deadline,
+        )
+        cats = set(scholarship.category_list)
+        categories |= cats
+        entries.append((summary, cats, scholarship.class_list))
+
+    by_key = {}
+    open_by_class = {}
+    for summary, cats, classes in entries:
+        open_to_all = OPEN_CATEGORY in cats
+        for class_level in classes:
+            if open_to_all:
+                open_by_class.setdefault(class_level, []).append(summary)
+            for category in categories:
+                if open_to_all or category in cats:
+                    by_key.setdefault((category, class_level), []).append(summary)
+
+    return MatchIndex(
+        by_key={key: tuple(value) for key, value in by_key.items()},
+        open_by_class={key: tuple(value) for key, value in open_by_class.items()},
+    )
+
+
+_index = CatalogCache('scholarship', _build_index)
+
+
+def _candidates(index, category, class_level):
+    found = index.by_key.get((category, class_level))
+    if found is None:
+        # Unknown category: only scholarships open to everyone apply
+        found = index.open_by_class.get(class_level, ())
+    return found
+
+
+def _passes_thresholds(summary, marks, family_income):
+    if marks is not None and summary.min_marks is not None and marks < summary.min_marks:
+        return False
+    if family_income is not None and summary.max_family_income is not None \
+            and family_income > summary.max_family_income:
+        return False
+    return True
+
+
+def match_scholarships(category, class_level, marks=None, family_income=None):
+    """Active scholarships a student with this profile is eligible for.
+
+    marks (percentage) and family_income are optional; when omitted the
+    corresponding thresholds are not applied.
+    """
+    candidates = _candidates(_index.get(), category, class_level)
+    if marks is None and family_income is None:
+        return list(candidates)
+    return [s for s in candidates if _passes_thresholds(s, marks, family_income)]
+
+
+def match_users(users):
+    """Match many students in one pass over a single index snapshot.
+
+    `users` is an iterable of objects or dicts with id, category and
+    class_level, and optionally marks and family_income.
+    Returns {user_id: [ScholarshipSummary, ...]}.
+    """
+    index = _index.get()
+    results = {}
+    for user in users:
+        candidates = _candidates(index, _field(user, 'category'), _field(user, 'class_level'))
+        marks, family_income = _field(user, 'marks'), _field(user, 'family_income')
+        if marks is None and family_income is None:
+            results[_field(user, 'id')] = list(candidates)
+        else:
+            results[_field(user, 'id')] = [s for s in candidates if _passes_thresholds(s, marks, family_income)]
+    return results
+
+
+def _field(user, name):
+    if isinstance(user, dict):
+        return user.get(name)
+    return getattr(user, name, None)
+
+
+def eligible_users_query(scholarship):
+    """SELECT of student user ids eligible for a scholarship (the reverse lookup).
+
+    Returned as a statement so callers can stream it or feed it into an
+    INSERT ... SELECT without materialising the users in Python.
+    """
+    categories = scholarship.category_list
+    classes = scholarship.class_list
+
+    stmt = select(User.id).where(User.role == 'student', User.class_level.in_(classes))
+    if OPEN_CATEGORY not in categories:
+        stmt = stmt.where(User.category.in_(categories))
+    return stmt.order_by(User.id)
+
+
+def eligible_user_ids(scholarship):
+    """Ids of every student eligible for a scholarship, e.g. to notify them of a new scheme."""
+    return list(db.session.execute(eligible_users_query(scholarship)).scalars())
@@ -0,0 +1,151 @@
+import re
+from sqlalchemy import text, or_, literal_column, func
+from extensions import db
+from models import College
+
+# Full-text search over the College catalog.
+#
+# SQLite: an external-content FTS5 table (college_fts) kept in sync by
+# triggers on the college table, so ORM writes, bulk statements and the
+# CSV importer all update the index without any Python-side hooks.
+# PostgreSQL: a GIN expression index over a weighted tsvector of the same
+# columns, which the database maintains on every write.
+
+FTS_TABLE = 'college_fts'
+SEARCH_COLUMNS = ('name', 'city', 'state', 'type', 'courses')
+
+# bm25 column weights, in SEARCH_COLUMNS order (name matches rank highest)
+_BM25_WEIGHTS = '10.0, 2.0, 3.0, 3.0, 1.0'
+
+_SQLITE_DDL = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        name, city, state, type, courses,
+        content='college', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS college_fts_ai AFTER INSERT ON college BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, name, city, state, type, courses)
+        VALUES (new.id, new.name, new.city, new.state, new.type, new.courses);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS college_fts_ad AFTER DELETE ON college BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, city, state, type, courses)
+        VALUES ('delete', old.id, old.name, old.city, old.state, old.type, old.courses);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS college_fts_au AFTER UPDATE OF name, city, state, type, courses ON college BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, city, state, type, courses)
+        VALUES ('delete', old.id, old.name, old.city, old.state, old.type, old.courses);
+        INSERT INTO {FTS_TABLE}(rowid, name, city, state, type, courses)
+        VALUES (new.id, new.name, new.city, new.state, new.type, new.courses);
+    END""",
+]
+
+# Must be spelled identically in the index and in queries for the planner to use it
+_PG_DOCUMENT = (
+    "setweight(to_tsvector('simple'::regconfig, coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('simple'::regconfig, coalesce(state, '') || ' ' || coalesce(type, '')), 'B') || "
+    "setweight(to_tsvector('simple'::regconfig, coalesce(city, '')), 'C') || "
+    "setweight(to_tsvector('simple'::regconfig, coalesce(courses, '')), 'D')"
+)
+
+_PG_DDL = [
+    f"CREATE INDEX IF NOT EXISTS ix_college_search ON college USING gin (({_PG_DOCUMENT}))",
+]
+
+# Engines on which the index is known to exist (keyed by URL)
+_ready = {}
+
+
+def _dialect():
+    return db.engine.dialect.name
+
+
+def ensure_search_index():
+    """Create the search index and its sync triggers if missing.
+
+    Returns True when a native index is available for the current engine.
+    """
+    key = str(db.engine.url)
+    dialect = _dialect()
+    try:
+        with db.engine.begin() as conn:
+            if dialect == 'sqlite':
+                existed = conn.execute(
+                    text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+                    {'name': FTS_TABLE}
+                ).first() is not None
+                for statement in _SQLITE_DDL:
+                    conn.execute(text(statement))
+                if not existed:
+                    # Backfill rows that were written before the index existed
+                    conn.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+            elif dialect == 'postgresql':
+                for statement in _PG_DDL:
+                    conn.execute(text(statement))
+            else:
+                _ready[key] = False
+                return False
+    except Exception:
+        # e.g. SQLite built without FTS5 - fall back to LIKE matching
+        _ready[key] = False
+        return False
+
+    _ready[key] = True
+    return True
+
+
+def rebuild_search_index():
+    """Re-index every college from scratch."""
+    if not ensure_search_index():
+        return False
+    if _dialect() == 'sqlite':
+        with db.engine.begin() as conn:
+            conn.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+    else:
+        with db.engine.begin() as conn:
+            conn.execute(text('REINDEX INDEX ix_college_search'))
+    return True
+
+
+def search_available():
+    key = str(db.engine.url)
+    if key not in _ready:
+        ensure_search_index()
+    return _ready[key]
+
+
+def tokenize(search_text):
+    return re.findall(r'\w+', (search_text or '').lower())
+
+
+def apply_search(query, search_text, ranked=True):
+    """Restrict a College query to rows matching search_text.
+
+    Every token must match (as a prefix) somewhere in name, city, state, type
+    or course names. With ranked=True the query is ordered by relevance.
+    """
+    tokens = tokenize(search_text)
+    if not tokens:
+        return query
+
+    if not search_available():
+        pattern = f'%{search_text.strip()}%'
+        return query.filter(or_(College.name.ilike(pattern), College.city.ilike(pattern)))
+
+    if _dialect() == 'sqlite':
+        match = ' '.join(f'"{token}"*' for token in tokens)
+        matched = text(
+            f"SELECT rowid AS id, bm25({FTS_TABLE}, {_BM25_WEIGHTS}) AS score "
+            f"FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :match"
+        ).bindparams(match=match).columns(id=db.Integer, score=db.Float).subquery('college_match')
+        query = query.join(matched, matched.c.id == College.id)
+        if ranked:
+            # bm25() is lower-is-better
+            query = query.order_by(None).order_by(matched.c.score.asc(), College.id.asc())
+        return query
+
+    document = literal_column(f'({_PG_DOCUMENT})')
+    tsquery = func.to_tsquery(literal_column("'simple'::regconfig"), ' & '.join(f'{token}:*' for token in tokens))
+    query = query.filter(document.op('@@')(tsquery))
+    if ranked:
+        query = query.order_by(None).order_by(func.ts_rank(document, tsquery).desc(), College.id.asc())
+    return query
@@ -1,6 +1,7 @@
 // Minimal floating chat widget that talks to /api/chat
 (function(){
-  const logoPath = '/static/images/MainLogo.png';
+  // Reuse the navbar logo's (possibly fingerprinted) URL so the image is fetched once
+  const logoPath = document.querySelector('.navbar-logo')?.getAttribute('src') || '/static/images/MainLogo.png';
 
   // Floating toggle button
   const btn = document.createElement('button');
@@ -103,6 +104,85 @@
     return bubble;
   }
 
+  function showReply(data, history){
+    // Handle structured response
+    if (data.status === 'success' && data.response) {
+      addMessage('assistant', data.response, true);
+      history.push({role:'assistant', content: data.response.summary || 'Career guidance provided'});
+    } else if (data.status === 'error' && data.response && data.response.message) {
+      addMessage('assistant', data.response.message);
+      history.push({role:'assistant', content: data.response.message});
+    } else if (data.reply) {
+      // Fallback to old format if somehow returned
+      addMessage('assistant', data.reply);
+      history.push({role:'assistant', content: data.reply});
+    } else {
+      addMessage('assistant', 'Sorry, I couldn\'t process your request properly.');
+    }
+  }
+
+  async function postChat(text, history){
+    const res = await fetch('/api/chat', {
+      method: 'POST',
+      headers: {'Content-Type': 'application/json'},
+      body: JSON.stringify({message:text, history})
+    });
+    let data = {};
+    try { data = await res.json(); } catch {}
+    if(!res.ok) throw new Error((data && data.error) ? data.error : `HTTP ${res.status}`);
+    return data;
+  }
+
+  // Server-Sent Events from /api/chat/stream: "token" events carry text as it
+  // is generated, the final "done" event the structured reply. Resolves to
+  // null when streaming is unavailable so the caller can fall back.
+  async function streamChat(text, history, bubble){
+    if (!window.ReadableStream || !window.TextDecoder) return null;
+    let res;
+    try {
+      res = await fetch('/api/chat/stream', {
+        method: 'POST',
+        headers: {'Content-Type': 'application/json', 'Accept': 'text/event-stream'},
+        body: JSON.stringify({message:text, history})
+      });
+    } catch { return null; }
+    const type = res.headers.get('Content-Type') || '';
+    if (!res.ok || !res.body || type.indexOf('text/event-stream') === -1) return null;
+
+    const reader = res.body.getReader();
+    const decoder = new TextDecoder();
+    const body = panel.querySelector('#edvise-body');
+    let buffer = '';
+    let streamed = '';
+    for (;;) {
+      const {value, done} = await reader.read();
+      if (done) break;
+      buffer += decoder.decode(value, {stream: true});
+      let split;
+      while ((split = buffer.indexOf('\n\n')) !== -1) {
+        const block = buffer.slice(0, split);
+        buffer = buffer.slice(split + 2);
+        let event = 'message', payload = '';
+        block.split('\n').forEach(line => {
+          if (line.startsWith('event:')) event = line.slice(6).trim();
+          else if (line.startsWith('data:')) payload += line.slice(5).trim();
+        });
+        if (!payload) continue;
+        const data = JSON.parse(payload);
+        if (event === 'token') {
+          streamed += data.text;
+          bubble.textContent = streamed;
+          body.scrollTop = body.scrollHeight;
+        } else if (event === 'done') {
+          return data;
+        } else if (event === 'error') {
+          throw new Error(data.error || `HTTP ${data.status}`);
+        }
+      }
+    }
+    throw new Error('Connection closed before the reply finished');
+  }
+
   document.addEventListener('DOMContentLoaded', () => {
     document.body.appendChild(btn);
     document.body.appendChild(panel);
@@ -137,32 +217,13 @@
       const thinkingBubble = addThinking();
 
       try{
-        const res = await fetch('/api/chat', {
-          method: 'POST',
-          headers: {'Content-Type': 'application/json'},
-          body: JSON.stringify({message:text, history})
-        });
-        let data = {};
-        try { data = await res.json(); } catch {}
-        if(!res.ok) throw new Error((data && data.error) ? data.error : `HTTP ${res.status}`);
-        
+        // Stream tokens into the thinking bubble when possible, else wait for the full reply
+        let data = await streamChat(text, history, thinkingBubble);
+        if (data === null) data = await postChat(text, history);
+
         // Remove thinking bubble
         thinkingBubble.parentNode.remove();
-        
-        // Handle structured response
-        if (data.status === 'success' && data.response) {
-          addMessage('assistant', data.response, true);
-          history.push({role:'assistant', content: data.response.summary || 'Career guidance provided'});
-        } else if (data.status === 'error' && data.response && data.response.message) {
-          addMessage('assistant', data.response.message);
-          history.push({role:'assistant', content: data.response.message});
-        } else if (data.reply) {
-          // Fallback to old format if somehow returned
-          addMessage('assistant', data.reply);
-          history.push({role:'assistant', content: data.reply});
-        } else {
-          addMessage('assistant', 'Sorry, I couldn\'t process your request properly.');
-        }
+        showReply(data, history);
       }catch(err){
         thinkingBubble.textContent = 'Sorry, I had trouble answering that. (' + err.message + ')';
         console.error(err);
@@ -0,0 +1,33 @@
+// Navbar unread-notification badge: polls the cheap unread-count endpoint while the tab is visible
+(function(){
+  const POLL_MS = 60000;
+  let timer = null;
+
+  function render(badge, count){
+    badge.textContent = count > 99 ? '99+' : String(count);
+    badge.classList.toggle('d-none', count === 0);
+  }
+
+  function refresh(badge){
+    fetch(badge.dataset.countUrl, { credentials: 'same-origin', headers: { 'Accept': 'application/json' } })
+      .then(res => res.ok ? res.json() : null)
+      .then(data => { if (data) render(badge, data.unread || 0); })
+      .catch(() => {});
+  }
+
+  function schedule(badge){
+    clearInterval(timer);
+    timer = null;
+    if (document.visibilityState === 'visible'){
+      refresh(badge);
+      timer = setInterval(() => refresh(badge), POLL_MS);
+    }
+  }
+
+  document.addEventListener('DOMContentLoaded', function(){
+    const badge = document.getElementById('notificationBadge');
+    if (!badge || !badge.dataset.countUrl) return;
+    schedule(badge);
+    document.addEventListener('visibilitychange', () => schedule(badge));
+  });
+})();
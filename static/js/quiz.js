@@ -492,13 +492,237 @@ const QuizHelpers = {
     }
 };
 
+// Client-side quiz: fetches the whole question set once from /api/quiz/questions,
+// keeps the answers in memory and posts them in a single request to /api/quiz/score.
+// The server-rendered /quiz/question/<n> pages remain the no-JavaScript fallback.
+const CAREER_ICONS = {
+    Technology: 'cpu',
+    Healthcare: 'heart',
+    Government: 'flag',
+    Education: 'book-open',
+    Business: 'briefcase'
+};
+
+class ClientQuiz {
+    constructor(root, resultsRoot) {
+        this.root = root;
+        this.resultsRoot = resultsRoot;
+        this.questions = [];
+        this.answers = {};
+        this.index = 0;
+
+        this.root.querySelector('[data-quiz-next]').addEventListener('click', () => this.next());
+        this.root.querySelector('[data-quiz-back]').addEventListener('click', () => this.show(this.index - 1));
+        this.root.querySelector('[data-quiz-options]').addEventListener('click', (e) => {
+            const option = e.target.closest('[data-value]');
+            if (option) this.choose(option.dataset.value);
+        });
+        document.addEventListener('keydown', (e) => this.handleKey(e));
+    }
+
+    start() {
+        return fetch(this.root.dataset.questionsUrl, { headers: { 'Accept': 'application/json' } })
+            .then(res => {
+                if (!res.ok) throw new Error(`questions request failed: ${res.status}`);
+                return res.json();
+            })
+            .then(data => {
+                this.questions = data.questions;
+                this.answers = {};
+                document.getElementById('quizIntro').classList.add('d-none');
+                this.root.classList.remove('d-none');
+                this.show(0);
+            });
+    }
+
+    get current() {
+        return this.questions[this.index];
+    }
+
+    show(index) {
+        if (index < 0 || index >= this.questions.length) return;
+        this.index = index;
+        const question = this.current;
+        const total = this.questions.length;
+        const percent = Math.round((index + 1) / total * 100);
+
+        this.root.querySelector('[data-quiz-position]').textContent = `Question ${index + 1} of ${total}`;
+        this.root.querySelector('[data-quiz-percent]').textContent = `${percent}% Complete`;
+        QuizHelpers.animateProgress(percent);
+        this.root.querySelector('[data-quiz-question]').textContent = question.question;
+        this.root.querySelector('[data-quiz-back]').classList.toggle('invisible', index === 0);
+        this.root.querySelector('[data-quiz-next]').textContent = index + 1 < total ? 'Next Question' : 'View Results';
+        this.hideError();
+        this.renderOptions(question);
+        this.refreshSelection();
+        QuizHelpers.scrollToTop();
+    }
+
+    renderOptions(question) {
+        const container = this.root.querySelector('[data-quiz-options]');
+        container.replaceChildren();
+
+        if (question.type === 'mcq') {
+            question.options.forEach(option => {
+                container.appendChild(this.optionButton('btn option-btn', option.value, option.text));
+            });
+        } else if (question.type === 'likert') {
+            const scale = document.createElement('div');
+            scale.className = 'likert-scale';
+            for (let level = 1; level <= question.scale; level++) {
+                const button = this.optionButton('btn btn-outline-primary likert-option', String(level), String(level));
+                const label = document.createElement('small');
+                label.className = 'd-block mt-1';
+                label.textContent = question.labels[level - 1];
+                button.appendChild(label);
+                scale.appendChild(button);
+            }
+            container.appendChild(scale);
+        } else {
+            const options = document.createElement('div');
+            options.className = 'yes-no-options';
+            options.appendChild(this.optionButton('btn btn-outline-success yes-no-btn', 'yes', 'Yes'));
+            options.appendChild(this.optionButton('btn btn-outline-danger yes-no-btn', 'no', 'No'));
+            container.appendChild(options);
+        }
+    }
+
+    optionButton(className, value, text) {
+        const button = document.createElement('button');
+        button.type = 'button';
+        button.className = className;
+        button.dataset.value = value;
+        button.textContent = text;
+        return button;
+    }
+
+    choose(value) {
+        this.answers[this.current.id] = value;
+        this.refreshSelection();
+    }
+
+    refreshSelection() {
+        const answer = this.answers[this.current.id];
+        this.root.querySelectorAll('[data-quiz-options] [data-value]').forEach(option => {
+            const selected = option.dataset.value === answer;
+            option.classList.toggle('selected', selected);
+            option.classList.toggle('active', selected);
+        });
+        this.root.querySelector('[data-quiz-next]').disabled = answer === undefined;
+    }
+
+    next() {
+        if (this.answers[this.current.id] === undefined) return;
+        if (this.index + 1 < this.questions.length) {
+            this.show(this.index + 1);
+            QuizHelpers.showEncouragement(this.index, this.questions.length);
+        } else {
+            this.submit();
+        }
+    }
+
+    handleKey(e) {
+        if (this.root.classList.contains('d-none') || !this.current) return;
+        if (e.key === 'Enter') {
+            e.preventDefault();
+            this.next();
+            return;
+        }
+        const options = this.root.querySelectorAll('[data-quiz-options] [data-value]');
+        const position = parseInt(e.key, 10);
+        if (position >= 1 && position <= options.length) {
+            this.choose(options[position - 1].dataset.value);
+        } else if (this.current.type === 'yes_no' && (e.key === 'y' || e.key === 'n')) {
+            this.choose(e.key === 'y' ? 'yes' : 'no');
+        }
+    }
+
+    submit() {
+        const nextBtn = this.root.querySelector('[data-quiz-next]');
+        nextBtn.disabled = true;
+        nextBtn.innerHTML = '<span class="spinner me-2"></span>Scoring...';
+
+        fetch(this.root.dataset.scoreUrl, {
+            method: 'POST',
+            credentials: 'same-origin',
+            headers: { 'Content-Type': 'application/json', 'Accept': 'application/json' },
+            body: JSON.stringify({ answers: this.answers })
+        })
+            .then(res => res.json().then(data => ({ ok: res.ok, data })))
+            .then(({ ok, data }) => {
+                if (!ok) throw new Error(data.error || 'Could not score the quiz');
+                this.root.classList.add('d-none');
+                this.renderResults(data.recommendations);
+            })
+            .catch(err => {
+                nextBtn.textContent = 'View Results';
+                nextBtn.disabled = false;
+                this.showError(err.message);
+            });
+    }
+
+    renderResults(recommendations) {
+        const list = this.resultsRoot.querySelector('[data-results-list]');
+        list.replaceChildren();
+        this.resultsRoot.querySelector('[data-results-empty]').classList.toggle('d-none', recommendations.length > 0);
+
+        recommendations.forEach(career => {
+            const card = this.resultsRoot.querySelector('#resultCardTemplate').content.cloneNode(true);
+            card.querySelector('[data-career-icon]').setAttribute('data-feather', CAREER_ICONS[career.category] || 'star');
+            card.querySelector('[data-career-name]').textContent = career.name;
+            card.querySelector('[data-career-match]').textContent = `${career.match_percentage}%`;
+            card.querySelector('[data-career-description]').textContent = career.description;
+            const roles = card.querySelector('[data-career-roles]');
+            (career.job_roles || []).forEach(role => {
+                const badge = document.createElement('span');
+                badge.className = 'badge bg-light text-dark';
+                badge.textContent = role;
+                roles.appendChild(badge);
+            });
+            const salary = card.querySelector('[data-career-salary]');
+            if (career.salary_range) {
+                salary.querySelector('span').textContent = career.salary_range;
+            } else {
+                salary.remove();
+            }
+            list.appendChild(card);
+        });
+
+        this.resultsRoot.classList.remove('d-none');
+        if (window.feather) feather.replace();
+        QuizHelpers.scrollToTop();
+    }
+
+    showError(message) {
+        const error = this.root.querySelector('[data-quiz-error]');
+        error.textContent = message;
+        error.classList.remove('d-none');
+    }
+
+    hideError() {
+        this.root.querySelector('[data-quiz-error]').classList.add('d-none');
+    }
+}
+
 // Initialize quiz manager when DOM is loaded
 document.addEventListener('DOMContentLoaded', () => {
-    // Only initialize on quiz pages
-    if (document.getElementById('quizForm') || document.querySelector('.quiz-progress')) {
+    // Only initialize on server-rendered question pages
+    if (document.getElementById('quizForm')) {
         window.quizManager = new QuizManager();
     }
 
+    // Client-side quiz on the introduction page; the start link falls back to
+    // the server-rendered questions if the question set cannot be loaded
+    const clientRoot = document.getElementById('clientQuiz');
+    const startLink = document.getElementById('startQuiz');
+    if (clientRoot && startLink && window.fetch) {
+        window.clientQuiz = new ClientQuiz(clientRoot, document.getElementById('clientQuizResults'));
+        startLink.addEventListener('click', (e) => {
+            e.preventDefault();
+            window.clientQuiz.start().catch(() => { window.location.href = startLink.href; });
+        });
+    }
+
     // Add smooth scrolling to top after page transitions
     if (document.querySelector('.question-card')) {
         QuizHelpers.scrollToTop();
@@ -529,5 +753,5 @@ function selectYesNo(value) {
 
 // Export for module usage
 if (typeof module !== 'undefined' && module.exports) {
-    module.exports = { QuizManager, QuizHelpers };
+    module.exports = { QuizManager, QuizHelpers, ClientQuiz };
 }
@@ -0,0 +1,227 @@
+import gzip
+import hashlib
+import importlib.util
+import json
+import mimetypes
+import os
+import re
+import shutil
+from typing import NamedTuple, Optional
+from flask import current_app, request, send_from_directory
+
+# Fingerprinted, precompressed static assets.
+#
+# `flask build-assets` copies the stylesheets, scripts and images under
+# static/ into static/dist/ as <name>.<content hash>.<ext>, minifying CSS and
+# JS first (with rcssmin / rjsmin), writes .gz and .br (brotli) copies of the
+# text assets, and records everything in static/dist/manifest.json. Those
+# packages are in requirements.txt; without them the build still runs but
+# warns about each step it degrades or skips.
+#
+# When a manifest exists, url_for('static', filename='css/style.css') emits
+# the fingerprinted URL, and the static view serves those files with a
+# far-future immutable Cache-Control, picking the precompressed copy the
+# client accepts. Without a build (local development) assets are served from
+# their original paths as before. Restart the app after a build so every
+# worker reads the new manifest.
+
+BUILD_DIR = 'dist'
+MANIFEST_NAME = 'manifest.json'
+ASSET_DIRS = ('css', 'js', 'images')
+ASSET_SUFFIXES = {'.css', '.js', '.svg', '.png', '.jpg', '.jpeg', '.gif', '.webp', '.ico'}
+COMPRESSIBLE_SUFFIXES = {'.css', '.js', '.svg'}
+HASH_LENGTH = 12
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600  # seconds
+
+# Preferred first; file suffix of the precompressed copy for each Content-Encoding
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+
+class BuiltAsset(NamedTuple):
+    source: str  # path under static/, as passed to url_for('static', filename=...)
+    path: str  # fingerprinted path under static/
+    size: int  # original bytes
+    built_size: int  # after minification
+    gzip_size: Optional[int]
+    brotli_size: Optional[int]
+
+
+# Minification (rcssmin / rjsmin when installed)
+
+# String literals and comments; split() puts them at the odd indexes
+_CSS_TOKENS = re.compile(r'("(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\'|/\*.*?\*/)', re.S)
+# Not ':' -- "a :hover" and "a:hover" are different selectors
+_CSS_PUNCTUATION = re.compile(r'\s*([{};,>])\s*')
+
+
+def _minify_css_fallback(text):
+    """Strip comments and collapse whitespace, leaving string literals untouched."""
+    out, code = [], []
+
+    def flush():
+        segment = re.sub(r'\s+', ' ', ''.join(code))
+        out.append(_CSS_PUNCTUATION.sub(r'\1', segment).replace(';}', '}'))
+        code.clear()
+
+    for index, part in enumerate(_CSS_TOKENS.split(text)):
+        if index % 2 == 0:
+            code.append(part)
+        elif part.startswith('/*'):
+            code.append(' ')
+        else:
+            flush()
+            out.append(part)
+    flush()
+    return ''.join(out).strip()
+
+
+def minify_css(text):
+    try:
+        import rcssmin
+    except ImportError:
+        return _minify_css_fallback(text)
+    return rcssmin.cssmin(text)
+
+
+def minify_js(text):
+    # JavaScript cannot be tokenized safely with regular expressions (regex
+    # literals, template strings), so without rjsmin it is only compressed
+    try:
+        import rjsmin
+    except ImportError:
+        return text
+    return rjsmin.jsmin(text)
+
+
+MINIFIERS = {'.css': minify_css, '.js': minify_js}
+
+
+def _compressors():
+    compressors = {'gzip': lambda data: gzip.compress(data, compresslevel=9, mtime=0)}
+    try:
+        import brotli
+    except ImportError:
+        pass
+    else:
+        compressors['br'] = lambda data: brotli.compress(data, quality=11)
+    return compressors
+
+
+# Build
+
+# Build packages and what the build loses without each of them
+BUILD_PACKAGES = (
+    ('rcssmin', True, 'CSS is only minified by the basic built-in fallback'),
+    ('rjsmin', True, 'JavaScript is not minified, only compressed'),
+    ('brotli', False, 'no .br copies are written'),
+)
+
+
+def missing_build_packages(minify=True):
+    """(package, consequence) for each build package that is not installed"""
+    return [(package, consequence) for package, for_minify, consequence in BUILD_PACKAGES
+            if (minify or not for_minify) and importlib.util.find_spec(package) is None]
+
+def _asset_sources(static_folder):
+    for asset_dir in ASSET_DIRS:
+        for root, _, files in os.walk(os.path.join(static_folder, asset_dir)):
+            for name in sorted(files):
+                if os.path.splitext(name)[1].lower() in ASSET_SUFFIXES:
+                    yield os.path.relpath(os.path.join(root, name), static_folder).replace(os.sep, '/')
+
+
+def _write(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(data)
+
+
+def build_assets(static_folder, minify=True, clean=False):
+    """Fingerprint, minify and precompress the static assets; returns a BuiltAsset per file."""
+    build_root = os.path.join(static_folder, BUILD_DIR)
+    if clean and os.path.isdir(build_root):
+        shutil.rmtree(build_root)
+
+    compressors = _compressors()
+    built, manifest = [], {}
+    for source in _asset_sources(static_folder):
+        with open(os.path.join(static_folder, source), 'rb') as f:
+            data = f.read()
+        stem, suffix = os.path.splitext(source)
+        suffix = suffix.lower()
+        output = data
+        if minify and suffix in MINIFIERS:
+            output = MINIFIERS[suffix](data.decode('utf-8')).encode('utf-8')
+
+        digest = hashlib.sha256(output).hexdigest()[:HASH_LENGTH]
+        path = f'{BUILD_DIR}/{stem}.{digest}{suffix}'
+        _write(os.path.join(static_folder, path), output)
+
+        sizes = {}
+        if suffix in COMPRESSIBLE_SUFFIXES:
+            for encoding, file_suffix in ENCODINGS:
+                if encoding not in compressors:
+                    continue
+                compressed = compressors[encoding](output)
+                if len(compressed) < len(output):  # not worth serving otherwise
+                    _write(os.path.join(static_folder, path + file_suffix), compressed)
+                    sizes[encoding] = len(compressed)
+
+        manifest[source] = {'path': path, 'encodings': [encoding for encoding, _ in ENCODINGS if encoding in sizes]}
+        built.append(BuiltAsset(source, path, len(data), len(output), sizes.get('gzip'), sizes.get('br')))
+
+    _write(os.path.join(build_root, MANIFEST_NAME),
+           json.dumps(manifest, indent=2, sort_keys=True).encode('utf-8'))
+    return built
+
+
+# Serving
+
+class AssetManifest(NamedTuple):
+    paths: dict  # source path -> fingerprinted path
+    encodings: dict  # fingerprinted path -> available Content-Encodings, preferred first
+
+
+def load_manifest(static_folder):
+    try:
+        with open(os.path.join(static_folder, BUILD_DIR, MANIFEST_NAME)) as f:
+            entries = json.load(f)
+    except FileNotFoundError:
+        entries = {}
+    return AssetManifest(
+        paths={source: entry['path'] for source, entry in entries.items()},
+        encodings={entry['path']: tuple(entry['encodings']) for entry in entries.values()},
+    )
+
+
+def _fingerprint_static_urls(endpoint, values):
+    if endpoint == 'static':
+        path = current_app.extensions['static_assets'].paths.get(values.get('filename'))
+        if path:
+            values['filename'] = path
+
+
+def _serve_static(filename):
+    encodings = current_app.extensions['static_assets'].encodings.get(filename)
+    if encodings is None:
+        return current_app.send_static_file(filename)
+
+    accepted = request.accept_encodings
+    encoding = next((encoding for encoding in encodings if accepted[encoding]), None)
+    file_suffix = dict(ENCODINGS)[encoding] if encoding else ''
+    response = send_from_directory(current_app.static_folder, filename + file_suffix,
+                                   mimetype=mimetypes.guess_type(filename)[0],
+                                   max_age=IMMUTABLE_MAX_AGE)
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
+
+
+def init_static_assets(app):
+    """Load the build manifest and route url_for('static') and the static view through it."""
+    app.extensions['static_assets'] = load_manifest(app.static_folder)
+    app.url_defaults(_fingerprint_static_urls)
+    app.view_functions['static'] = _serve_static
@@ -0,0 +1,52 @@
+import pytest
+
+from chatbot import DEFAULT_QUERY_TYPE, classify_message
+
+
+@pytest.mark.parametrize('message', [
+    'examination dates',
+    'educational loans',
+    'professional courses',
+    'engineering colleges in Srinagar',
+    'scholarships for SC students',
+    'What are the fees for nursing?',
+    'internships after a diploma in pharmacy',
+    'Tell me about NIT Srinagar',
+    'jobs in J&K',
+])
+def test_career_messages_are_supported(message):
+    assert classify_message(message).career_related
+
+
+@pytest.mark.parametrize('message', [
+    "What's the weather like in Gulmarg this weekend?",
+    'which category is best',  # "cat" is an exam acronym, not a prefix
+    'show me the saturday schedule',  # nor "sat"
+])
+def test_unrelated_messages_are_not_career_related(message):
+    assert not classify_message(message).career_related
+
+
+@pytest.mark.parametrize('message, greeting', [
+    ('hi', True),
+    ('Hello there', True),
+    ('tell me about yourself', True),
+    ('Is this a good time to choose commerce?', False),  # "hi" inside "this"
+    ('Which college is better?', False),  # "hi" inside "which"
+])
+def test_greetings_match_whole_words(message, greeting):
+    assert classify_message(message).greeting is greeting
+
+
+@pytest.mark.parametrize('message, query_type', [
+    ('NEET examination dates', 'exam_guidance'),
+    ('admissions open at Kashmir University', 'college_guidance'),
+    ('financially weak students', 'scholarship_guidance'),
+    ('fees for B.Tech', 'scholarship_guidance'),
+    ('professional courses', 'career_guidance'),
+    ('educational loans', DEFAULT_QUERY_TYPE),
+    # The first matching type in QUERY_TYPE_KEYWORDS order wins
+    ('JEE college admission fees', 'exam_guidance'),
+])
+def test_query_type(message, query_type):
+    assert classify_message(message).query_type == query_type
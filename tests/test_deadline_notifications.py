@@ -0,0 +1,58 @@
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from admin_tools import notify_upcoming_deadlines
+from app import create_app, init_db
+from extensions import db
+from models import Notification, Scholarship, User
+
+NOW = datetime(2026, 3, 1)
+
+
+@pytest.fixture
+def scholarship(tmp_path):
+    app = create_app({'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'notify.db'}"})
+    with app.app_context():
+        init_db()
+        db.session.add(User(id='student-1', email='student@example.com', password_hash='x', first_name='A',
+                            last_name='B', role='student', category='SC', class_level='12th'))
+        scholarship = Scholarship(name='Merit scholarship', category_eligible=json.dumps(['SC']),
+                                  class_eligible=json.dumps(['12th']), is_active=True,
+                                  application_deadline=NOW + timedelta(days=3))
+        db.session.add(scholarship)
+        db.session.commit()
+        yield scholarship
+        db.session.remove()
+        db.engine.dispose()
+
+
+def reminders():
+    return Notification.query.filter(Notification.deadline.isnot(None)).count()
+
+
+def test_reruns_do_not_repeat_reminders(scholarship):
+    assert notify_upcoming_deadlines(days=7, now=NOW) == 1
+    assert notify_upcoming_deadlines(days=7, now=NOW) == 0
+    assert reminders() == 1
+
+
+def test_other_notifications_about_the_scholarship_do_not_block(scholarship):
+    announcement = dict(user_id='student-1', title='New scheme', message='m',
+                        notification_type='scholarship', reference_id=scholarship.id)
+    db.session.add(Notification(**announcement))
+    db.session.commit()
+    assert notify_upcoming_deadlines(days=7, now=NOW) == 1
+
+    db.session.add(Notification(**announcement))
+    db.session.commit()
+    assert Notification.query.count() == 3
+
+
+def test_moved_deadline_is_reminded_again(scholarship):
+    assert notify_upcoming_deadlines(days=7, now=NOW) == 1
+    scholarship.application_deadline = NOW + timedelta(days=5)
+    db.session.commit()
+    assert notify_upcoming_deadlines(days=7, now=NOW) == 1
+    assert reminders() == 2
@@ -0,0 +1,36 @@
+from llm_gateway import REGULAR_CALL, CircuitBreaker
+
+
+def open_breaker():
+    breaker = CircuitBreaker(threshold=1, cooldown=0)
+    breaker.record(breaker.allow(), False)
+    return breaker
+
+
+def test_only_one_trial_call_while_half_open():
+    breaker = open_breaker()
+    trial = breaker.allow()
+    assert trial not in (None, REGULAR_CALL)
+    assert breaker.allow() is None
+
+
+def test_late_call_does_not_end_the_trial():
+    breaker = CircuitBreaker(threshold=1, cooldown=0)
+    late = breaker.allow()
+    breaker.record(breaker.allow(), False)
+    breaker.allow()  # trial
+    breaker.record(late, None)
+    assert breaker.allow() is None
+    breaker.record(late, False)
+    assert breaker.allow() is None
+
+
+def test_trial_outcome_closes_or_reopens():
+    breaker = open_breaker()
+    breaker.record(breaker.allow(), True)
+    assert breaker.state() == 'closed'
+    assert breaker.allow() is REGULAR_CALL
+
+    breaker = open_breaker()
+    breaker.record(breaker.allow(), False)
+    assert breaker.state() != 'closed'
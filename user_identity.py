@@ -0,0 +1,151 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import NamedTuple, Optional
+from flask_login import UserMixin, user_logged_in, user_logged_out
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+from extensions import db
+from models import User
+
+# Per-process cache of the logged-in user's identity for Flask-Login.
+#
+# Most requests only need the navbar name and the role/category/class used
+# for access checks and personalization, so load_user() returns a
+# CurrentUser built from a cached, immutable Identity instead of querying
+# the user row. Entries expire after USER_IDENTITY_TTL seconds (which also
+# bounds staleness in other worker processes) and are dropped in this
+# process on login, logout and any committed change to the User row. The
+# full ORM User is loaded, once per request, only when a route reads an
+# attribute outside the snapshot or assigns to one.
+
+IDENTITY_TTL = float(os.environ.get('USER_IDENTITY_TTL', 60))  # seconds
+IDENTITY_CACHE_SIZE = int(os.environ.get('USER_IDENTITY_CACHE_SIZE', 10000))
+
+
+class Identity(NamedTuple):
+    id: str
+    first_name: str
+    last_name: str
+    role: str
+    category: Optional[str]
+    class_level: Optional[str]
+    state: Optional[str]
+
+
+_IDENTITY_COLUMNS = [getattr(User, field) for field in Identity._fields]
+
+
+class IdentityCache:
+    def __init__(self, ttl, max_entries):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # user id -> (expires_at, Identity)
+        self._lock = threading.Lock()
+
+    def get(self, user_id):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None or entry[0] <= now:
+                return None
+            self._entries.move_to_end(user_id)
+            return entry[1]
+
+    def set(self, identity):
+        with self._lock:
+            self._entries[identity.id] = (time.monotonic() + self.ttl, identity)
+            self._entries.move_to_end(identity.id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+identity_cache = IdentityCache(IDENTITY_TTL, IDENTITY_CACHE_SIZE)
+
+
+class CurrentUser(UserMixin):
+    """current_user for an authenticated request: the cached Identity, backed by the ORM User on demand."""
+
+    def __init__(self, identity):
+        object.__setattr__(self, '_identity', identity)
+        object.__setattr__(self, '_record', None)
+
+    @property
+    def record(self):
+        """The full User row, loaded on first use within this request."""
+        if self._record is None:
+            object.__setattr__(self, '_record', db.session.get(User, self._identity.id))
+        return self._record
+
+    @property
+    def identity(self):
+        return self._identity
+
+    def get_id(self):
+        return self._identity.id
+
+    def get_full_name(self):
+        return f"{self._identity.first_name} {self._identity.last_name}"
+
+    def __getattr__(self, name):
+        # Only reached for attributes not defined on the class
+        if name in Identity._fields:
+            return getattr(self._identity, name)
+        return getattr(self.record, name)
+
+    def __setattr__(self, name, value):
+        setattr(self.record, name, value)
+
+
+def load_identity(user_id):
+    """Flask-Login user loader: a CurrentUser for the id, or None if the user no longer exists."""
+    identity = identity_cache.get(user_id)
+    if identity is None:
+        row = db.session.execute(select(*_IDENTITY_COLUMNS).where(User.id == user_id)).first()
+        if row is None:
+            return None
+        identity = Identity(*row)
+        identity_cache.set(identity)
+    return CurrentUser(identity)
+
+
+# Invalidation: logins and logouts, and committed changes to User rows
+
+@user_logged_in.connect
+def _forget_on_login(sender, user, **extra):
+    identity_cache.invalidate(user.get_id())
+
+
+@user_logged_out.connect
+def _forget_on_logout(sender, user, **extra):
+    if user is not None:
+        identity_cache.invalidate(user.get_id())
+
+
+@event.listens_for(Session, 'after_flush')
+def _collect_changed_users(session, flush_context):
+    changed = {obj.id for obj in session.deleted if isinstance(obj, User)}
+    changed.update(obj.id for obj in session.dirty
+                   if isinstance(obj, User) and session.is_modified(obj, include_collections=False))
+    if changed:
+        session.info.setdefault('changed_users', set()).update(changed)
+
+
+@event.listens_for(Session, 'after_commit')
+def _forget_changed_users(session):
+    for user_id in session.info.pop('changed_users', ()):
+        identity_cache.invalidate(user_id)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_changed_users(session):
+    session.info.pop('changed_users', None)